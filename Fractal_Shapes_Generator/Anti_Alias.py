@@ -0,0 +1,102 @@
+import numpy as np
+from .Escape_Time import escape_time, select_precision
+from .Instrumentation import count
+from .Julia import generate_julia_set
+from .Mandelbrot import generate_mandelbrot_set, mandelbrot_counts
+
+def edge_contrast(counts):
+    """
+    Largest count difference between each pixel and its 4 neighbours.
+
+    Neighbouring escape bands differ by one iteration, so a small threshold
+    on this leaves smooth gradients alone and picks out the boundary of the
+    set and its filaments.
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    contrast = np.zeros(counts.shape, dtype=np.int64)
+    step = np.abs(np.diff(counts, axis=0))
+    np.maximum(contrast[1:], step, out=contrast[1:])
+    np.maximum(contrast[:-1], step, out=contrast[:-1])
+    step = np.abs(np.diff(counts, axis=1))
+    np.maximum(contrast[:, 1:], step, out=contrast[:, 1:])
+    np.maximum(contrast[:, :-1], step, out=contrast[:, :-1])
+    return contrast
+
+def _jittered(rows, cols, k, bounds, size, dtype, rng):
+    """One uniform sample in each cell of a k x k grid over each pixel; (n, k*k) complex points."""
+    xmin, xmax, ymin, ymax = bounds
+    width, height = size
+    dx = (xmax - xmin) / max(width - 1, 1)
+    dy = (ymax - ymin) / max(height - 1, 1)
+    cell_x, cell_y = np.meshgrid(np.arange(k), np.arange(k))
+    u = rng.random((2, rows.size, k * k))
+    points = np.empty((rows.size, k * k), dtype=dtype)
+    points.real = np.linspace(xmin, xmax, width)[cols, np.newaxis] + ((cell_x.ravel() + u[0]) / k - 0.5) * dx
+    points.imag = np.linspace(ymin, ymax, height)[rows, np.newaxis] + ((cell_y.ravel() + u[1]) / k - 0.5) * dy
+    return points
+
+def adaptive_supersample(xmin, xmax, ymin, ymax, width, height, max_iter=256, c=None, threshold=None, samples=4,
+                         budget=0.5, cardioid=False, periodicity=False, precision="auto", seed=0):
+    """
+    Anti-aliased escape-time render of the Mandelbrot set (c=None) or a Julia set.
+
+    The view is rendered once at 1x. Pixels whose count differs from a
+    neighbour's by more than `threshold` are edge pixels; each gets
+    `samples` jittered subsamples, one per cell of a square grid over the
+    pixel, and becomes the mean count of its centre sample and subsamples.
+    Smooth regions are never resampled. At most `budget` extra samples per
+    pixel of the image are spent, highest-contrast edges first, so the cost
+    stays close to 1x even on views that are mostly boundary, instead of the
+    4-16x of brute-force supersampling. The jitter is seeded, so renders are
+    reproducible and cacheable.
+
+    Args:
+        xmin, xmax, ymin, ymax (float): Viewport bounds.
+        width, height (int): Output resolution.
+        max_iter (int): Maximum number of iterations.
+        c (complex or None): Julia constant; None renders the Mandelbrot set.
+        threshold (int or None): Count difference that marks an edge; defaults
+            to max_iter // 64, at least 2.
+        samples (int): Subsamples per edge pixel, rounded down to a square number.
+        budget (float or None): Extra samples allowed per image pixel; None for no limit.
+        cardioid (bool): Skip main-cardioid and period-2-bulb points (Mandelbrot only).
+        periodicity (bool): Stop periodic orbits early.
+        precision (str): "auto", "complex64" or "complex128"; see select_precision.
+        seed (int): Seed of the jitter.
+    Returns:
+        tuple: (float32 image of mean counts of shape (height, width), laid out
+        like generate_mandelbrot_set, dict with "edge_pixels", "resampled_pixels",
+        "extra_samples" and "cost", the samples taken relative to a 1x render).
+    """
+    if c is None:
+        base = generate_mandelbrot_set(xmin, xmax, ymin, ymax, width, height, max_iter, cardioid, periodicity,
+                                       precision)
+    else:
+        base = generate_julia_set(c, xmin, xmax, ymin, ymax, width, height, max_iter, periodicity, precision)
+    if threshold is None:
+        threshold = max(2, max_iter // 64)
+    k = max(1, int(np.sqrt(samples)))
+
+    image = base.astype(np.float32)
+    contrast = edge_contrast(base).ravel()
+    edges = np.flatnonzero(contrast > threshold)
+    resampled = edges
+    if budget is not None and edges.size * k * k > budget * base.size:
+        # Over budget: keep the highest-contrast edges, in raster order.
+        keep = int(budget * base.size) // (k * k)
+        resampled = np.sort(edges[np.argsort(-contrast[edges], kind="stable")[:keep]])
+    if resampled.size:
+        rows, cols = np.divmod(resampled, width)
+        dtype = select_precision(xmin, xmax, ymin, ymax, width, height, max_iter, precision)
+        points = _jittered(rows, cols, k, (xmin, xmax, ymin, ymax), (width, height), dtype,
+                           np.random.default_rng(seed)).ravel()
+        if c is None:
+            counts = mandelbrot_counts(points, max_iter, cardioid, periodicity)
+        else:
+            counts = escape_time(points, c, max_iter, periodicity=periodicity)
+        total = counts.reshape(resampled.size, k * k).sum(axis=1, dtype=np.float64) + base[rows, cols]
+        image[rows, cols] = total / (k * k + 1)
+    extra = resampled.size * k * k
+    count("extra_samples", extra)
+    return image, {"edge_pixels": int(edges.size), "resampled_pixels": int(resampled.size),
+                   "extra_samples": int(extra), "cost": 1 + extra / max(base.size, 1)}
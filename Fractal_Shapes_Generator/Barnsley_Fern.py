@@ -22,3 +22,107 @@ def generate_barnsley_fern(n_points=50000):
     plt.tight_layout()
     return fig
 
+
+# Barnsley's four affine maps (a, b, c, d, e, f): x' = a*x + b*y + e, y' = c*x + d*y + f.
+FERN_MAPS = np.array([
+    [0.0, 0.0, 0.0, 0.16, 0.0, 0.0],
+    [0.85, 0.04, -0.04, 0.85, 0.0, 1.6],
+    [0.2, -0.26, 0.23, 0.22, 0.0, 1.6],
+    [-0.15, 0.28, 0.26, 0.24, 0.0, 0.44],
+])
+FERN_PROBABILITIES = np.array([0.01, 0.85, 0.07, 0.07])
+FERN_BOUNDS = (-2.3, 2.8, -0.1, 10.1)
+
+def chaos_game_histogram(n_points, bins=(700, 1000), bounds=FERN_BOUNDS, seed=None, walkers=4096,
+                         chunk_steps=256, burn_in=20, maps=FERN_MAPS, probabilities=FERN_PROBABILITIES):
+    """
+    Run the chaos game with many independent walkers and bin the points.
+
+    All walkers advance together with NumPy, and the points of every
+    `chunk_steps` steps are binned straight into a uint32 density histogram
+    and dropped. Memory is the histogram plus one chunk, whatever n_points is.
+
+    Args:
+        n_points (int): Number of points to plot (burn-in steps excluded).
+        bins (tuple): Histogram size (width, height).
+        bounds (tuple): (xmin, xmax, ymin, ymax) covered by the histogram.
+        seed (int or np.random.SeedSequence or None): RNG seed for this stream.
+        walkers (int): Number of walkers advanced in parallel.
+        chunk_steps (int): Steps binned per chunk.
+        burn_in (int): Initial steps discarded while walkers settle onto the attractor.
+        maps (np.ndarray): (k, 6) affine map coefficients.
+        probabilities (np.ndarray): (k,) map probabilities.
+    Returns:
+        np.ndarray: uint32 histogram of shape (height, width), row 0 at ymin.
+    """
+    rng = np.random.default_rng(seed)
+    width, height = bins
+    xmin, xmax, ymin, ymax = bounds
+    hist = np.zeros(width * height, dtype=np.uint32)
+    walkers = max(1, min(walkers, n_points))
+    cumulative = np.cumsum(probabilities)
+    cumulative[-1] = 1.0
+    x = np.zeros(walkers)
+    y = np.zeros(walkers)
+
+    def step():
+        nonlocal x, y
+        a, b, c, d, e, f = maps[np.searchsorted(cumulative, rng.random(walkers), side='right')].T
+        x, y = a*x + b*y + e, c*x + d*y + f
+
+    for _ in range(burn_in):
+        step()
+    remaining = n_points
+    xs = np.empty((chunk_steps, walkers))
+    ys = np.empty((chunk_steps, walkers))
+    while remaining > 0:
+        steps = min(chunk_steps, -(-remaining // walkers))
+        for s in range(steps):
+            step()
+            xs[s], ys[s] = x, y
+        px = xs[:steps].ravel()[:remaining]
+        py = ys[:steps].ravel()[:remaining]
+        remaining -= px.size
+        col = ((px - xmin) * (width / (xmax - xmin))).astype(np.int64)
+        row = ((py - ymin) * (height / (ymax - ymin))).astype(np.int64)
+        inside = (col >= 0) & (col < width) & (row >= 0) & (row < height)
+        hist += np.bincount(row[inside] * width + col[inside], minlength=width * height).astype(np.uint32)
+    return hist.reshape(height, width)
+
+def _histogram_job(job):
+    n_points, seed, kwargs = job
+    return chaos_game_histogram(n_points, seed=seed, **kwargs)
+
+def barnsley_fern_density(n_points, bins=(700, 1000), bounds=FERN_BOUNDS, seed=0, workers=1, **kwargs):
+    """
+    Barnsley fern density histogram from n_points chaos-game points.
+
+    The points are split across `workers` processes. Each one gets its own
+    child stream of np.random.SeedSequence(seed), so a given (seed, workers)
+    pair always gives the same histogram. The per-worker histograms are
+    summed into a uint64 total.
+
+    Returns:
+        np.ndarray: uint64 histogram of shape (height, width), row 0 at ymin.
+    """
+    workers = max(1, workers)
+    seeds = np.random.SeedSequence(seed).spawn(workers)
+    shares = [n_points // workers + (i < n_points % workers) for i in range(workers)]
+    kwargs = dict(kwargs, bins=bins, bounds=bounds)
+    jobs = [(n, s, kwargs) for n, s in zip(shares, seeds)]
+    if workers == 1:
+        parts = map(_histogram_job, jobs)
+    else:
+        import multiprocessing as mp
+        with mp.Pool(workers) as pool:
+            parts = pool.map(_histogram_job, jobs)
+    total = np.zeros((bins[1], bins[0]), dtype=np.uint64)
+    for part in parts:
+        total += part
+    return total
+
+def log_density(hist):
+    """Log-scaled density in [0, 1], flipped so row 0 is the top of the image."""
+    density = np.log1p(hist[::-1].astype(np.float32))
+    peak = density.max()
+    return density / peak if peak > 0 else density
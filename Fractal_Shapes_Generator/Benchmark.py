@@ -0,0 +1,274 @@
+"""
+Benchmark every generator across a matrix of orders, resolutions and max_iter.
+
+    python -m Fractal_Shapes_Generator.Benchmark [--quick] [--only SUBSTRING ...] [--repeat N]
+        [--out results.json] [--baseline benchmarks/baseline.json] [--save-baseline]
+        [--time-threshold 0.15] [--memory-threshold 0.25]
+
+Each case runs in its own forked process (Linux), so peak RSS is per case.
+Wall time is the best of `repeat` runs without tracing, and a separate run
+under tracemalloc gives the peak traced allocation, which numpy reports
+too. Throughput is pixels, vertices or points per second. matplotlib runs
+on the Agg backend, so no display is needed.
+
+Results are written as JSON. With a baseline file, cases that got slower
+or bigger than the thresholds are listed and the exit status is 1.
+"""
+import argparse
+import importlib
+import io
+import json
+import multiprocessing as mp
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+PACKAGE = __name__.rpartition(".")[0] or "Fractal_Shapes_Generator"
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "benchmarks", "baseline.json")
+
+RESOLUTIONS = [(350, 200), (700, 400)]
+MAX_ITERS = [256, 1000]
+DEEP_CENTER = ("-0.743643887037158704752191506114774", "0.131825904205311970493132056385139", "1e10")
+
+def _tree_vertices(n, backend):
+    # Both backends fill each distinct square once (tree_lod), not all 2**n - 1 of the recursion.
+    lod = _module("Level_Of_Detail")
+    return 4 * len(lod.tree_lod(n, lod.EVERYWHERE, 0))
+
+def _triangle_vertices(n, backend):
+    # The raster backend splits the default triangle only down to one pixel of an 800x800 image.
+    if backend == "matplotlib":
+        return 3 * 3**n
+    lod = _module("Level_Of_Detail")
+    corners = [(0, 0), (1, 0), (0.5, 0.866)]
+    bounds = _load("Rasterizer", "fit_bounds")(corners, (800, 800))
+    return 3 * len(lod.triangle_lod(n, bounds, lod.pixel_size(bounds, (800, 800)), *corners))
+
+# Geometric generators: module, function, orders for the raster backend, orders for matplotlib,
+# and the number of vertices drawn at a given order by a given backend.
+GEOMETRIC = {
+    "sierpinski_triangle": ("Sierpinnski_triangle", "generate_sierpinski_triangle", [4, 7, 10, 20], [4, 7],
+                            _triangle_vertices),
+    "pythagoras_tree": ("Pythagoras_Tree", "generate_pythagoras_tree", [4, 7, 10, 20], [4, 7, 20], _tree_vertices),
+    "levy_c_curve": ("Lecy_O_Curve", "generate_levy_curve", [4, 7, 10], [4, 7], lambda n, _: 2**n + 1),
+    "cantor_set": ("Cantour_Set", "generate_cantor_set", [4, 7, 10], [4, 7], lambda n, _: 2 * (2**n - 1)),
+    "dragon_curve": ("Dragon_Curve", "generate_dragon_curve", [4, 7, 10], [4, 7], lambda n, _: 2**n),
+    "hilbert_curve": ("Hilbert_Curve", "generate_hilbert_curve", [3, 5, 7], [3, 5], lambda n, _: 4**n),
+    "peano_curve": ("Peano_Curve", "generate_peano_curve", [2, 4, 5], [2, 4], lambda n, _: 9**n),
+    "koch_snowflake": ("Koch_Snowflake", "generate_koch_snowflake", [4, 7, 10], [4, 7],
+                       lambda n, _: 3 * 4**n + 1),
+    "sierpinski_carpet": ("Sierpinski_Carpet", "generate_sierpinski_carpet", [4, 6, 8], [4, 6],
+                          lambda n, _: 9**n),
+}
+
+# Viewport level of detail: order, full view and a deep zoom of about 1e-4 of it, drawn at 800x800.
+LOD_VIEWS = {
+    "koch_snowflake": (16, (-0.2, 10.2, -0.87, 9.53), (0.4156, 0.4166, 0.0840, 0.0850)),
+    "levy_c_curve": (24, (-0.53, 1.53, -0.66, 1.41), (-0.0783, -0.0781, 0.8280, 0.8282)),
+    "pythagoras_tree": (20, (-0.4, 20.4, -0.4, 20.4), (9.8, 10.2, 14.8, 15.2)),
+    "sierpinski_triangle": (20, (-0.02, 1.02, -0.09, 0.95), (0.2001, 0.2003, 0.2858, 0.2860)),
+}
+
+def _module(name):
+    return importlib.import_module(f"{PACKAGE}.{name}")
+
+def _load(module, attribute):
+    return getattr(_module(module), attribute)
+
+def _case(name, run, items, unit):
+    return {"name": name, "run": run, "items": items, "unit": unit}
+
+def _matplotlib_run(module, function, order, output_dir):
+    def run():
+        import matplotlib.pyplot as plt
+        mod = _module(module)
+        if hasattr(mod, "output_dir"):
+            mod.output_dir = output_dir
+        fig = getattr(mod, function)(order)
+        if fig is not None:  # generators that return the figure instead of saving it
+            fig.savefig(io.BytesIO(), format="png", dpi=150)
+        plt.close(fig if fig is not None else "all")
+    return run
+
+def list_cases(quick=False, output_dir=None):
+    """
+    The benchmark matrix as a list of cases (name, run, items, unit).
+
+    quick=True keeps only the smallest resolution, max_iter and orders.
+    """
+    output_dir = output_dir or tempfile.mkdtemp(prefix="fractal-bench-")
+    resolutions = RESOLUTIONS[:1] if quick else RESOLUTIONS
+    iters = MAX_ITERS[:1] if quick else MAX_ITERS
+    mandelbrot = _load("Mandelbrot", "generate_mandelbrot_set")
+    julia = _load("Julia", "generate_julia_set")
+    traced = _load("Boundary_Trace", "mariani_silver")
+    c = complex(-0.8, 0.156)
+    cases = []
+    for width, height in resolutions:
+        for max_iter in iters:
+            grid, pixels = f"{width}x{height}/it{max_iter}", width * height
+            cases += [
+                _case(f"mandelbrot/{grid}", lambda w=width, h=height, m=max_iter:
+                      mandelbrot(-2.0, 1.0, -1.0, 1.0, w, h, m), pixels, "pixels"),
+                _case(f"mandelbrot_complex128/{grid}", lambda w=width, h=height, m=max_iter:
+                      mandelbrot(-2.0, 1.0, -1.0, 1.0, w, h, m, precision="complex128"), pixels, "pixels"),
+                _case(f"mandelbrot_shortcuts/{grid}", lambda w=width, h=height, m=max_iter:
+                      mandelbrot(-2.0, 1.0, -1.0, 1.0, w, h, m, cardioid=True, periodicity=True), pixels, "pixels"),
+                _case(f"mandelbrot_traced/{grid}", lambda w=width, h=height, m=max_iter:
+                      traced(-2.0, 1.0, -1.0, 1.0, w, h, m), pixels, "pixels"),
+                _case(f"mandelbrot_antialias/{grid}", lambda w=width, h=height, m=max_iter:
+                      _load("Anti_Alias", "adaptive_supersample")(-2.0, 1.0, -1.0, 1.0, w, h, m), pixels, "pixels"),
+                _case(f"julia/{grid}", lambda w=width, h=height, m=max_iter:
+                      julia(c, -2.0, 2.0, -1.2, 1.2, w, h, m), pixels, "pixels"),
+                _case(f"julia_traced/{grid}", lambda w=width, h=height, m=max_iter:
+                      traced(-2.0, 2.0, -1.2, 1.2, w, h, m, c=c), pixels, "pixels"),
+                _case(f"mandelbrot_deep/{grid}", lambda w=width, h=height, m=max_iter:
+                      _load("Deep_Zoom", "generate_mandelbrot_deep")(*DEEP_CENTER, w, h, m), pixels, "pixels"),
+                _case(f"newton/{grid}", lambda w=width, h=height, m=max_iter:
+                      _load("Newton_Fractal", "newton_basins")(resolution=(w, h), max_iter=m), pixels, "pixels"),
+            ]
+
+    for n_points in ([1_000_000] if quick else [1_000_000, 10_000_000]):
+        cases.append(_case(f"barnsley_fern_density/{n_points}", lambda n=n_points:
+                           _load("Barnsley_Fern", "barnsley_fern_density")(n), n_points, "points"))
+    for n_samples in ([200_000] if quick else [200_000, 1_000_000]):
+        cases.append(_case(f"buddhabrot/{n_samples}", lambda n=n_samples:
+                           _load("Buddhabrot", "buddhabrot_density")(n, max_iter=500), n_samples, "points"))
+    for n_points in ([10_000] if quick else [10_000, 100_000]):
+        cases.append(_case(f"barnsley_fern_scatter/{n_points}",
+                           _matplotlib_run("Barnsley_Fern", "generate_barnsley_fern", n_points, output_dir),
+                           n_points, "points"))
+
+    for name, (module, function, raster_orders, mpl_orders, vertices) in GEOMETRIC.items():
+        for order in (raster_orders[:1] if quick else raster_orders):
+            cases.append(_case(f"{name}_raster/order{order}", lambda m=module, f=function, o=order:
+                               _load(m, f)(o, backend="raster"), vertices(order, "raster"), "vertices"))
+        for order in (mpl_orders[:1] if quick else mpl_orders):
+            cases.append(_case(f"{name}_matplotlib/order{order}", _matplotlib_run(module, function, order, output_dir),
+                               vertices(order, "matplotlib"), "vertices"))
+    for name, (order, full, zoom) in LOD_VIEWS.items():
+        module, function = GEOMETRIC[name][:2]
+        for view, viewport in (("full", full), ("zoom", zoom)):
+            cases.append(_case(f"{name}_lod/order{order}/{view}", lambda m=module, f=function, o=order, v=viewport:
+                               _load(m, f)(o, backend="raster", viewport=v), 800 * 800, "pixels"))
+    return cases
+
+def _measure(case, repeat, conn):
+    case["run"]()  # warm-up: imports, caches
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        case["run"]()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    case["run"]()
+    traced_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    seconds = min(times)
+    conn.send({
+        "seconds": seconds,
+        "items": case["items"],
+        "unit": case["unit"],
+        "items_per_second": case["items"] / seconds if seconds > 0 else None,
+        "tracemalloc_peak_bytes": traced_peak,
+        "rss_peak_bytes": _load("Instrumentation", "peak_rss_bytes")(),
+    })
+    conn.close()
+
+def run_benchmarks(cases, repeat=3, progress=True):
+    """Run each case in a fresh forked process; returns {case name: measurements}."""
+    ctx = mp.get_context("fork")
+    results = {}
+    for i, case in enumerate(cases, 1):
+        parent, child = ctx.Pipe(duplex=False)
+        process = ctx.Process(target=_measure, args=(case, repeat, child))
+        process.start()
+        child.close()
+        try:
+            results[case["name"]] = parent.recv()
+        except EOFError:  # the case crashed or was killed, e.g. out of memory
+            process.join()
+            results[case["name"]] = {"error": f"exit code {process.exitcode}"}
+        process.join()
+        if progress:
+            r = results[case["name"]]
+            summary = r.get("error") or f"{r['seconds'] * 1000:9.1f} ms  {r['items_per_second']:14,.0f} {r['unit']}/s"
+            print(f"[{i:3d}/{len(cases)}] {case['name']:<45} {summary}", flush=True)
+    return results
+
+def environment():
+    import numpy as np
+    return {
+        "python": platform.python_version(), "numpy": np.__version__, "platform": platform.platform(),
+        "machine": platform.machine(), "cpu_count": os.cpu_count(), "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+def compare(results, baseline, time_threshold=0.15, memory_threshold=0.25):
+    """
+    Regressions of `results` against `baseline` (both {case name: measurements}).
+
+    A case regresses when its wall time grew by more than `time_threshold`
+    or its tracemalloc peak by more than `memory_threshold` (fractions).
+    Cases missing from either side are not compared.
+
+    Returns:
+        list: (case name, metric, baseline value, current value, relative change) tuples.
+    """
+    regressions = []
+    for name, current in sorted(results.items()):
+        before = baseline.get(name)
+        if not before or "error" in current or "error" in before:
+            continue
+        for metric, threshold in (("seconds", time_threshold), ("tracemalloc_peak_bytes", memory_threshold)):
+            old, new = before[metric], current[metric]
+            if old > 0 and (new - old) / old > threshold:
+                regressions.append((name, metric, old, new, (new - old) / old))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the fractal generators.")
+    parser.add_argument("--quick", action="store_true", help="smallest matrix only")
+    parser.add_argument("--only", nargs="+", help="run cases whose name contains any of these")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case (best is kept)")
+    parser.add_argument("--out", default="benchmark_results.json", help="results file (default: %(default)s)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline file (default: %(default)s)")
+    parser.add_argument("--save-baseline", action="store_true", help="also write the results as the new baseline")
+    parser.add_argument("--time-threshold", type=float, default=0.15, help="allowed slowdown (default: %(default)s)")
+    parser.add_argument("--memory-threshold", type=float, default=0.25,
+                        help="allowed growth of the traced peak (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    cases = list_cases(args.quick)
+    if args.only:
+        cases = [case for case in cases if any(part in case["name"] for part in args.only)]
+    report = {"environment": environment(), "results": run_benchmarks(cases, args.repeat)}
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=1, sort_keys=True)
+    print(f"Results written to '{args.out}'")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=1, sort_keys=True)
+        print(f"Baseline written to '{args.baseline}'")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at '{args.baseline}'; run with --save-baseline to create one.")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)["results"]
+    regressions = compare(report["results"], baseline, args.time_threshold, args.memory_threshold)
+    for name, metric, old, new, change in regressions:
+        print(f"REGRESSION {name}: {metric} {old:.4g} -> {new:.4g} ({change:+.0%})")
+    if not regressions:
+        print(f"No regressions against '{args.baseline}'.")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
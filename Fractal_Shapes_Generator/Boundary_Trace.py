@@ -0,0 +1,111 @@
+import numpy as np
+from .Escape_Time import escape_time, count_dtype, select_precision
+from .Mandelbrot import mandelbrot_counts
+from .Instrumentation import count
+
+def mariani_silver(xmin, xmax, ymin, ymax, width, height, max_iter=256, c=None, min_size=4, max_fill=64,
+                   cardioid=False, periodicity=False, precision="auto"):
+    """
+    Mariani-Silver rendering of the Mandelbrot set (c=None) or a Julia set.
+
+    Works on rectangles of pixels: only a rectangle's border is iterated. If
+    every border pixel has the same count the interior is filled with it,
+    otherwise the rectangle is split into four and each part is handled the
+    same way. Rectangles thinner than `min_size` are iterated in full. All
+    rectangles of one round are iterated together in a single escape_time
+    call, so the work stays vectorized.
+
+    Filling relies on the escape-time bands being connected. A rectangle that
+    encloses the whole set can still have a uniform border (every border pixel
+    escaping at step 0 around a Julia set, say), so rectangles larger than
+    `max_fill` pixels are always split. Filaments thinner than a pixel that
+    cross no border can be filled over, as with any tracing method.
+
+    Args:
+        xmin, xmax, ymin, ymax (float): Viewport bounds.
+        width, height (int): Output resolution.
+        max_iter (int): Maximum number of iterations.
+        c (complex or None): Julia constant; None renders the Mandelbrot set.
+        min_size (int): Rectangles at most this many pixels across are not subdivided.
+        max_fill (int): Rectangles more than this many pixels across are never filled.
+        cardioid (bool): Skip main-cardioid and period-2-bulb points (Mandelbrot only).
+        periodicity (bool): Stop periodic orbits early.
+        precision (str): "auto", "complex64" or "complex128"; see select_precision.
+    Returns:
+        tuple: (uint16 counts of shape (height, width), uint32 when max_iter > 65535,
+        number of pixels iterated).
+    """
+    r1 = np.linspace(xmin, xmax, width)
+    r2 = np.linspace(ymin, ymax, height)
+    dtype = select_precision(xmin, xmax, ymin, ymax, width, height, max_iter, precision)
+    image = np.zeros((height, width), dtype=count_dtype(max_iter))
+    done = np.zeros((height, width), dtype=bool)
+    iterated = 0
+
+    def iterate(rows, cols):
+        nonlocal iterated
+        flat = np.unique(rows * width + cols)
+        flat = flat[~done.ravel()[flat]]
+        if flat.size == 0:
+            return
+        rows, cols = np.divmod(flat, width)
+        points = np.empty(rows.size, dtype=dtype)
+        points.real = r1[cols]
+        points.imag = r2[rows]
+        if c is None:
+            counts = mandelbrot_counts(points, max_iter, cardioid, periodicity)
+        else:
+            counts = escape_time(points, c, max_iter, periodicity=periodicity)
+        image[rows, cols] = counts
+        done[rows, cols] = True
+        iterated += rows.size
+
+    def border(rect):
+        y0, y1, x0, x1 = rect
+        ys = np.arange(y0, y1 + 1)
+        xs = np.arange(x0, x1 + 1)
+        rows = np.concatenate([np.full(xs.size, y0), np.full(xs.size, y1), ys, ys])
+        cols = np.concatenate([xs, xs, np.full(ys.size, x0), np.full(ys.size, x1)])
+        return rows, cols
+
+    def interior(rect):
+        y0, y1, x0, x1 = rect
+        ys, xs = np.mgrid[y0:y1 + 1, x0:x1 + 1]
+        return ys.ravel(), xs.ravel()
+
+    # Rectangles are inclusive pixel bounds (y0, y1, x0, x1); neighbours share an edge.
+    rects = [(0, height - 1, 0, width - 1)] if width and height else []
+    while rects:
+        count("rectangles", len(rects))
+        borders = [border(rect) for rect in rects]
+        iterate(np.concatenate([b[0] for b in borders]), np.concatenate([b[1] for b in borders]))
+        split, brute = [], []
+        for rect, (rows, cols) in zip(rects, borders):
+            y0, y1, x0, x1 = rect
+            values = image[rows, cols]
+            if y1 - y0 < 2 or x1 - x0 < 2:
+                continue
+            if y1 - y0 <= max_fill and x1 - x0 <= max_fill and (values == values[0]).all():
+                image[y0 + 1:y1, x0 + 1:x1] = values[0]
+                done[y0 + 1:y1, x0 + 1:x1] = True
+                count("rectangles_filled")
+            elif y1 - y0 <= min_size or x1 - x0 <= min_size:
+                brute.append(interior(rect))
+                count("rectangles_iterated")
+            else:
+                ym, xm = (y0 + y1) // 2, (x0 + x1) // 2
+                split += [(y0, ym, x0, xm), (y0, ym, xm, x1), (ym, y1, x0, xm), (ym, y1, xm, x1)]
+        if brute:
+            iterate(np.concatenate([b[0] for b in brute]), np.concatenate([b[1] for b in brute]))
+        rects = split
+    count("pixels_iterated", iterated)
+    return image, iterated
+
+def generate_mandelbrot_set_traced(xmin, xmax, ymin, ymax, width, height, max_iter=256, cardioid=False, periodicity=False,
+                                   precision="auto"):
+    return mariani_silver(xmin, xmax, ymin, ymax, width, height, max_iter,
+                          cardioid=cardioid, periodicity=periodicity, precision=precision)
+
+def generate_julia_set_traced(c, xmin, xmax, ymin, ymax, width, height, max_iter=256, periodicity=False, precision="auto"):
+    return mariani_silver(xmin, xmax, ymin, ymax, width, height, max_iter, c=c, periodicity=periodicity,
+                          precision=precision)
@@ -0,0 +1,260 @@
+"""
+Buddhabrot and Anti-Buddhabrot orbit-density renders.
+
+    python -m Fractal_Shapes_Generator.Buddhabrot buddhabrot.png [--seconds 60] [--samples N]
+        [--max-iter 1000] [--min-iter 20] [--anti] [--size 600 600] [--workers N] [--cmap hot]
+
+Instead of coloring each c by its escape time, every sampled c's orbit
+z -> z**2 + c is traced and each point it visits is counted in a density
+histogram: the orbits of escaping c (Buddhabrot) or of bounded c
+(Anti-Buddhabrot). A coarse escape-time prepass finds the grid cells that
+can contribute, and c values are drawn uniformly from those cells only.
+Orbits are traced in vectorized batches and binned into uint32 histograms,
+one per worker process per round. Each round is merged into the uint64
+total, which is what a progressive preview shows, and rendering stops at
+a sample budget or a time budget. The CLI rewrites the output PNG after
+every round.
+"""
+import argparse
+import os
+import time
+import numpy as np
+try:
+    from .Barnsley_Fern import log_density
+    from .Colorize import colorize, colormap_lut, encode_png
+    from .Mandelbrot import generate_mandelbrot_set, mandelbrot_counts
+except ImportError:  # run as a script from this directory
+    from Barnsley_Fern import log_density
+    from Colorize import colorize, colormap_lut, encode_png
+    from Mandelbrot import generate_mandelbrot_set, mandelbrot_counts
+
+# Plane covered by the histogram, and the region c is sampled from (the set lies in |c| <= 2).
+BUDDHABROT_BOUNDS = (-2.0, 1.0, -1.5, 1.5)
+SAMPLE_BOUNDS = (-2.0, 0.5, -1.25, 1.25)
+
+def sampling_cells(max_iter=1000, min_iter=20, anti=False, grid=(256, 256), bounds=SAMPLE_BOUNDS):
+    """
+    Grid cells worth sampling, from a coarse escape-time prepass.
+
+    The corners of a grid over `bounds` are rendered once. For the
+    Buddhabrot a cell is kept when any corner escapes after at least
+    `min_iter` iterations or the cell straddles the boundary; for the
+    Anti-Buddhabrot when any corner stays bounded. The kept cells are grown
+    by one cell so thin filaments between corners are not lost. c values in
+    the other cells (fast escapes far from the set, deep interior) are
+    assumed to contribute nothing and are never drawn.
+
+    Returns:
+        tuple: (flat indices of the kept cells into a (rows, cols) grid,
+        (xmin, ymin) of the grid, (cell width, cell height), cols).
+    """
+    cols, rows = grid
+    xmin, xmax, ymin, ymax = bounds
+    corners = generate_mandelbrot_set(xmin, xmax, ymin, ymax, cols + 1, rows + 1, max_iter,
+                                      cardioid=True, periodicity=True)
+    bounded = corners == max_iter
+    if anti:
+        point = bounded
+    else:
+        point = ~bounded & (corners >= min_iter)
+    # A cell is kept when one of its four corners qualifies, or its corners disagree on escaping.
+    quad = lambda a: a[:-1, :-1] | a[1:, :-1] | a[:-1, 1:] | a[1:, 1:]
+    keep = quad(point) | (quad(bounded) & quad(~bounded))
+    grown = keep.copy()
+    grown[1:] |= keep[:-1]
+    grown[:-1] |= keep[1:]
+    grown[:, 1:] |= keep[:, :-1]
+    grown[:, :-1] |= keep[:, 1:]
+    return np.flatnonzero(grown), (xmin, ymin), ((xmax - xmin) / cols, (ymax - ymin) / rows), cols
+
+def _bin_orbits(c, lengths, bins, bounds, hist, flush_every=64):
+    """Add every point of the orbits of c, lengths[i] points each, to the flat uint32 `hist`."""
+    width, height = bins
+    xmin, xmax, ymin, ymax = bounds
+    sx, sy = width / (xmax - xmin), height / (ymax - ymin)
+    # Longest orbits first: the orbits still running at any step are then a prefix.
+    order = np.argsort(-lengths, kind="stable")
+    cx, cy, neg_lengths = c.real[order], c.imag[order], -lengths[order]
+    x = np.zeros_like(cx)
+    y = np.zeros_like(cy)
+    pending = []
+    # Same arithmetic as escape_time, so every orbit escapes on the step its count says.
+    with np.errstate(over='ignore', invalid='ignore'):
+        for step in range(int(-neg_lengths[0]) if c.size else 0):
+            n = np.searchsorted(neg_lengths, -step, side="left")  # orbits longer than `step`
+            x, y, cx, cy = x[:n], y[:n], cx[:n], cy[:n]
+            xy = x * y
+            x = x * x - y * y + cx
+            y = xy + xy + cy
+            px = (x - xmin) * sx
+            py = (y - ymin) * sy
+            inside = (px >= 0) & (px < width) & (py >= 0) & (py < height)
+            pending.append(py[inside].astype(np.int64) * width + px[inside].astype(np.int64))
+            if len(pending) >= flush_every:
+                hist += np.bincount(np.concatenate(pending), minlength=hist.size).astype(np.uint32)
+                pending = []
+    if pending:
+        hist += np.bincount(np.concatenate(pending), minlength=hist.size).astype(np.uint32)
+
+def orbit_histogram(n_samples, cells, bins=(600, 600), bounds=BUDDHABROT_BOUNDS, max_iter=1000, min_iter=20,
+                    anti=False, seed=None, deadline=None, batch=65536):
+    """
+    Sample c values from `cells` and bin their orbits into a uint32 histogram.
+
+    Escape counts of each batch are computed first (with the cardioid and
+    periodicity shortcuts); then only the orbits that are drawn are traced
+    again and binned: escaping orbits of at least `min_iter` iterations, up
+    to and including their first point past radius 2, or for `anti` the
+    max_iter points of every bounded orbit.
+
+    Args:
+        n_samples (int): Number of c values to sample.
+        cells (tuple): The result of sampling_cells.
+        bins (tuple): Histogram size (width, height).
+        bounds (tuple): (xmin, xmax, ymin, ymax) covered by the histogram.
+        max_iter (int): Maximum orbit length.
+        min_iter (int): Shortest escaping orbit drawn.
+        anti (bool): Draw bounded orbits instead of escaping ones.
+        seed (int or np.random.SeedSequence or None): RNG seed for this stream.
+        deadline (float or None): time.monotonic() after which no new batch is started.
+        batch (int): c values per vectorized batch.
+    Returns:
+        tuple: (uint32 histogram of shape (height, width), row 0 at ymin,
+        number of c values sampled, number of orbits drawn).
+    """
+    rng = np.random.default_rng(seed)
+    indices, (x0, y0), (dx, dy), cols = cells
+    width, height = bins
+    hist = np.zeros(width * height, dtype=np.uint32)
+    sampled = drawn = 0
+    while sampled < n_samples and indices.size and (deadline is None or time.monotonic() < deadline):
+        n = min(batch, n_samples - sampled)
+        row, col = np.divmod(indices[rng.integers(indices.size, size=n)], cols)
+        c = np.empty(n, dtype=np.complex128)
+        c.real = x0 + (col + rng.random(n)) * dx
+        c.imag = y0 + (row + rng.random(n)) * dy
+        counts = mandelbrot_counts(c, max_iter, cardioid=True, periodicity=True)
+        if anti:
+            keep = counts == max_iter
+            lengths = np.full(np.count_nonzero(keep), max_iter)
+        else:
+            keep = (counts >= min_iter) & (counts < max_iter)
+            lengths = counts[keep].astype(np.int64) + 1
+        _bin_orbits(c[keep], lengths, bins, bounds, hist)
+        sampled += n
+        drawn += lengths.size
+    return hist.reshape(height, width), sampled, drawn
+
+def _orbit_job(job):
+    n_samples, seed, deadline, cells, kwargs = job
+    return orbit_histogram(n_samples, cells, seed=seed, deadline=deadline, **kwargs)
+
+def buddhabrot_progressive(samples=None, seconds=None, bins=(600, 600), bounds=BUDDHABROT_BOUNDS, max_iter=1000,
+                           min_iter=20, anti=False, workers=1, seed=0, preview_seconds=2.0, round_samples=262144,
+                           batch=65536, grid=(256, 256)):
+    """
+    Render an orbit-density histogram in rounds, yielding a preview after each.
+
+    Every round, each of `workers` processes fills its own uint32 histogram
+    from its own child stream of np.random.SeedSequence(seed). The
+    histograms are added to a uint64 total, which is yielded. Rendering
+    stops once `samples` c values are sampled or `seconds` have passed,
+    whichever is first. With a time budget a round lasts `preview_seconds`;
+    without one it is `round_samples` per worker, so the result does not
+    depend on timing and is reproducible for a given (seed, workers).
+
+    Args:
+        samples (int or None): Sample budget.
+        seconds (float or None): Time budget.
+        bins, bounds, max_iter, min_iter, anti, batch: See orbit_histogram.
+        workers (int): Worker processes.
+        seed (int): Root seed.
+        preview_seconds (float): Length of a round under a time budget.
+        round_samples (int): Samples per worker in a round without a time budget.
+        grid (tuple): Resolution of the sampling prepass; see sampling_cells.
+    Yields:
+        tuple: (uint64 histogram of shape (height, width), row 0 at ymin, the
+        same array updated in place every round, and a dict with "samples",
+        "orbits" and "seconds" so far).
+    """
+    if samples is None and seconds is None:
+        raise ValueError("give a sample budget, a time budget or both")
+    start = time.monotonic()
+    end = start + seconds if seconds is not None else None
+    cells = sampling_cells(max_iter, min_iter, anti, grid)
+    kwargs = {"bins": bins, "bounds": bounds, "max_iter": max_iter, "min_iter": min_iter, "anti": anti,
+              "batch": batch}
+    workers = max(1, workers)
+    streams = np.random.SeedSequence(seed)
+    total = np.zeros((bins[1], bins[0]), dtype=np.uint64)
+    stats = {"samples": 0, "orbits": 0, "seconds": 0.0}
+    pool = None
+    if workers > 1:
+        import multiprocessing as mp
+        pool = mp.Pool(workers)
+    try:
+        while (samples is None or stats["samples"] < samples) and (end is None or time.monotonic() < end):
+            left = samples - stats["samples"] if samples is not None else workers * 2**62
+            shares = [left // workers + (i < left % workers) for i in range(workers)]
+            if end is None:
+                deadline = None
+                shares = [min(n, round_samples) for n in shares]
+            else:
+                deadline = min(time.monotonic() + preview_seconds, end)
+            jobs = [(n, s, deadline, cells, kwargs) for n, s in zip(shares, streams.spawn(workers)) if n]
+            parts = pool.map(_orbit_job, jobs) if pool else list(map(_orbit_job, jobs))
+            for hist, sampled, drawn in parts:
+                total += hist
+                stats["samples"] += sampled
+                stats["orbits"] += drawn
+            stats["seconds"] = time.monotonic() - start
+            yield total, dict(stats)
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+def buddhabrot_density(samples=None, seconds=None, stats=None, **kwargs):
+    """
+    Final uint64 histogram of buddhabrot_progressive (same arguments), row 0 at ymin.
+
+    A `stats` dict is updated with the final "samples", "orbits" and
+    "seconds", so a caller can tell a render cut short by the time budget.
+    """
+    hist = None
+    for hist, final in buddhabrot_progressive(samples, seconds, **kwargs):
+        if stats is not None:
+            stats.update(final)
+    return hist
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render a Buddhabrot or Anti-Buddhabrot orbit density.")
+    parser.add_argument("path", help="output PNG, rewritten after every round")
+    parser.add_argument("--samples", type=int, default=None, help="sample budget")
+    parser.add_argument("--seconds", type=float, default=None, help="time budget (default: 60 without --samples)")
+    parser.add_argument("--max-iter", type=int, default=1000)
+    parser.add_argument("--min-iter", type=int, default=20)
+    parser.add_argument("--anti", action="store_true", help="draw bounded orbits (Anti-Buddhabrot)")
+    parser.add_argument("--size", type=int, nargs=2, default=(600, 600), metavar=("WIDTH", "HEIGHT"))
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--preview", type=float, default=2.0, help="seconds between previews (default: %(default)s)")
+    parser.add_argument("--cmap", default="hot")
+    args = parser.parse_args(argv)
+    seconds = args.seconds if args.seconds is not None or args.samples is not None else 60.0
+
+    lut = colormap_lut(args.cmap)
+    for hist, stats in buddhabrot_progressive(args.samples, seconds, tuple(args.size), max_iter=args.max_iter,
+                                              min_iter=args.min_iter, anti=args.anti,
+                                              workers=args.workers or os.cpu_count() or 1,
+                                              preview_seconds=args.preview):
+        png = encode_png(colorize(log_density(hist), lut, 0, 1))
+        tmp = args.path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(png)
+        os.replace(tmp, args.path)
+        print(f"{stats['seconds']:7.1f} s  {stats['samples']:>13,} samples  {stats['orbits']:>12,} orbits",
+              flush=True)
+    print(f"Density written to '{args.path}'")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Build the whole Fractal_Shapes/ gallery in one go.
+
+    python -m Fractal_Shapes_Generator.Build_Gallery [--out DIR] [--workers N] [--only NAME ...] [--force]
+
+Every (fractal, order or point count) image is one job, run on a process
+pool. A manifest.json in the output root records the parameter hash and the
+code hash (the generator module plus the package modules it imports) of
+every image, so a rebuild only renders images whose inputs or code changed.
+"""
+import argparse
+import hashlib
+import importlib
+import json
+import multiprocessing as mp
+import os
+import re
+from tqdm import tqdm
+
+PACKAGE = __name__.rpartition(".")[0] or "Fractal_Shapes_Generator"
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUTPUT_ROOT = os.path.join(os.path.dirname(PACKAGE_DIR), "Fractal_Shapes")
+MANIFEST = "manifest.json"
+
+# name: (module, function, keyword, values, output subdirectory, file name pattern)
+GALLERY = {
+    "sierpinski_triangle": ("Sierpinnski_triangle", "generate_sierpinski_triangle", "order", range(1, 11),
+                            "Sierpinski_triangle", "sierpinski_triangle_order_{}.png"),
+    "pythagoras_tree": ("Pythagoras_Tree", "generate_pythagoras_tree", "order", range(1, 11),
+                        "Pythagoras_tree", "pythagoras_tree_order_{}.png"),
+    "levy_c_curve": ("Lecy_O_Curve", "generate_levy_curve", "order", range(1, 11),
+                     "Levy_C_curve", "levy_c_curve_order_{}.png"),
+    "cantor_set": ("Cantour_Set", "generate_cantor_set", "order", range(1, 11),
+                   "Cantor_Set", "cantor_set_order_{}.png"),
+    "dragon_curve": ("Dragon_Curve", "generate_dragon_curve", "order", range(1, 11),
+                     "Dragon_Curve", "dragon_curve_order_{}.png"),
+    "hilbert_curve": ("Hilbert_Curve", "generate_hilbert_curve", "order", range(1, 8),
+                      "Hilbert_curve", "hilbert_curve_order_{}.png"),
+    "peano_curve": ("Peano_Curve", "generate_peano_curve", "order", range(1, 6),
+                    "Peano_curve", "peano_curve_order_{}.png"),
+    "sierpinski_carpet": ("Sierpinski_Carpet", "generate_sierpinski_carpet", "order", range(1, 9),
+                          "Sierpinski_Carpet", "sierpinski_carpet_order_{}.png"),
+    "newton_fractal": ("Newton_Fractal", "generate_newton_fractal", "order", range(1, 11),
+                       "Newton_fractal", "newton_fractal_order_{}.png"),
+    "koch_snowflake": ("Koch_Snowflake", "generate_koch_snowflake", "order", range(1, 11),
+                       "koch_snowflakes", "koch_snowflake_order_{}.png"),
+    "barnsley_fern": ("Barnsley_Fern", "generate_barnsley_fern", "n_points", range(10_000, 100_001, 10_000),
+                      "Barnsley_fern", "barnsley_fern_points_{}.png"),
+}
+
+def list_jobs(output_root, names=None):
+    """All gallery jobs as dicts (name, module, function, kwargs, path), optionally only `names`."""
+    jobs = []
+    for name, (module, function, keyword, values, subdir, pattern) in GALLERY.items():
+        if names and name not in names:
+            continue
+        for value in values:
+            jobs.append({
+                "name": name, "module": module, "function": function, "kwargs": {keyword: value},
+                "path": os.path.join(output_root, subdir, pattern.format(value)),
+            })
+    return jobs
+
+def code_hash(module):
+    """sha256 over a package module's source and, recursively, the package modules it imports."""
+    seen = set()
+    digest = hashlib.sha256()
+    pending = [module]
+    while pending:
+        name = pending.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        path = os.path.join(PACKAGE_DIR, name + ".py")
+        if not os.path.exists(path):
+            continue
+        with open(path, "rb") as f:
+            source = f.read()
+        digest.update(name.encode() + b"\0" + source)
+        source = source.decode()
+        pending.extend(re.findall(r"^\s*from \.?(\w+) import", source, re.M))
+        # from . import A, B as C: every imported name is a module of the package.
+        for names in re.findall(r"^\s*from \. import \(?([\w ,]+)", source, re.M):
+            pending.extend(name.split()[0] for name in names.split(",") if name.strip())
+    return digest.hexdigest()
+
+def param_hash(job):
+    payload = json.dumps({"function": job["function"], "kwargs": job["kwargs"]}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def _init_worker():
+    os.environ.setdefault("MPLBACKEND", "Agg")
+
+def _run_job(job):
+    """Render one image to job["path"]; returns the job."""
+    import matplotlib.pyplot as plt
+    module = importlib.import_module(f"{PACKAGE}.{job['module']}")
+    target_dir = os.path.dirname(job["path"])
+    os.makedirs(target_dir, exist_ok=True)
+    if hasattr(module, "output_dir"):
+        # Generators that save their own PNG write to the module-level output_dir,
+        # which is relative to the script directory; point it at the output root.
+        module.output_dir = target_dir
+        getattr(module, job["function"])(**job["kwargs"])
+    else:
+        fig = getattr(module, job["function"])(**job["kwargs"])
+        fig.savefig(job["path"], bbox_inches='tight', pad_inches=0.1, dpi=150)
+        plt.close(fig)
+    return job
+
+def _load_manifest(path):
+    if os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return {}
+
+def _save_manifest(path, manifest):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+def build_gallery(output_root=DEFAULT_OUTPUT_ROOT, workers=None, names=None, force=False):
+    """
+    Render every gallery image whose parameters or code changed since the last build.
+
+    Args:
+        output_root (str): Directory holding the per-fractal folders and manifest.json.
+        workers (int or None): Pool size; defaults to os.cpu_count().
+        names (iterable or None): Only build these GALLERY entries.
+        force (bool): Ignore the manifest and render everything.
+    Returns:
+        tuple: (rendered, skipped) job counts.
+    """
+    os.makedirs(output_root, exist_ok=True)
+    manifest_path = os.path.join(output_root, MANIFEST)
+    manifest = _load_manifest(manifest_path)
+    hashes = {module: code_hash(module) for module, *_ in GALLERY.values()}
+
+    jobs = list_jobs(output_root, names)
+    todo = []
+    for job in jobs:
+        job["entry"] = {"params": param_hash(job), "code": hashes[job["module"]]}
+        key = os.path.relpath(job["path"], output_root)
+        if force or manifest.get(key) != job["entry"] or not os.path.exists(job["path"]):
+            todo.append(job)
+    skipped = len(jobs) - len(todo)
+
+    # Most expensive (highest order) first so the pool drains evenly.
+    todo.sort(key=lambda job: -next(iter(job["kwargs"].values())))
+    workers = workers or os.cpu_count() or 1
+    if todo:
+        with mp.Pool(min(workers, len(todo)), initializer=_init_worker) as pool:
+            for job in tqdm(pool.imap_unordered(_run_job, todo), total=len(todo), desc="Gallery"):
+                manifest[os.path.relpath(job["path"], output_root)] = job["entry"]
+                _save_manifest(manifest_path, manifest)
+    return len(todo), skipped
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the Fractal_Shapes gallery.")
+    parser.add_argument("--out", default=DEFAULT_OUTPUT_ROOT, help="output root (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=None, help="process pool size (default: all cores)")
+    parser.add_argument("--only", nargs="+", choices=sorted(GALLERY), help="build only these fractals")
+    parser.add_argument("--force", action="store_true", help="re-render images even if unchanged")
+    args = parser.parse_args(argv)
+    rendered, skipped = build_gallery(args.out, args.workers, args.only, args.force)
+    print(f"Rendered {rendered} image(s), {skipped} unchanged, in '{args.out}'")
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,31 @@
 import matplotlib.pyplot as plt
+import numpy as np
 import os
+from matplotlib.collections import LineCollection
 from tqdm import tqdm
+try:
+    from .Curve_Geometry import cantor_levels
+    from .Rasterizer import draw_segments, fit_bounds, new_image
+except ImportError:  # run as a script from this directory
+    from Curve_Geometry import cantor_levels
+    from Rasterizer import draw_segments, fit_bounds, new_image
 
 output_dir = "../Fractal_Shapes/Cantor_Set"
 
-def draw_cantor(ax, x, y, length, depth):
-    if depth == 0:
-        return
-    ax.plot([x, x+length], [y, y], color='black', lw=2)
-    if depth > 1:
-        y -= 0.1
-        draw_cantor(ax, x, y, length/3, depth-1)
-        draw_cantor(ax, x + 2*length/3, y, length/3, depth-1)
+def cantor_segments(order, x=0, y=1, length=1):
+    """All 2**order - 1 segments of the set, as one (N, 2, 2) float32 array of cantor_levels."""
+    segments = list(cantor_levels(order, x, y, length))
+    return np.concatenate(segments) if segments else np.empty((0, 2, 2), dtype=np.float32)
 
-def generate_cantor_set(order):
+def generate_cantor_set(order, backend="matplotlib", size=(800, 200)):
+    if backend == "raster":
+        # Returns an RGBA uint8 image of `size` (width, height) instead of saving a PNG.
+        segments = cantor_segments(order)
+        return draw_segments(new_image(size), segments, fit_bounds(segments, size, pad=0.05, equal=False), 'black', line_width=3)
     plt.figure(figsize=(8,2))
     ax = plt.gca()
-    draw_cantor(ax, 0, 1, 1, order)
+    ax.add_collection(LineCollection(cantor_segments(order), colors='black', linewidths=2))
+    ax.autoscale_view()
     plt.axis('off')
     plt.tight_layout()
     os.makedirs(output_dir, exist_ok=True)
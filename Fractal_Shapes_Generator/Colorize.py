@@ -0,0 +1,114 @@
+import struct
+import zlib
+from functools import lru_cache
+import numpy as np
+
+# Piecewise-linear (x, value) control points per channel, as in matplotlib's segment data.
+_SEGMENTS = {
+    "hot": {
+        "red": [(0.0, 0.0416), (0.365079, 1.0), (1.0, 1.0)],
+        "green": [(0.0, 0.0), (0.365079, 0.0), (0.746032, 1.0), (1.0, 1.0)],
+        "blue": [(0.0, 0.0), (0.746032, 0.0), (1.0, 1.0)],
+    },
+    "cool": {
+        "red": [(0.0, 0.0), (1.0, 1.0)],
+        "green": [(0.0, 1.0), (1.0, 0.0)],
+        "blue": [(0.0, 1.0), (1.0, 1.0)],
+    },
+    "hsv": {
+        "red": [(0.0, 1.0), (0.15873, 1.0), (0.174603, 0.96875), (0.333333, 0.03125), (0.349206, 0.0),
+                (0.666667, 0.0), (0.68254, 0.03125), (0.84127, 0.96875), (0.857143, 1.0), (1.0, 1.0)],
+        "green": [(0.0, 0.0), (0.15873, 0.9375), (0.174603, 1.0), (0.507937, 1.0), (0.666667, 0.0625),
+                  (0.68254, 0.0), (1.0, 0.0)],
+        "blue": [(0.0, 0.0), (0.333333, 0.0), (0.349206, 0.0625), (0.507937, 1.0), (0.84127, 1.0),
+                 (0.857143, 0.9375), (1.0, 0.09375)],
+    },
+    "gray": {
+        "red": [(0.0, 0.0), (1.0, 1.0)],
+        "green": [(0.0, 0.0), (1.0, 1.0)],
+        "blue": [(0.0, 0.0), (1.0, 1.0)],
+    },
+}
+
+# Names offered in app.py; the ones without segment data above come from matplotlib.
+COLORMAPS = sorted([*_SEGMENTS, "Greens", "magma", "viridis"], key=str.lower)
+
+@lru_cache(maxsize=None)
+def colormap_lut(name, n=256):
+    """
+    uint8 RGB lookup table of shape (n, 3) for a named colormap.
+
+    hot, cool, hsv and gray are built here from their segment data and match
+    matplotlib's; any other name is sampled from matplotlib.colormaps once.
+    Tables are cached, so this is free after the first call.
+    """
+    x = np.linspace(0, 1, n)
+    if name in _SEGMENTS:
+        rgb = np.stack([
+            np.interp(x, *zip(*_SEGMENTS[name][channel])) for channel in ("red", "green", "blue")
+        ], axis=-1)
+    else:
+        import matplotlib
+        rgb = matplotlib.colormaps[name](x)[:, :3]
+    lut = (rgb * 255).astype(np.uint8)
+    lut.flags.writeable = False
+    return lut
+
+def colorize(values, lut, vmin=None, vmax=None):
+    """
+    Map a 2-D array through a colormap lookup table.
+
+    Values are scaled linearly from [vmin, vmax] (the array's own range by
+    default, as imshow does) onto the table. Integer iteration counts take a
+    fast path: one table entry is built per possible count and the image is
+    a single gather.
+
+    Args:
+        values (np.ndarray): 2-D array, e.g. iteration counts.
+        lut (np.ndarray): (n, 3) uint8 table from colormap_lut.
+        vmin, vmax (float or None): Color range; defaults to the data range.
+    Returns:
+        np.ndarray: uint8 RGB image of shape values.shape + (3,).
+    """
+    values = np.asarray(values)
+    n = len(lut)
+    finite = values[np.isfinite(values)] if values.dtype.kind == "f" else values
+    vmin = (finite.min() if finite.size else 0) if vmin is None else vmin
+    vmax = (finite.max() if finite.size else 0) if vmax is None else vmax
+    scale = n / (vmax - vmin) if vmax > vmin else 0.0
+    if values.dtype.kind in "iu" and 0 <= vmin and vmax < 2**20:
+        # One LUT entry per possible count, then a single gather.
+        counts = np.arange(int(vmax) + 1)
+        table = lut[np.clip(((counts - vmin) * scale).astype(np.int64), 0, n - 1)]
+        return table[np.clip(values, 0, int(vmax))]
+    with np.errstate(invalid="ignore"):
+        idx = np.nan_to_num((values - vmin) * scale, nan=0.0)
+    return lut[np.clip(idx.astype(np.int64), 0, n - 1)]
+
+def png_chunk(tag, data):
+    """One PNG chunk: length, tag, payload and CRC."""
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+def png_header(width, height, channels=3):
+    """PNG signature plus IHDR for an 8-bit gray (1), RGB (3) or RGBA (4) image."""
+    color_type = {1: 0, 3: 2, 4: 6}[channels]
+    return PNG_SIGNATURE + png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0))
+
+def encode_png(image, compress_level=1):
+    """
+    Encode a uint8 (H, W), (H, W, 3) or (H, W, 4) array as PNG bytes.
+
+    No per-row filtering and a low zlib level (0 stores uncompressed) keep
+    encoding far cheaper than matplotlib's savefig.
+    """
+    image = np.ascontiguousarray(image, dtype=np.uint8)
+    height, width = image.shape[:2]
+    channels = 1 if image.ndim == 2 else image.shape[2]
+    rows = image.reshape(height, width * channels)
+    raw = np.zeros((height, width * channels + 1), dtype=np.uint8)  # leading 0 = filter type None
+    raw[:, 1:] = rows
+    return (png_header(width, height, channels)
+            + png_chunk(b"IDAT", zlib.compress(raw.tobytes(), compress_level))
+            + png_chunk(b"IEND", b""))
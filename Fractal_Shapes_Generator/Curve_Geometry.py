@@ -0,0 +1,223 @@
+import numpy as np
+try:
+    from .Instrumentation import count
+except ImportError:  # run as a script from this directory
+    from Instrumentation import count
+
+# Unit steps for headings 0..3 (east, north, west, south): exact, no cos/sin.
+_HEADINGS = np.array([[1, 0], [0, 1], [-1, 0], [0, -1]], dtype=np.int64)
+
+def hilbert_vertices(order):
+    """
+    Hilbert curve of the given order as a (4**order, 2) float32 vertex array.
+
+    Every index d is mapped to its cell directly (the classic d -> (x, y)
+    bit-pair recurrence), one vectorized pass per level. Vertices are cell
+    centres in the unit square, in the order of the recursive construction.
+    """
+    n = 1 << order
+    t = np.arange(n * n, dtype=np.int64)
+    x = np.zeros_like(t)
+    y = np.zeros_like(t)
+    s = 1
+    while s < n:
+        rx = 1 & (t >> 1)
+        ry = 1 & (t ^ rx)
+        # Rotate the quadrant so the sub-curve enters and leaves at the right corners.
+        flip = (ry == 0) & (rx == 1)
+        x = np.where(flip, s - 1 - x, x)
+        y = np.where(flip, s - 1 - y, y)
+        swap = ry == 0
+        x, y = np.where(swap, y, x), np.where(swap, x, y)
+        x += s * rx
+        y += s * ry
+        t >>= 2
+        s <<= 1
+    # Transposed so the curve starts upwards like the recursive construction.
+    return (np.stack([y, x], axis=1).astype(np.float32) + 0.5) / n
+
+def peano_vertices(order):
+    """
+    Peano curve of the given order as a (9**order, 2) float32 vertex array.
+
+    Uses Peano's digit formula: with the index written in base 3 as
+    a1 b1 a2 b2 ..., x takes digit a_j complemented (2 - a_j) when
+    b1 + ... + b_(j-1) is odd, and y takes b_j complemented when
+    a1 + ... + a_j is odd. Vertices are cell centres in the unit square.
+    """
+    n = 3 ** order
+    d = np.arange(n * n, dtype=np.int64)
+    digits = np.empty((2 * order, d.size), dtype=np.int64)
+    for k in range(2 * order - 1, -1, -1):
+        d, digits[k] = np.divmod(d, 3)
+    x = np.zeros(n * n, dtype=np.int64)
+    y = np.zeros(n * n, dtype=np.int64)
+    a_sum = np.zeros(n * n, dtype=np.int64)
+    b_sum = np.zeros(n * n, dtype=np.int64)
+    for j in range(order):
+        a, b = digits[2 * j], digits[2 * j + 1]
+        x = 3 * x + np.where(b_sum & 1, 2 - a, a)
+        a_sum += a
+        y = 3 * y + np.where(a_sum & 1, 2 - b, b)
+        b_sum += b
+    return (np.stack([x, y], axis=1).astype(np.float32) + 0.5) / n
+
+def dragon_turns(order):
+    """
+    Turn sequence of the dragon curve: 1 for a left turn, 0 for a right turn.
+
+    Turn n (1-based) is read off the bit just above the lowest set bit of n,
+    the paper-folding sequence, without building lists.
+    """
+    n = np.arange(1, 1 << order, dtype=np.int64)
+    return ((((n & -n) << 1) & n) != 0).astype(np.int8)
+
+def dragon_vertices(order):
+    """Dragon curve as a (2**order, 2) float32 vertex array of unit steps from the origin."""
+    turns = dragon_turns(order)
+    headings = np.cumsum(np.where(turns == 1, 1, -1)) % 4
+    steps = _HEADINGS[headings]
+    vertices = np.zeros((len(turns) + 1, 2), dtype=np.int64)
+    np.cumsum(steps, axis=0, out=vertices[1:])
+    return vertices.astype(np.float32)
+
+def koch_vertices(order, scale=10.0):
+    """
+    Closed Koch snowflake polygon (first vertex repeated at the end) as float32.
+
+    Every edge of one level is subdivided at once: the edge list is split
+    into thirds and the peak points are inserted with a single 60 degree
+    rotation. The vertices are the same as Koch_Snowflake's recursion.
+    """
+    h = scale * np.sin(np.pi / 3)
+    points = np.array([[0, 0], [scale, 0], [scale / 2, h], [0, 0]], dtype=np.float64)
+    cos60, sin60 = np.cos(np.pi / 3), np.sin(np.pi / 3)
+    for _ in range(order):
+        count("levels")
+        p1, p2 = points[:-1], points[1:]
+        delta = p2 - p1
+        pA = p1 + delta / 3
+        pC = p1 + 2 * delta / 3
+        v = pC - pA
+        pB = pA + np.stack([cos60 * v[:, 0] - sin60 * v[:, 1], sin60 * v[:, 0] + cos60 * v[:, 1]], axis=1)
+        refined = np.empty((4 * len(p1) + 1, 2))
+        refined[0:-1:4], refined[1::4], refined[2::4], refined[3::4] = p1, pA, pB, pC
+        refined[-1] = points[-1]
+        points = refined
+    return points.astype(np.float32)
+
+def levy_vertices(order, p1=(0.0, 0.0), p2=(1.0, 0.0)):
+    """
+    Levy C curve as a (2**order + 1, 2) float32 vertex array.
+
+    Each level inserts the right-angle midpoint of every segment at once,
+    as the recursive construction does one segment at a time.
+    """
+    points = np.array([p1, p2], dtype=np.float64)
+    for _ in range(order):
+        count("levels")
+        a, b = points[:-1], points[1:]
+        mid = np.stack([
+            (a[:, 0] + b[:, 0]) / 2 + (a[:, 1] - b[:, 1]) / 2,
+            (a[:, 1] + b[:, 1]) / 2 + (b[:, 0] - a[:, 0]) / 2,
+        ], axis=1)
+        refined = np.empty((2 * len(points) - 1, 2))
+        refined[0::2], refined[1::2] = points, mid
+        points = refined
+    return points.astype(np.float32)
+
+def tree_children(squares):
+    """
+    Both child squares of every Pythagoras tree square (a, b, c, d) at once.
+
+    Each child is the parent moved by a fixed offset: by d - a for the child
+    on base d -> c, by c - a for the one on c -> c + (b - a).
+
+    Args:
+        squares (np.ndarray): (N, 4, 2) squares.
+    Returns:
+        np.ndarray: (2N, 4, 2) squares, the two children of each parent in turn.
+    """
+    offsets = squares[:, [3, 2]] - squares[:, :1]
+    return (squares[:, np.newaxis] + offsets[:, :, np.newaxis]).reshape(-1, 4, 2)
+
+def triangle_children(tris):
+    """
+    The three corner triangles of every Sierpinski triangle at once.
+
+    Corner triangle k is its parent scaled by 1/2 about vertex k, so its
+    vertex j is the midpoint of the parent's vertices k and j.
+
+    Args:
+        tris (np.ndarray): (N, 3, 2) triangles.
+    Returns:
+        np.ndarray: (3N, 3, 2) triangles, the three children of each parent in turn.
+    """
+    return ((tris[:, :, np.newaxis] + tris[:, np.newaxis]) / 2).reshape(-1, 3, 2)
+
+def cantor_children(segments, drop=0.1):
+    """
+    The outer thirds of every Cantor segment at once, moved down by `drop`.
+
+    Args:
+        segments (np.ndarray): (N, 2, 2) horizontal segments.
+    Returns:
+        np.ndarray: (2N, 2, 2) segments, left and right third of each parent in turn.
+    """
+    start = segments[:, :1]
+    left = start + (segments - start) / 3
+    children = np.stack([left, left + 2 * (segments[:, 1:] - start) / 3], axis=1)
+    children[..., 1] -= drop
+    return children.reshape(-1, 2, 2)
+
+def tree_levels(order, p1=(0, 0), p2=(1, 0)):
+    """
+    Pythagoras tree squares level by level, as a generator.
+
+    Every level is one tree_children call on the whole previous level, so
+    an order-20 tree is 20 array operations instead of a million recursive
+    calls. Level k holds the squares at depth k of the tree's recursion.
+
+    Yields:
+        np.ndarray: (2**k, 4, 2) float32 squares of level k, for k = 0 .. order - 1.
+    """
+    a, b = np.asarray(p1, dtype=np.float64), np.asarray(p2, dtype=np.float64)
+    perp = np.array([a[1] - b[1], b[0] - a[0]])
+    squares = np.array([[a, b, b + perp, a + perp]])
+    for level in range(order):
+        count("levels")
+        yield squares.astype(np.float32)
+        if level < order - 1:
+            squares = tree_children(squares)
+
+def triangle_levels(order, p1=(0, 0), p2=(1, 0), p3=(0.5, 0.866)):
+    """
+    Sierpinski triangles level by level, as a generator.
+
+    Level k holds the 3**k triangles at depth k of the recursive
+    construction; the last level (k = order) holds the leaves it fills.
+
+    Yields:
+        np.ndarray: (3**k, 3, 2) float32 triangles of level k, for k = 0 .. order.
+    """
+    tris = np.array([[p1, p2, p3]], dtype=np.float64)
+    for level in range(order + 1):
+        count("levels")
+        yield tris.astype(np.float32)
+        if level < order:
+            tris = triangle_children(tris)
+
+def cantor_levels(order, x=0, y=1, length=1):
+    """
+    Cantor set segments level by level, as a generator.
+
+    Yields:
+        np.ndarray: (2**k, 2, 2) float32 segments drawn at depth k, each
+        level 0.1 below the one above, for k = 0 .. order - 1.
+    """
+    segments = np.array([[[x, y], [x + length, y]]], dtype=np.float64)
+    for level in range(order):
+        count("levels")
+        yield segments.astype(np.float32)
+        if level < order - 1:
+            segments = cantor_children(segments)
@@ -0,0 +1,204 @@
+import decimal
+from decimal import Decimal
+import numpy as np
+from .Escape_Time import count_dtype
+
+GLITCH_TOLERANCE = 1e-3
+SERIES_TOLERANCE = 1e-12
+
+def reference_orbit(cr, ci, max_iter, prec):
+    """
+    High-precision Mandelbrot orbit of the reference point C = cr + ci*i.
+
+    The orbit is iterated with `prec` significant decimal digits and stored as
+    complex128: the orbit values themselves are O(1), only C needs the digits.
+    Iteration stops once |Z| > 2, so the returned array can be shorter than
+    max_iter + 1.
+
+    Args:
+        cr, ci (Decimal): Reference point.
+        max_iter (int): Maximum number of iterations.
+        prec (int): Decimal digits of working precision.
+    Returns:
+        np.ndarray: complex128 array Z with Z[k] the orbit after k steps (Z[0] = 0).
+    """
+    ctx = decimal.Context(prec=prec)
+    zr = zi = Decimal(0)
+    orbit = [0j]
+    four = Decimal(4)
+    for _ in range(max_iter):
+        zr2 = ctx.multiply(zr, zr)
+        zi2 = ctx.multiply(zi, zi)
+        zi = ctx.add(ctx.multiply(ctx.multiply(zr, zi), 2), ci)
+        zr = ctx.add(ctx.subtract(zr2, zi2), cr)
+        orbit.append(complex(float(zr), float(zi)))
+        if ctx.add(ctx.multiply(zr, zr), ctx.multiply(zi, zi)) > four:
+            break
+    return np.array(orbit, dtype=np.complex128)
+
+def series_coefficients(orbit, dmax, tolerance=SERIES_TOLERANCE):
+    """
+    Third-order series approximation delta_n ~ A_n dc + B_n dc^2 + C_n dc^3.
+
+    Coefficients are kept pre-scaled by powers of dmax (the largest |dc| in the
+    view), a = A*dmax, b = B*dmax^2, c = C*dmax^3, so they stay in float64
+    range at any zoom and apply to u = dc / dmax with |u| <= 1. Iteration stops
+    at the first step where the cubic term is no longer negligible next to the
+    linear one, or just before the reference escapes.
+
+    Returns:
+        np.ndarray: complex128 array of shape (n + 1, 3); row k holds (a, b, c)
+        after k iterations, and n is the largest usable skip.
+    """
+    coeffs = [(0j, 0j, 0j)]
+    a = b = c = 0j
+    for n in range(len(orbit) - 2):
+        z2 = 2 * orbit[n]
+        a, b, c = z2 * a + dmax, z2 * b + a * a, z2 * c + 2 * a * b
+        if abs(c) > tolerance * abs(a):
+            break
+        coeffs.append((a, b, c))
+    return np.array(coeffs, dtype=np.complex128)
+
+def series_skip(orbit, coeffs, u):
+    """
+    Largest skip k whose series deltas leave no pixel already escaped.
+
+    Escape is permanent, so "escaped after k steps" is monotone in k and a
+    binary search over the usable range finds the cut-off.
+
+    Returns:
+        tuple: (k, deltas after k iterations).
+    """
+    def delta_at(k):
+        a, b, c = coeffs[k]
+        return ((c * u + b) * u + a) * u
+
+    def valid(k):
+        z = orbit[k] + delta_at(k)
+        return not (z.real * z.real + z.imag * z.imag > 4).any()
+
+    lo, hi = 0, len(coeffs) - 1
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if valid(mid):
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo, delta_at(lo)
+
+def perturbation_counts(orbit, dc, max_iter, skip=0, delta=None, glitch_tolerance=GLITCH_TOLERANCE):
+    """
+    Escape-time counts of C_ref + dc relative to a reference orbit.
+
+    Each pixel iterates only its float64 deviation from the reference:
+    delta_{n+1} = 2 Z_n delta_n + delta_n^2 + dc. Counts follow the
+    escape_time convention. A pixel is flagged as glitched when its orbit comes
+    much closer to 0 than the reference (Pauldelbrot's criterion), or when it
+    outlives a reference that escaped early; glitched pixels need a new
+    reference.
+
+    Args:
+        orbit (np.ndarray): Reference orbit from reference_orbit.
+        dc (np.ndarray): complex128 offsets of the pixels from the reference point.
+        max_iter (int): Maximum number of iterations.
+        skip (int): Iterations already covered by `delta` (series approximation).
+        delta (np.ndarray or None): Deviations after `skip` iterations; zeros if None.
+        glitch_tolerance (float): Relative |z|/|Z| below which a pixel is glitched.
+    Returns:
+        tuple: (int32 counts, bool glitched mask), both shaped like dc.
+    """
+    dc = np.asarray(dc, dtype=np.complex128).ravel()
+    d = np.zeros_like(dc) if delta is None else np.asarray(delta, dtype=np.complex128).ravel().copy()
+    counts = np.full(dc.size, max_iter, dtype=np.int32)
+    glitched = np.zeros(dc.size, dtype=bool)
+    idx = np.arange(dc.size)
+    last = len(orbit) - 1
+    tol2 = glitch_tolerance ** 2
+
+    with np.errstate(over='ignore', invalid='ignore'):
+        for i in range(skip, max_iter):
+            if idx.size == 0:
+                break
+            if i >= last:
+                # The reference escaped before these pixels did.
+                glitched[idx] = True
+                break
+            Z = orbit[i]
+            d = (2 * Z + d) * d + dc
+            z = orbit[i + 1] + d
+            r2 = z.real * z.real + z.imag * z.imag
+            escaped = r2 > 4
+            counts[idx[escaped]] = i
+            Z1 = orbit[i + 1]
+            glitch = ~escaped & (r2 < tol2 * (Z1.real * Z1.real + Z1.imag * Z1.imag))
+            glitched[idx[glitch]] = True
+            keep = ~(escaped | glitch)
+            if not keep.all():
+                d, dc, idx = d[keep], dc[keep], idx[keep]
+    return counts, glitched
+
+def _to_decimal(value):
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+def generate_mandelbrot_deep(center_x, center_y, zoom, width, height, max_iter=1000, base_span=3.0,
+                             max_references=16, series=True):
+    """
+    Render the Mandelbrot set at arbitrary zoom with perturbation theory.
+
+    One reference orbit is computed in high precision at the view centre and
+    every pixel iterates a float64 offset from it. The series approximation
+    skips the first iterations for all pixels at once, and glitched pixels are
+    re-rendered against a new reference placed on one of them, up to
+    `max_references` references in total. Pixel offsets are float64, so zooms
+    up to about 1e300 are supported.
+
+    Args:
+        center_x, center_y (str or Decimal): View centre, e.g. "-0.743643887037158704752191506114774".
+        zoom (str or Decimal): Magnification relative to a `base_span` wide view, e.g. "1e50".
+        width, height (int): Output resolution.
+        max_iter (int): Maximum number of iterations.
+        base_span (float): Width of the view at zoom 1, as in app.py.
+        max_references (int): Upper bound on the number of reference orbits.
+        series (bool): Use series approximation to skip initial iterations.
+    Returns:
+        tuple: (uint16 (or uint32) counts of shape (height, width) laid out like
+        generate_mandelbrot_set, dict with "references", "skipped" and
+        "glitched" -- pixels left unresolved).
+    """
+    cx, cy, zoom = _to_decimal(center_x), _to_decimal(center_y), _to_decimal(zoom)
+    prec = max(30, int(zoom.adjusted()) + 30)
+    step = float(Decimal(base_span) / zoom / max(width - 1, 1))
+    # Offsets from the centre in pixel units, then in the plane; row 0 is the bottom (ymin) edge.
+    ox = (np.arange(width) - (width - 1) / 2) * step
+    oy = (np.arange(height) - (height - 1) / 2) * step
+    offsets = np.empty((height, width), dtype=np.complex128)
+    offsets.real = ox[np.newaxis, :]
+    offsets.imag = oy[:, np.newaxis]
+    offsets = offsets.ravel()
+
+    counts = np.zeros(offsets.size, dtype=np.int32)
+    pending = np.arange(offsets.size)
+    ref = 0j  # current reference, as an offset from the centre
+    info = {"references": 0, "skipped": [], "glitched": 0}
+    while pending.size and info["references"] < max_references:
+        ctx = decimal.Context(prec=prec)
+        orbit = reference_orbit(ctx.add(cx, Decimal(ref.real)), ctx.add(cy, Decimal(ref.imag)), max_iter, prec)
+        info["references"] += 1
+        dc = offsets[pending] - ref
+        skip, delta = 0, None
+        if series:
+            dmax = float(np.abs(dc).max()) or 1.0
+            skip, delta = series_skip(orbit, series_coefficients(orbit, dmax), dc / dmax)
+        info["skipped"].append(skip)
+        pixel_counts, glitched = perturbation_counts(orbit, dc, max_iter, skip, delta)
+        counts[pending] = pixel_counts
+        if not glitched.any():
+            pending = pending[:0]
+            break
+        # Next reference: the glitched pixel closest to the centroid of the glitched ones.
+        bad = offsets[pending[glitched]]
+        ref = bad[np.argmin(np.abs(bad - bad.mean()))]
+        pending = pending[glitched]
+    info["glitched"] = int(pending.size)
+    return counts.reshape(height, width).astype(count_dtype(max_iter)), info
@@ -1,25 +1,23 @@
 import matplotlib.pyplot as plt
-import math, os
+import os
 from tqdm import tqdm
+try:
+    from .Curve_Geometry import dragon_vertices
+    from .Rasterizer import draw_segments, fit_bounds, new_image, polyline_segments
+except ImportError:  # run as a script from this directory
+    from Curve_Geometry import dragon_vertices
+    from Rasterizer import draw_segments, fit_bounds, new_image, polyline_segments
 
 output_dir = "../Fractal_Shapes/Dragon_Curve"
 
-def dragon_curve(order):
-    def turn_right(path): return [1-i for i in reversed(path)]
-    path = []
-    for _ in range(order):
-        path = path + [0] + turn_right(path)
-    return path
-
-def generate_dragon_curve(order):
+def generate_dragon_curve(order, backend="matplotlib", size=(800, 800)):
+    if backend == "raster":
+        # Returns an RGBA uint8 image of `size` (width, height) instead of saving a PNG.
+        vertices = dragon_vertices(order)
+        return draw_segments(new_image(size), polyline_segments(vertices), fit_bounds(vertices, size), 'purple')
     plt.figure(figsize=(8,8))
-    path = dragon_curve(order)
-    x, y, angle = [0], [0], 0
-    for turn in path:
-        angle += math.pi/2 if turn else -math.pi/2
-        x.append(x[-1] + math.cos(angle))
-        y.append(y[-1] + math.sin(angle))
-    plt.plot(x, y, color='purple')
+    vertices = dragon_vertices(order)
+    plt.plot(vertices[:, 0], vertices[:, 1], color='purple')
     plt.axis('equal'); plt.axis('off')
     plt.tight_layout()
     os.makedirs(output_dir, exist_ok=True)
@@ -0,0 +1,142 @@
+import numpy as np
+from .Instrumentation import current_trace
+
+_R2_FILTER = 3.9999
+PERIODICITY_TOLERANCE = 1e-12
+PRECISIONS = ("auto", "complex64", "complex128")
+# complex64 is used when a pixel is at least this many float32 ulps wide per
+# iteration, measured at the largest coordinate of the view (and at least |z| = 2).
+COMPLEX64_ULPS_PER_ITERATION = 32
+
+def escape_time(z, c, max_iter, compact_every=16, periodicity=False, tolerance=PERIODICITY_TOLERANCE):
+    """
+    Vectorized escape-time iteration of z -> z*z + c over a whole grid.
+
+    Produces the same counts as the scalar loops in Mandelbrot.py and Julia.py:
+    the index of the first step after which |z| > 2, or max_iter if the orbit
+    never escapes. Every `compact_every` steps the pixels that are still active
+    are packed into smaller arrays, so escaped pixels stop costing anything.
+
+    With `periodicity`, each orbit is compared against a saved orbit point that
+    is refreshed at doubling intervals (steps 1, 2, 4, 8, ...). An orbit that
+    comes back within `tolerance` of it has fallen into a cycle, never escapes,
+    and is retired with max_iter straight away instead of running to the end.
+
+    complex64 input is iterated in float32, which halves the memory traffic;
+    anything else is iterated in float64. See select_precision.
+
+    Args:
+        z (array-like): Starting values z0 (any shape).
+        c (complex or array-like): Constant added each step; a scalar (Julia)
+            or an array broadcastable to z (Mandelbrot).
+        max_iter (int): Maximum number of iterations.
+        compact_every (int): Number of steps between compactions.
+        periodicity (bool): Stop orbits early once they are detected as periodic.
+        tolerance (float): Per-component distance treated as a repeated point.
+    Returns:
+        np.ndarray: int32 iteration counts with the shape of z.
+    """
+    z = np.asarray(z)
+    if z.dtype != np.complex64:
+        z = z.astype(np.complex128)
+    shape = z.shape
+    # Real and imaginary parts are iterated separately: this reproduces the
+    # rounding of Python's complex multiply exactly and avoids complex temporaries.
+    x = z.real.ravel().copy()
+    y = z.imag.ravel().copy()
+    c = np.asarray(c, dtype=z.dtype)
+    per_pixel = c.ndim > 0
+    if per_pixel:
+        c = np.broadcast_to(c, shape)
+        cx = c.real.ravel().copy()
+        cy = c.imag.ravel().copy()
+    else:
+        cx, cy = c.real[()], c.imag[()]
+    counts = np.full(x.size, max_iter, dtype=np.int32)
+    idx = np.arange(x.size)
+    compact_every = max(1, int(compact_every))
+
+    trace = current_trace()
+    i = 0
+    save_at = 1
+    sx, sy = x.copy(), y.copy()
+    with np.errstate(over='ignore', invalid='ignore'):
+        xx = x * x
+        yy = y * y
+        while i < max_iter and idx.size:
+            if trace is not None:
+                trace.append("active_pixels", int(idx.size))
+            alive = np.ones(idx.size, dtype=bool)
+            xy = np.empty_like(x)
+            r2 = np.empty_like(x)
+            for _ in range(min(compact_every, max_iter - i)):
+                np.multiply(x, y, out=xy)
+                np.subtract(xx, yy, out=x)
+                x += cx
+                np.add(xy, xy, out=y)
+                y += cy
+                np.multiply(x, x, out=xx)
+                np.multiply(y, y, out=yy)
+                np.add(xx, yy, out=r2)
+                # |z|^2 is a cheap filter; hypot settles the pixels near the radius
+                # so the escape test matches abs(z) > 2 bit for bit.
+                near = np.flatnonzero((r2 > _R2_FILTER) & alive)
+                if near.size:
+                    near = near[np.hypot(x[near], y[near]) > 2]
+                    counts[idx[near]] = i
+                    alive[near] = False
+                i += 1
+                if periodicity:
+                    if i == save_at:
+                        sx[:], sy[:] = x, y
+                        save_at *= 2
+                    else:
+                        # Periodic orbits keep counts == max_iter; they only leave the active set.
+                        alive &= (np.abs(x - sx) >= tolerance) | (np.abs(y - sy) >= tolerance)
+            x, y, xx, yy = x[alive], y[alive], xx[alive], yy[alive]
+            sx, sy = sx[alive], sy[alive]
+            idx = idx[alive]
+            if per_pixel:
+                cx = cx[alive]
+                cy = cy[alive]
+    if trace is not None:
+        trace.count("iterations", i)
+    return counts.reshape(shape)
+
+def select_precision(xmin, xmax, ymin, ymax, width, height, max_iter=256, precision="auto"):
+    """
+    Complex dtype to iterate a viewport in.
+
+    "auto" picks complex64 when the pixel spacing is at least
+    COMPLEX64_ULPS_PER_ITERATION * max_iter float32 ulps of the largest
+    coordinate magnitude, and complex128 otherwise. Rounding errors grow
+    along an orbit, most of all near the boundary of a Julia set, so the
+    margin scales with the iteration budget; Precision_Check measures it.
+    "complex64" and "complex128" force the choice.
+
+    Returns:
+        np.dtype: complex64 or complex128.
+    """
+    if precision not in PRECISIONS:
+        raise ValueError(f"precision must be one of {PRECISIONS}, not {precision!r}")
+    if precision != "auto":
+        return np.dtype(precision)
+    spacing = min((xmax - xmin) / max(width - 1, 1), (ymax - ymin) / max(height - 1, 1))
+    magnitude = max(abs(xmin), abs(xmax), abs(ymin), abs(ymax), 2.0)
+    ulp = np.spacing(np.float32(magnitude))
+    return np.dtype(np.complex64 if spacing >= COMPLEX64_ULPS_PER_ITERATION * max_iter * ulp else np.complex128)
+
+def count_dtype(max_iter):
+    """Smallest unsigned integer dtype that holds counts up to max_iter: uint16 or uint32."""
+    return np.dtype(np.uint16 if max_iter <= np.iinfo(np.uint16).max else np.uint32)
+
+def complex_grid(xmin, xmax, ymin, ymax, width, height, dtype=np.complex128):
+    """Complex sample grid of shape (height, width); row j is r2[j], column i is r1[i]."""
+    return axes_grid(np.linspace(xmin, xmax, width), np.linspace(ymin, ymax, height), dtype)
+
+def axes_grid(r1, r2, dtype=np.complex128):
+    """Complex grid from its real axis r1 (columns) and imaginary axis r2 (rows)."""
+    grid = np.empty((r2.size, r1.size), dtype=dtype)
+    grid.real = r1[np.newaxis, :]
+    grid.imag = r2[:, np.newaxis]
+    return grid
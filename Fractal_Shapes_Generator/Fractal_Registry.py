@@ -0,0 +1,144 @@
+"""
+Declarative registry of the fractals offered by app.py.
+
+Each entry names its generator as "Module:function" and is only imported
+on first use, so listing fractals, building the controls and reading most
+descriptions costs no numpy or matplotlib import. Entry keys:
+
+    generator   "Module:function" inside this package.
+    params      Control names, looked up in PARAMS.
+    output      "image" (2-D array), "vertices" (vertex/polygon arrays,
+                rasterized) or "points" (point cloud, binned to a density).
+    engine      How app.py renders it: "escape_time", "newton",
+                "chaos_game", "orbit_density" or "raster".
+    description Markdown text, or ("Module", "attribute") to load it lazily.
+    cmap        Default colormap for image and point outputs.
+    base_span   Width of the plane shown at zoom 1, for zoomable fractals.
+    modes       Render modes offered for escape-time fractals.
+    seconds     Time budget of an orbit-density render.
+"""
+import importlib
+
+PACKAGE = __name__.rpartition(".")[0] or "Fractal_Shapes_Generator"
+
+# Control schema: Streamlit widget, label, positional arguments after the label, keyword arguments, column.
+PARAMS = {
+    "max_iter": {"widget": "slider", "label": "Iterations", "args": (50, 1000, 256, 50), "column": "iterations"},
+    "order": {"widget": "slider", "label": "Order", "args": (1, 10, 5), "column": "iterations"},
+    "zoom": {"widget": "slider", "label": "Zoom (1x–100x)", "args": (1, 100, 1), "column": "zoom"},
+    "center_x": {"widget": "slider", "label": "Center X", "args": (-2.0, 2.0, 0.0), "kwargs": {"step": 0.01},
+                 "column": "position"},
+    "center_y": {"widget": "slider", "label": "Center Y", "args": (-2.0, 2.0, 0.0), "kwargs": {"step": 0.01},
+                 "column": "position"},
+    "c_real": {"widget": "slider", "label": "Julia c (Real)", "args": (-1.5, 1.5, -0.8, 0.01), "column": "position"},
+    "c_imag": {"widget": "slider", "label": "Julia c (Imag)", "args": (-1.5, 1.5, 0.156, 0.01), "column": "position"},
+    "coeffs": {"widget": "text_input", "label": "Polynomial coefficients (highest degree first)",
+               "args": ("1, 0, 0, -1",), "column": "position"},
+    "resolution": {"widget": "select_slider", "label": "Resolution (width)", "args": ([350, 700, 1400, 2800], 700),
+                   "column": "position"},
+    "n_points": {"widget": "select_slider", "label": "Num Points",
+                 "args": ([100_000, 1_000_000, 10_000_000, 100_000_000, 1_000_000_000], 1_000_000),
+                 "column": "position"},
+    "orbit_iter": {"widget": "select_slider", "label": "Max orbit length", "args": ([100, 500, 1000, 5000], 500),
+                   "column": "iterations"},
+    "anti": {"widget": "checkbox", "label": "Anti-Buddhabrot (bounded orbits)", "args": (), "column": "position"},
+}
+
+ESCAPE_TIME_MODES = ["Full grid", "Boundary tracing", "Incremental pan/zoom"]
+
+FRACTALS = {
+    "Mandelbrot Set": {
+        "generator": "Mandelbrot:generate_mandelbrot_set",
+        "params": ["max_iter", "zoom", "center_x", "center_y"],
+        "output": "image", "engine": "escape_time",
+        "description": ("Mandelbrot", "mandelbrot_description"),
+        "cmap": "hot", "base_span": 3.0, "modes": ESCAPE_TIME_MODES + ["Deep zoom"],
+    },
+    "Julia Set": {
+        "generator": "Julia:generate_julia_set",
+        "params": ["max_iter", "zoom", "center_x", "center_y", "c_real", "c_imag"],
+        "output": "image", "engine": "escape_time",
+        "description": ("Julia", "julia_description"),
+        "cmap": "cool", "base_span": 4.0, "modes": ESCAPE_TIME_MODES,
+    },
+    "Koch Snowflake": {
+        "generator": "Koch_Snowflake:generate_koch_snowflake",
+        "params": ["order"], "output": "vertices", "engine": "raster",
+        "description": "The Koch Snowflake is constructed by recursively altering each straight edge into a spike. At each recursion level, edges become more intricate.",
+    },
+    "Levy C Curve": {
+        "generator": "Lecy_O_Curve:generate_levy_curve",
+        "params": ["order"], "output": "vertices", "engine": "raster",
+        "description": "The Levy C curve is created by recursively bending lines at right angles, forming increasingly zig-zagged curves.",
+    },
+    "Pythagoras Tree": {
+        "generator": "Pythagoras_Tree:generate_pythagoras_tree",
+        "params": ["order"], "output": "vertices", "engine": "raster",
+        "description": "The Pythagoras Tree is formed by growing squares recursively in a branching pattern.",
+    },
+    "Sierpinski Triangle": {
+        "generator": "Sierpinnski_triangle:generate_sierpinski_triangle",
+        "params": ["order"], "output": "vertices", "engine": "raster",
+        "description": "The Sierpinski Triangle is an iconic fractal built by recursively removing triangles, revealing self-similar gaps.",
+    },
+    "Sierpinski Carpet": {
+        "generator": "Sierpinski_Carpet:generate_sierpinski_carpet",
+        "params": ["order"], "output": "image", "engine": "raster",
+        "description": "The Sierpinski Carpet generalizes the triangle into a grid, recursively removing squares to create a woven fractal.",
+    },
+    "Dragon Curve": {
+        "generator": "Dragon_Curve:generate_dragon_curve",
+        "params": ["order"], "output": "vertices", "engine": "raster",
+        "description": "The Dragon Curve is a recursive fold pattern resulting in a self-similar zig-zag shape.",
+    },
+    "Cantor Set": {
+        "generator": "Cantour_Set:generate_cantor_set",
+        "params": ["order"], "output": "vertices", "engine": "raster",
+        "description": "The Cantor Set is formed by iteratively removing the central third of every segment.",
+    },
+    "Barnsley Fern": {
+        "generator": "Barnsley_Fern:barnsley_fern_density",
+        "params": ["n_points"], "output": "points", "engine": "chaos_game",
+        "description": "The Barnsley Fern uses random affine transforms to mimic fern leaf growth.",
+        "cmap": "Greens",
+    },
+    "Buddhabrot": {
+        "generator": "Buddhabrot:buddhabrot_density",
+        "params": ["orbit_iter", "n_points", "anti"], "output": "points", "engine": "orbit_density",
+        "description": "The Buddhabrot plots where the orbits of escaping points of the Mandelbrot iteration travel, rather than how fast they escape; the Anti-Buddhabrot plots the orbits that never escape.",
+        "cmap": "hot", "seconds": 20,
+    },
+    "Hilbert Curve": {
+        "generator": "Hilbert_Curve:generate_hilbert_curve",
+        "params": ["order"], "output": "vertices", "engine": "raster",
+        "description": "The Hilbert Curve is a space-filling path that visits every cell of a grid via recursive turns.",
+    },
+    "Peano Curve": {
+        "generator": "Peano_Curve:generate_peano_curve",
+        "params": ["order"], "output": "vertices", "engine": "raster",
+        "description": "The Peano Curve recursively fills a grid, visiting every cell.",
+    },
+    "Newton Fractal": {
+        "generator": "Newton_Fractal:newton_basins",
+        "params": ["order", "zoom", "center_x", "center_y", "coeffs", "resolution"],
+        "output": "image", "engine": "newton",
+        "description": "The Newton Fractal visualizes the basins of attraction for Newton's method applied to complex polynomials.",
+        "cmap": "hsv", "base_span": 4.0,
+    },
+}
+
+def load(ref):
+    """Import "Module:attribute" from this package on demand and return the attribute."""
+    module, _, attribute = ref.partition(":")
+    return getattr(importlib.import_module(f"{PACKAGE}.{module}"), attribute)
+
+def generator(name):
+    """The generator callable of a registered fractal; its module is imported on first use."""
+    return load(FRACTALS[name]["generator"])
+
+def describe(name):
+    """Markdown description of a registered fractal."""
+    description = FRACTALS[name]["description"]
+    if isinstance(description, tuple):
+        return load(":".join(description))
+    return description
@@ -1,22 +1,24 @@
 import matplotlib.pyplot as plt
 import os
 from tqdm import tqdm
+try:
+    from .Curve_Geometry import hilbert_vertices
+    from .Rasterizer import draw_segments, fit_bounds, new_image, polyline_segments
+except ImportError:  # run as a script from this directory
+    from Curve_Geometry import hilbert_vertices
+    from Rasterizer import draw_segments, fit_bounds, new_image, polyline_segments
 
 output_dir = "../Fractal_Shapes/Hilbert_curve"
 
-def hilbert(ax, x, y, xi, xj, yi, yj, n):
-    if n <= 0:
-        ax.plot(x + (xi+yi)/2, y + (xj+yj)/2, 'ro')
-    else:
-        hilbert(ax, x, y, yi/2, yj/2, xi/2, xj/2, n-1)
-        hilbert(ax, x+xi/2, y+xj/2, xi/2, xj/2, yi/2, yj/2, n-1)
-        hilbert(ax, x+xi/2+yi/2, y+xj/2+yj/2, xi/2, xj/2, yi/2, yj/2, n-1)
-        hilbert(ax, x+xi/2+yi, y+xj/2+yj, -yi/2, -yj/2, -xi/2, -xj/2, n-1)
-
-def generate_hilbert_curve(order):
+def generate_hilbert_curve(order, backend="matplotlib", size=(800, 800)):
+    if backend == "raster":
+        # Returns an RGBA uint8 image of `size` (width, height) instead of saving a PNG.
+        vertices = hilbert_vertices(order)
+        return draw_segments(new_image(size), polyline_segments(vertices), fit_bounds(vertices, size), 'red')
     plt.figure(figsize=(7,7))
     ax = plt.gca()
-    hilbert(ax, 0, 0, 1, 0, 0, 1, order)
+    vertices = hilbert_vertices(order)
+    ax.plot(vertices[:, 0], vertices[:, 1], 'ro')
     plt.axis('off')
     plt.tight_layout()
     os.makedirs(output_dir, exist_ok=True)
@@ -0,0 +1,181 @@
+"""
+Per-render timing and counters.
+
+A render runs inside `tracing(...)`, which makes a RenderTrace current for
+the calling context. The app times its stages with `trace.stage(name)`,
+and generator internals report through the module-level `count()` and
+`append()`, which do nothing when no trace is active, so the generators
+cost the same outside the app. Finished traces go to a RenderLog: a
+JSON-lines file plus an in-memory tail used for latency percentiles.
+"""
+import contextvars
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_current = contextvars.ContextVar("render_trace", default=None)
+
+class RenderTrace:
+    """
+    Timings and counters of one render.
+
+    stages maps a stage name to seconds (summed if a stage runs twice),
+    counters maps a name to a running total, and series maps a name to a
+    list of values recorded step by step, e.g. pixels still active.
+    """
+
+    def __init__(self, fractal, params=None):
+        self.fractal = fractal
+        self.params = dict(params or {})
+        self.stages = {}
+        self.counters = {}
+        self.series = {}
+        self.started = time.time()
+        self.total_seconds = None
+        self.peak_memory_bytes = None
+        self.rss_peak_bytes = None
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def append(self, name, value):
+        self.series.setdefault(name, []).append(value)
+
+    def to_dict(self):
+        return {
+            "fractal": self.fractal, "params": self.params,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+            "total_seconds": self.total_seconds, "stages": self.stages,
+            "counters": self.counters, "series": self.series,
+            "peak_memory_bytes": self.peak_memory_bytes, "rss_peak_bytes": self.rss_peak_bytes,
+        }
+
+def peak_rss_bytes():
+    """Peak resident set size of this process in bytes, or None where the resource module is missing."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def current_trace():
+    """The active RenderTrace, or None outside `tracing`."""
+    return _current.get()
+
+def count(name, n=1):
+    """Add `n` to a counter of the active trace, if any."""
+    trace = _current.get()
+    if trace is not None:
+        trace.count(name, n)
+
+def append(name, value):
+    """Record one value of a series on the active trace, if any."""
+    trace = _current.get()
+    if trace is not None:
+        trace.append(name, value)
+
+@contextmanager
+def tracing(fractal, params=None, memory=False):
+    """
+    Make a new RenderTrace current for the body of the with block.
+
+    With memory=True the peak Python/numpy allocation is measured with
+    tracemalloc, which slows allocation-heavy renders down noticeably. The
+    process's peak RSS is recorded where the platform reports it.
+    """
+    trace = RenderTrace(fractal, params)
+    token = _current.set(trace)
+    tracing_memory = memory and not tracemalloc.is_tracing()
+    if tracing_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        yield trace
+    finally:
+        trace.total_seconds = time.perf_counter() - start
+        if tracing_memory:
+            trace.peak_memory_bytes = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        trace.rss_peak_bytes = peak_rss_bytes()
+        _current.reset(token)
+
+def default_log_path():
+    return os.environ.get(
+        "FRACTAL_RENDER_LOG",
+        os.path.join(os.path.expanduser("~"), ".cache", "FractalNotebook", "renders.jsonl"),
+    )
+
+class RenderLog:
+    """
+    Structured log of finished renders.
+
+    Every trace is appended as one JSON line to `path` (None keeps the log
+    in memory only). The last `keep` entries, including those already in
+    the file at start-up, are held in memory for latency_percentiles().
+    """
+
+    def __init__(self, path=None, keep=1000):
+        self.path = path
+        self.entries = deque(maxlen=keep)
+        self._lock = threading.Lock()
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            if os.path.exists(path):
+                with open(path) as f:
+                    for line in f:
+                        try:
+                            self.entries.append(json.loads(line))
+                        except ValueError:  # a line cut short by a crash
+                            continue
+
+    def add(self, trace):
+        entry = trace.to_dict() if isinstance(trace, RenderTrace) else trace
+        with self._lock:
+            self.entries.append(entry)
+            if self.path:
+                with open(self.path, "a") as f:
+                    f.write(json.dumps(entry, sort_keys=True, default=repr) + "\n")
+        return entry
+
+    def latency_percentiles(self, stage=None):
+        """
+        p50/p95 latency per fractal over the in-memory entries.
+
+        Args:
+            stage (str or None): A stage name, or None for the whole render.
+        Returns:
+            dict: {fractal: {"count": n, "p50": seconds, "p95": seconds}}.
+        """
+        samples = {}
+        with self._lock:
+            for entry in self.entries:
+                seconds = entry["total_seconds"] if stage is None else entry["stages"].get(stage)
+                if seconds is not None:
+                    samples.setdefault(entry["fractal"], []).append(seconds)
+        table = {}
+        for fractal, values in sorted(samples.items()):
+            if len(values) > 1:
+                cuts = statistics.quantiles(values, n=20, method="inclusive")
+                p50, p95 = cuts[9], cuts[18]
+            else:
+                p50 = p95 = values[0]
+            table[fractal] = {"count": len(values), "p50": p50, "p95": p95}
+        return table
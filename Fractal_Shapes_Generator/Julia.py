@@ -1,6 +1,6 @@
 import numpy as np
-import matplotlib.pyplot as plt
 import os
+from .Escape_Time import escape_time, complex_grid, count_dtype, select_precision
 output_dir="../Fractal_Shapes"
 def julia(c, max_iter):
     def func(z):
@@ -11,16 +11,17 @@ def julia(c, max_iter):
         return max_iter
     return func
 
-def generate_julia_set(c, xmin, xmax, ymin, ymax, width, height, max_iter=256):
-    r1 = np.linspace(xmin, xmax, width)
-    r2 = np.linspace(ymin, ymax, height)
-    julia_image = np.zeros((height, width))
-    func = julia(c, max_iter)
-    for i in range(width):
-        for j in range(height):
-            z = complex(r1[i], r2[j])
-            julia_image[j, i] = func(z)
-    return julia_image
+def generate_julia_set(c, xmin, xmax, ymin, ymax, width, height, max_iter=256, periodicity=False, precision="auto"):
+    """
+    Escape-time counts of the Julia set of `c` over a viewport.
+
+    `precision` is "auto", "complex64" or "complex128" (see select_precision);
+    counts come back as uint16, or uint32 when max_iter > 65535.
+    """
+    dtype = select_precision(xmin, xmax, ymin, ymax, width, height, max_iter, precision)
+    z = complex_grid(xmin, xmax, ymin, ymax, width, height, dtype)
+    julia_image = escape_time(z, c, max_iter, periodicity=periodicity)
+    return julia_image.astype(count_dtype(max_iter))
 
 julia_description="""
     ### Julia Set
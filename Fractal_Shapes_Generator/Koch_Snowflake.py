@@ -1,5 +1,8 @@
 import numpy as np
 import matplotlib.pyplot as plt
+from .Curve_Geometry import koch_vertices
+from .Level_Of_Detail import koch_lod, pixel_size
+from .Rasterizer import draw_polygons, fit_bounds, new_image
 
 koch_snowflake_description = r"""
 ### Koch Snowflake - Mathematical Construction
@@ -46,57 +49,43 @@ $$
 
 This fractal exemplifies the beautiful interplay of simple geometric rules producing infinite complexity through recursion and self-similarity.
 """
-def generate_koch_snowflake(order, zoom=1.0, ax=None):
+def generate_koch_snowflake(order, zoom=1.0, ax=None, backend="matplotlib", size=(800, 800), viewport=None):
     """
     Generate and plot Koch snowflake of given order, zooming by scaling the figure.
     Args:
         order (int): Recursion depth.
         zoom (float): Zoom factor that scales the fractal size (>0).
         ax (matplotlib.axes.Axes or None): Axis to plot on. If None, creates new.
+        backend (str): "matplotlib" plots on `ax`; "raster" returns an image array instead.
+        size (tuple): (width, height) of the raster image.
+        viewport (tuple or None): (xmin, xmax, ymin, ymax) to show, in the
+            scaled coordinates. Edges are then only refined where visible and
+            down to one pixel of `size` (see Level_Of_Detail.koch_lod).
     Returns:
-        fig (matplotlib.figure.Figure): The matplotlib figure object.
+        fig (matplotlib.figure.Figure): The matplotlib figure object, or an
+        RGBA uint8 image with backend="raster".
     """
     BASE_SCALE = 10  # Fixed size; zoom multiplies this
 
-    def koch_curve(p1, p2, order):
-        if order == 0:
-            return [tuple(p1), tuple(p2)]
-        p1, p2 = np.array(p1), np.array(p2)
-        delta = p2 - p1
-        pA = p1 + delta / 3
-        pC = p1 + 2 * delta / 3
-        angle = np.pi / 3
-        rot = np.array([
-            [np.cos(angle), -np.sin(angle)],
-            [np.sin(angle), np.cos(angle)]
-        ])
-        pB = pA + np.dot(rot, pC - pA)
-        return (
-            koch_curve(p1, pA, order-1)[:-1] +
-            koch_curve(pA, pB, order-1)[:-1] +
-            koch_curve(pB, pC, order-1)[:-1] +
-            koch_curve(pC, p2, order-1)
-        )
-
-    scale = BASE_SCALE * zoom
-    initial_pts = [
-        np.array([0, 0]),
-        np.array([scale, 0]),
-        np.array([scale/2, scale*np.sin(np.pi/3)]),
-        np.array([0, 0])
-    ]
-    points = []
-    for i in range(3):
-        points.extend(koch_curve(initial_pts[i], initial_pts[i+1], order)[:-1])
-    if points:
-        points.append(points[0])
-    x, y = zip(*points)
+    if viewport is None:
+        vertices = koch_vertices(order, BASE_SCALE * zoom)
+    else:
+        vertices = koch_lod(order, viewport, pixel_size(viewport, size), BASE_SCALE * zoom)
+    if backend == "raster":
+        # fit_bounds frames the whole snowflake, so zoom does not change the raster image.
+        polygon = vertices[:-1]
+        bounds = fit_bounds(polygon, size) if viewport is None else viewport
+        return draw_polygons(new_image(size), polygon, bounds, 'cyan', edgecolor='blue', line_width=0.5)
+    x, y = vertices.T
     if ax is None:
         fig, ax = plt.subplots(figsize=(8, 8))
     else:
         fig = ax.figure
     ax.fill(x, y, 'cyan', edgecolor='blue', linewidth=0.5)
     ax.axis('equal')
+    if viewport is not None:
+        ax.set_xlim(viewport[:2])
+        ax.set_ylim(viewport[2:])
     ax.axis('off')
     return fig
 
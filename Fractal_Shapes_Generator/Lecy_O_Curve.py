@@ -1,24 +1,30 @@
 import matplotlib.pyplot as plt
 import os
 from tqdm import tqdm
+try:
+    from .Curve_Geometry import levy_vertices
+    from .Level_Of_Detail import levy_lod, pixel_size
+    from .Rasterizer import draw_segments, fit_bounds, new_image, polyline_segments
+except ImportError:  # run as a script from this directory
+    from Curve_Geometry import levy_vertices
+    from Level_Of_Detail import levy_lod, pixel_size
+    from Rasterizer import draw_segments, fit_bounds, new_image, polyline_segments
 
 output_dir = "../Fractal_Shapes/Levy_C_curve"
 
-def levy_curve(ax, p1, p2, n):
-    if n == 0:
-        ax.plot([p1[0], p2[0]], [p1[1], p2[1]], 'b')
-    else:
-        mid = (
-            (p1[0] + p2[0])/2 + (p1[1] - p2[1])/2,
-            (p1[1] + p2[1])/2 + (p2[0] - p1[0])/2
-        )
-        levy_curve(ax, p1, mid, n-1)
-        levy_curve(ax, mid, p2, n-1)
-
-def generate_levy_curve(order):
+def generate_levy_curve(order, backend="matplotlib", size=(800, 800), viewport=None):
+    if backend == "raster":
+        # Returns an RGBA uint8 image of `size` (width, height) instead of saving a PNG.
+        if viewport is not None:
+            # Only the visible part, refined down to one pixel.
+            segments = levy_lod(order, viewport, pixel_size(viewport, size))
+            return draw_segments(new_image(size), segments, viewport, 'blue')
+        vertices = levy_vertices(order)
+        return draw_segments(new_image(size), polyline_segments(vertices), fit_bounds(vertices, size), 'blue')
     plt.figure(figsize=(8,8))
     ax = plt.gca()
-    levy_curve(ax, (0,0), (1,0), order)
+    vertices = levy_vertices(order)
+    ax.plot(vertices[:, 0], vertices[:, 1], 'b')
     plt.axis('off')
     plt.tight_layout()
     os.makedirs(output_dir, exist_ok=True)
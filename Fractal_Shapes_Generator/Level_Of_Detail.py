@@ -0,0 +1,181 @@
+"""
+Viewport-aware level of detail for the recursive vector fractals.
+
+Each function expands its fractal level by level, like Curve_Geometry, but
+only where it can be seen: a branch whose whole subtree lies outside the
+viewport is culled, and a branch whose subtree is smaller than one pixel
+stops and is drawn as its current primitive. A deep zoom into a small part
+of the fractal then costs about as much as the full view at the same
+output size, instead of the full 4**order (Koch), 2**order (Levy, tree) or
+3**order (triangle) primitives.
+
+`viewport` is (xmin, xmax, ymin, ymax) and `pixel` the size of one output
+pixel in the same units; pixel_size gives it for a viewport and an image size.
+EVERYWHERE with pixel 0 turns both off.
+"""
+import numpy as np
+try:
+    from .Curve_Geometry import tree_children, triangle_children
+    from .Instrumentation import count
+except ImportError:  # run as a script from this directory
+    from Curve_Geometry import tree_children, triangle_children
+    from Instrumentation import count
+
+# Farthest the limit curve gets from its segment, as a multiple of the segment length:
+# a Koch bump rises sqrt(3)/6 of it; the Levy C curve stays within ~1.12 of the midpoint.
+KOCH_REACH = np.sqrt(3) / 6
+LEVY_REACH = 1.2
+EVERYWHERE = (-np.inf, np.inf, -np.inf, np.inf)
+
+def pixel_size(viewport, size):
+    """Plane size of one pixel when `viewport` is drawn on a (width, height) image."""
+    xmin, xmax, ymin, ymax = viewport
+    width, height = size
+    return max((xmax - xmin) / width, (ymax - ymin) / height)
+
+def _overlaps(lo, hi, viewport):
+    """Mask of (N, 2) boxes [lo, hi] that intersect the viewport."""
+    xmin, xmax, ymin, ymax = viewport
+    return (hi[:, 0] >= xmin) & (lo[:, 0] <= xmax) & (hi[:, 1] >= ymin) & (lo[:, 1] <= ymax)
+
+def koch_lod(order, viewport, pixel, scale=10.0):
+    """
+    Closed Koch snowflake polygon, refined only where visible and above pixel size.
+
+    An edge is subdivided while it is at least a pixel long and the bumps it
+    would grow can reach the viewport. Other edges stay straight chords
+    rather than being dropped, so the polygon stays closed and fills the
+    same on screen. Vertices match koch_vertices wherever it is refined fully.
+
+    Returns:
+        np.ndarray: (n + 1, 2) float32 vertices, first vertex repeated.
+    """
+    h = scale * np.sin(np.pi / 3)
+    points = np.array([[0, 0], [scale, 0], [scale / 2, h], [0, 0]], dtype=np.float64)
+    cos60, sin60 = np.cos(np.pi / 3), np.sin(np.pi / 3)
+    for _ in range(order):
+        count("levels")
+        p1, p2 = points[:-1], points[1:]
+        delta = p2 - p1
+        length = np.hypot(delta[:, 0], delta[:, 1])
+        pad = (KOCH_REACH * length)[:, np.newaxis]
+        refine = (length >= pixel) & _overlaps(np.minimum(p1, p2) - pad, np.maximum(p1, p2) + pad, viewport)
+        if not refine.any():
+            break
+        pA = p1[refine] + delta[refine] / 3
+        pC = p1[refine] + 2 * delta[refine] / 3
+        v = pC - pA
+        pB = pA + np.stack([cos60 * v[:, 0] - sin60 * v[:, 1], sin60 * v[:, 0] + cos60 * v[:, 1]], axis=1)
+        starts = np.concatenate([[0], np.cumsum(1 + 3 * refine)])
+        refined = np.empty((starts[-1] + 1, 2))
+        refined[starts[:-1]] = p1
+        at = starts[:-1][refine]
+        refined[at + 1], refined[at + 2], refined[at + 3] = pA, pB, pC
+        refined[-1] = points[-1]
+        points = refined
+    return points.astype(np.float32)
+
+def levy_lod(order, viewport, pixel, p1=(0.0, 0.0), p2=(1.0, 0.0)):
+    """
+    Visible segments of the Levy C curve, each refined down to about a pixel.
+
+    A segment is split at its right-angle midpoint until the curve it stands
+    for fits in a pixel; segments whose curve cannot reach the viewport are
+    dropped. Fully refined, the segments are those of levy_vertices.
+
+    Returns:
+        np.ndarray: (N, 2, 2) float32 segments, in curve order.
+    """
+    segments = np.array([[p1, p2]], dtype=np.float64)
+    t = np.zeros(1)  # curve parameter of each segment's start, to restore curve order at the end
+    leaves, leaf_t = [], []
+    for level in range(order + 1):
+        count("levels")
+        a, b = segments[:, 0], segments[:, 1]
+        delta = b - a
+        reach = (LEVY_REACH * np.hypot(delta[:, 0], delta[:, 1]))[:, np.newaxis]
+        mid = (a + b) / 2
+        visible = _overlaps(mid - reach, mid + reach, viewport)
+        segments, t, reach = segments[visible], t[visible], reach[visible, 0]
+        leaf = (2 * reach < pixel) | (level == order)
+        leaves.append(segments[leaf])
+        leaf_t.append(t[leaf])
+        segments, t = segments[~leaf], t[~leaf]
+        if not len(segments):
+            break
+        a, b = segments[:, 0], segments[:, 1]
+        m = np.stack([
+            (a[:, 0] + b[:, 0]) / 2 + (a[:, 1] - b[:, 1]) / 2,
+            (a[:, 1] + b[:, 1]) / 2 + (b[:, 0] - a[:, 0]) / 2,
+        ], axis=1)
+        segments = np.stack([np.stack([a, m], axis=1), np.stack([m, b], axis=1)], axis=1).reshape(-1, 2, 2)
+        t = np.stack([t, t + 0.5 ** (level + 1)], axis=1).ravel()
+    segments = np.concatenate(leaves)
+    return segments[np.argsort(np.concatenate(leaf_t), kind="stable")].astype(np.float32)
+
+def tree_lod(order, viewport, pixel, p1=(0, 0), p2=(1, 0)):
+    """
+    Visible squares of the Pythagoras tree.
+
+    Both children of a square here are as large as their parent, so a
+    subtree of depth d grown on base a -> b stays inside the parallelogram
+    a + [0, d] * (b - a) + [0, d] * perp; subtrees whose parallelogram misses
+    the viewport are culled. Branches reach the same base along many paths
+    and would grow identical subtrees, so each distinct base is expanded
+    once. When a square is under a pixel its whole subtree, a staircase of
+    squares, is drawn as the quadrilateral that staircase fills to within a
+    square. With EVERYWHERE and pixel 0 the result is the distinct squares
+    among the 2**order - 1 of Curve_Geometry.tree_levels, about order**2 / 2.
+
+    Returns:
+        np.ndarray: (N, 4, 2) float32 polygons.
+    """
+    a, b = np.asarray(p1, dtype=np.float64), np.asarray(p2, dtype=np.float64)
+    perp = np.array([a[1] - b[1], b[0] - a[0]])
+    squares = np.array([[a, b, b + perp, a + perp]])
+    grid = np.hypot(*perp) * 1e-6
+    polygons = []
+    for depth in range(order, 0, -1):
+        count("levels")
+        a, b, d = squares[:, 0], squares[:, 1], squares[:, 3]
+        vec, perp = b - a, d - a
+        corners = np.stack([a, a + depth * vec, a + depth * perp, a + depth * (vec + perp)], axis=1)
+        visible = _overlaps(corners.min(axis=1), corners.max(axis=1), viewport)
+        squares, a, b, vec, perp = squares[visible], a[visible], b[visible], vec[visible], perp[visible]
+        small = np.hypot(vec[:, 0], vec[:, 1]) < pixel
+        polygons.append(np.stack([a[small], b[small], a[small] + depth * (vec[small] + perp[small]),
+                                  a[small] + depth * perp[small]], axis=1))
+        polygons.append(squares[~small])
+        if depth == 1 or small.all():
+            break
+        squares = tree_children(squares[~small])
+        # Squares reached along different paths differ only by rounding: merge them on a fine grid.
+        key = np.round(squares[:, :2].reshape(-1, 4) / grid)
+        squares = squares[np.sort(np.unique(key, axis=0, return_index=True)[1])]
+    return np.concatenate(polygons).astype(np.float32) if polygons else np.empty((0, 4, 2), dtype=np.float32)
+
+def triangle_lod(order, viewport, pixel, p1=(0, 0), p2=(1, 0), p3=(0.5, 0.866)):
+    """
+    Visible Sierpinski triangles, split down to about a pixel.
+
+    Every sub-triangle lies inside its parent, so a triangle outside the
+    viewport is culled with all its children, and one smaller than a pixel
+    is filled whole: the holes it would open are below pixel size. Fully
+    refined, the triangles are those of sierpinski_triangles.
+
+    Returns:
+        np.ndarray: (N, 3, 2) float32 triangles.
+    """
+    tris = np.array([[p1, p2, p3]], dtype=np.float64)
+    leaves = []
+    for level in range(order + 1):
+        count("levels")
+        lo, hi = tris.min(axis=1), tris.max(axis=1)
+        visible = _overlaps(lo, hi, viewport)
+        tris, lo, hi = tris[visible], lo[visible], hi[visible]
+        leaf = ((hi - lo).max(axis=1) < pixel) | (level == order)
+        leaves.append(tris[leaf])
+        if leaf.all():
+            break
+        tris = triangle_children(tris[~leaf])
+    return np.concatenate(leaves).astype(np.float32)
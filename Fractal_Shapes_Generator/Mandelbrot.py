@@ -1,22 +1,58 @@
 import numpy as np
+from .Escape_Time import escape_time, complex_grid, count_dtype, select_precision, PERIODICITY_TOLERANCE
 
-def mandelbrot(c, max_iter):
+def mandelbrot(c, max_iter, cardioid=False, periodicity=False):
+    if cardioid and in_cardioid_or_bulb(c):
+        return max_iter
     z = 0
+    saved, save_at = z, 1
     for i in range(max_iter):
         z = z*z + c
         if abs(z) > 2:
             return i
+        if periodicity:
+            if i + 1 == save_at:
+                saved, save_at = z, save_at * 2
+            elif abs(z.real - saved.real) < PERIODICITY_TOLERANCE and abs(z.imag - saved.imag) < PERIODICITY_TOLERANCE:
+                return max_iter
     return max_iter
 
-def generate_mandelbrot_set(xmin, xmax, ymin, ymax, width, height, max_iter=256):
-    r1 = np.linspace(xmin, xmax, width)
-    r2 = np.linspace(ymin, ymax, height)
-    mandelbrot_image = np.zeros((height, width))
-    for i in range(width):
-        for j in range(height):
-            c = complex(r1[i], r2[j])
-            mandelbrot_image[j, i] = mandelbrot(c, max_iter)
-    return mandelbrot_image
+def in_cardioid_or_bulb(c):
+    """
+    Closed-form membership test for the main cardioid and the period-2 bulb.
+
+    Works on a complex scalar or array. Points inside never escape, so they
+    can be given max_iter without iterating.
+    """
+    x, y = np.real(c), np.imag(c)
+    xq = x - 0.25
+    q = xq*xq + y*y
+    in_cardioid = q * (q + xq) <= 0.25 * y*y
+    in_bulb = (x + 1)**2 + y*y <= 0.0625
+    return in_cardioid | in_bulb
+
+def mandelbrot_counts(c, max_iter, cardioid=False, periodicity=False):
+    """Escape-time counts (int32) for an array of c values, with optional interior shortcuts."""
+    if not cardioid:
+        return escape_time(np.zeros_like(c), c, max_iter, periodicity=periodicity)
+    counts = np.full(c.shape, max_iter, dtype=np.int32)
+    outside = ~in_cardioid_or_bulb(c)
+    counts[outside] = escape_time(np.zeros(np.count_nonzero(outside), dtype=c.dtype), c[outside],
+                                  max_iter, periodicity=periodicity)
+    return counts
+
+def generate_mandelbrot_set(xmin, xmax, ymin, ymax, width, height, max_iter=256, cardioid=False, periodicity=False,
+                            precision="auto"):
+    """
+    Escape-time counts of the Mandelbrot set over a viewport.
+
+    `precision` is "auto", "complex64" or "complex128" (see select_precision);
+    counts come back as uint16, or uint32 when max_iter > 65535.
+    """
+    dtype = select_precision(xmin, xmax, ymin, ymax, width, height, max_iter, precision)
+    c = complex_grid(xmin, xmax, ymin, ymax, width, height, dtype)
+    mandelbrot_image = mandelbrot_counts(c, max_iter, cardioid, periodicity)
+    return mandelbrot_image.astype(count_dtype(max_iter))
 
 mandelbrot_description = """
 ### Mandelbrot Set
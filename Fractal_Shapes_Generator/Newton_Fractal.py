@@ -2,6 +2,12 @@ import numpy as np
 import matplotlib.pyplot as plt
 import os
 from tqdm import tqdm
+try:
+    from .Colorize import colorize, colormap_lut
+    from .Instrumentation import current_trace
+except ImportError:  # run as a script from this directory
+    from Colorize import colorize, colormap_lut
+    from Instrumentation import current_trace
 
 output_dir = "../Fractal_Shapes/Newton_fractal"
 
@@ -10,7 +16,9 @@ def newton_fractal(f, df, bounds, res=400, max_iter=20):
     x = np.linspace(xmin, xmax, res)
     y = np.linspace(ymin, ymax, res)
     X, Y = np.meshgrid(x, y)
-    Z = X + 1j*Y
+    return newton_iterate(f, df, X + 1j*Y, max_iter)
+
+def newton_iterate(f, df, Z, max_iter):
     for i in range(max_iter):
         Z -= f(Z)/df(Z)
     img = np.angle(f(Z))
@@ -19,10 +27,123 @@ def newton_fractal(f, df, bounds, res=400, max_iter=20):
 def f(z): return z**3 - 1
 def df(z): return 3*z**2
 
-def generate_newton_fractal(order):
-    img = newton_fractal(f, df, (-1.5,1.5,-1.5,1.5), res=600, max_iter=5+order*2)
+# Coefficients of f, highest degree first (np.polyval order).
+DEFAULT_COEFFS = (1, 0, 0, -1)
+NOT_CONVERGED = 255
+NOT_CONVERGED_RGB = (0, 0, 0)
+
+def newton_roots(coeffs, max_iter=64):
+    """
+    Trimmed complex coefficients and roots of a polynomial, after checking it and max_iter.
+
+    Raises:
+        ValueError: For a constant polynomial, more than NOT_CONVERGED - 1
+            roots, or max_iter outside 1 to 65535.
+    """
+    coeffs = np.trim_zeros(np.asarray(coeffs, dtype=np.complex128), "f")
+    if len(coeffs) < 2:
+        raise ValueError("Newton's method needs a polynomial of degree at least 1")
+    roots = np.roots(coeffs)
+    if len(roots) >= NOT_CONVERGED:
+        raise ValueError(f"at most {NOT_CONVERGED - 1} roots fit the uint8 root index")
+    if not 1 <= max_iter <= np.iinfo(np.uint16).max:
+        raise ValueError(f"max_iter must be between 1 and {np.iinfo(np.uint16).max}, not {max_iter}")
+    return coeffs, roots
+
+def newton_basins(coeffs=DEFAULT_COEFFS, bounds=(-1.5, 1.5, -1.5, 1.5), resolution=(600, 600), max_iter=64, tol=1e-8):
+    """
+    Basins of attraction of Newton's method for any polynomial.
+
+    The polynomial and its derivative are evaluated together by Horner's
+    scheme with in-place array operations, so no derivative coefficients or
+    temporaries per term are needed. A pixel leaves the working set as soon
+    as its Newton step is shorter than `tol`, so later iterations only touch
+    pixels still moving. Converged pixels get the index of the nearest root
+    from np.roots.
+
+    Args:
+        coeffs (sequence): Polynomial coefficients, highest degree first; complex allowed.
+        bounds (tuple): (xmin, xmax, ymin, ymax) of the viewport.
+        resolution (tuple): Output (width, height).
+        max_iter (int): Iteration cap, 1 to 65535.
+        tol (float): Step length below which a pixel counts as converged.
+    Returns:
+        tuple: (root_index, iterations, roots): uint8 root index per pixel,
+        NOT_CONVERGED where Newton's method did not settle; uint16 iterations
+        used; and the roots as a complex array. Row 0 is ymin.
+    """
+    xmin, xmax, ymin, ymax = bounds
+    width, height = resolution
+    return newton_basins_axes(coeffs, np.linspace(xmin, xmax, width), np.linspace(ymin, ymax, height), max_iter, tol)
+
+def newton_basins_axes(coeffs, r1, r2, max_iter=64, tol=1e-8):
+    """newton_basins on the grid of real parts r1 and imaginary parts r2, e.g. one tile of a larger view."""
+    coeffs, roots = newton_roots(coeffs, max_iter)
+    width, height = len(r1), len(r2)
+    z = (np.asarray(r1, dtype=np.float64)[np.newaxis, :]
+         + 1j * np.asarray(r2, dtype=np.float64)[:, np.newaxis]).ravel()
+    index = np.arange(z.size)
+    root_index = np.full(z.size, NOT_CONVERGED, dtype=np.uint8)
+    iterations = np.full(z.size, max_iter, dtype=np.uint16)
+
+    p = np.empty_like(z)
+    dp = np.empty_like(z)
+    trace = current_trace()
+    for i in range(1, max_iter + 1):
+        if trace is not None:
+            trace.append("active_pixels", int(z.size))
+        # Horner for p and p' together: p' <- p' z + p, then p <- p z + c.
+        p[:] = coeffs[0]
+        dp[:] = 0
+        for c in coeffs[1:]:
+            dp *= z
+            dp += p
+            p *= z
+            p += c
+        with np.errstate(divide="ignore", invalid="ignore"):
+            p /= dp
+        z -= p
+        step = np.abs(p)
+        done = step < tol
+        stuck = ~np.isfinite(step)
+        if done.any():
+            hit = index[done]
+            iterations[hit] = i
+            root_index[hit] = np.argmin(np.abs(z[done, np.newaxis] - roots), axis=1)
+        # Drop converged pixels and ones that hit a critical point (p' = 0).
+        keep = ~(done | stuck)
+        if stuck.any():
+            iterations[index[stuck]] = i
+        if not keep.all():
+            z, index = z[keep], index[keep]
+            p, dp = p[:z.size], dp[:z.size]
+        if z.size == 0:
+            break
+    if trace is not None:
+        trace.count("iterations", i)
+    return root_index.reshape(height, width), iterations.reshape(height, width), roots
+
+def basin_image(root_index, iterations, lut, shade_iter):
+    """
+    RGB image of the basins: one colormap band per root, darker towards slow convergence.
+
+    Pixel value is root + 1 - 0.5 * min(iterations / shade_iter, 1), spread
+    over the colormap from 0 to the number of roots. Pixels that never
+    converged get NOT_CONVERGED_RGB, so they cannot be mistaken for a root.
+    """
+    converged = root_index != NOT_CONVERGED
+    n_roots = int(root_index[converged].max()) + 1 if converged.any() else 1
+    shade = root_index.astype(np.float64) + 1 - 0.5 * np.minimum(iterations / max(shade_iter, 1), 1)
+    rgb = colorize(shade, lut, 0, n_roots)
+    rgb[~converged] = NOT_CONVERGED_RGB
+    return rgb
+
+def generate_newton_fractal(order, coeffs=DEFAULT_COEFFS, bounds=(-1.5, 1.5, -1.5, 1.5), res=600):
+    # The iteration budget is fixed so every pixel converges; order sets how many iterations the shading spans.
+    root_index, iterations, _ = newton_basins(coeffs, bounds, (res, res))
+    img = basin_image(root_index, iterations, colormap_lut("hsv"), 5 + order*2)
     plt.figure(figsize=(8,8))
-    plt.imshow(img, extent=(-1.5,1.5,-1.5,1.5), cmap='hsv')
+    plt.imshow(img, extent=bounds, origin='lower')
     plt.axis('off')
     plt.tight_layout()
     os.makedirs(output_dir, exist_ok=True)
@@ -1,24 +1,24 @@
 import matplotlib.pyplot as plt
 import os
 from tqdm import tqdm
+try:
+    from .Curve_Geometry import peano_vertices
+    from .Rasterizer import draw_segments, fit_bounds, new_image, polyline_segments
+except ImportError:  # run as a script from this directory
+    from Curve_Geometry import peano_vertices
+    from Rasterizer import draw_segments, fit_bounds, new_image, polyline_segments
 
 output_dir = "../Fractal_Shapes/Peano_curve"
 
-def peano(ax, x, y, size, n):
-    if n == 0:
-        ax.plot([x], [y], 'bo', markersize=1)
-    else:
-        newSize = size / 3
-        offsets = [(0,0), (0,newSize), (0,2*newSize),
-                   (newSize,2*newSize), (newSize,newSize), (newSize,0),
-                   (2*newSize,0), (2*newSize,newSize), (2*newSize,2*newSize)]
-        for dx, dy in offsets:
-            peano(ax, x+dx, y+dy, newSize, n-1)
-
-def generate_peano_curve(order):
+def generate_peano_curve(order, backend="matplotlib", size=(800, 800)):
+    if backend == "raster":
+        # Returns an RGBA uint8 image of `size` (width, height) instead of saving a PNG.
+        vertices = peano_vertices(order)
+        return draw_segments(new_image(size), polyline_segments(vertices), fit_bounds(vertices, size), 'blue')
     plt.figure(figsize=(8,8))
     ax = plt.gca()
-    peano(ax, 0, 0, 1, order)
+    vertices = peano_vertices(order)
+    ax.plot(vertices[:, 0], vertices[:, 1], 'bo', markersize=1)
     plt.axis('off')
     plt.tight_layout()
     os.makedirs(output_dir, exist_ok=True)
@@ -0,0 +1,184 @@
+"""
+Out-of-core poster renders of the Mandelbrot or a Julia set.
+
+    python -m Fractal_Shapes_Generator.Poster_Render poster.png --size 32768 32768
+        [--bounds XMIN XMAX YMIN YMAX] [--max-iter N] [--julia RE IM] [--cmap hot]
+        [--band-rows N] [--restart]
+
+The image is computed in horizontal bands, top to bottom. For a .png path
+each band is colorized and streamed into the PNG: rows are deflated by a
+fresh compressor per band, ending in a full flush, so every band is one
+self-contained IDAT chunk, and the zlib adler32 trailer is carried from
+band to band by hand. For a .npy path the raw iteration counts go into a
+memory-mapped array instead. Only one band is ever held in memory.
+
+A sidecar JSON file next to the output records the finished bands (and
+for PNG the file offset and running adler32), so rerunning the same
+command after an interruption continues from the last finished band.
+"""
+import argparse
+import json
+import os
+import struct
+import zlib
+import numpy as np
+from tqdm import tqdm
+from .Colorize import colorize, colormap_lut, png_chunk, png_header
+from .Escape_Time import axes_grid, count_dtype, escape_time, select_precision
+from .Mandelbrot import mandelbrot_counts
+
+# Rough working set of escape_time per pixel (grid, components, masks), used to size bands.
+BYTES_PER_PIXEL = 96
+ZLIB_HEADER = b"\x78\x01"
+
+def band_rows_for(width, band_bytes=256 * 2**20):
+    """Rows per band that keep a band's working set near `band_bytes`."""
+    return max(1, band_bytes // (width * BYTES_PER_PIXEL))
+
+def render_band(r1, r2, max_iter, c=None, dtype=np.complex128):
+    """Counts for the rows r2 (imaginary parts, any order) and columns r1, as int32."""
+    grid = axes_grid(r1, r2, dtype)
+    if c is None:
+        return mandelbrot_counts(grid, max_iter, cardioid=True, periodicity=True)
+    return escape_time(grid, c, max_iter, periodicity=True)
+
+def _load_state(path, params):
+    if os.path.exists(path):
+        with open(path) as f:
+            state = json.load(f)
+        if state.get("params") == params:
+            return state
+    return None
+
+def _save_state(path, state):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
+
+def render_poster(path, size, bounds=(-2.5, 1.0, -1.75, 1.75), max_iter=1000, c=None, cmap="hot", band_rows=None,
+                  restart=False, progress=True):
+    """
+    Render a poster to a streamed PNG or a memory-mapped .npy, band by band.
+
+    Row 0 is the top edge (ymax). A PNG is colorized over the fixed range
+    [0, max_iter]; a .npy holds the uint16 (or uint32) counts. Progress is
+    kept in `path + ".json"`; an existing one for the same parameters is
+    resumed unless `restart`, and it is removed once the poster is done.
+
+    Args:
+        path (str): Output file ending in .png or .npy.
+        size (tuple): Poster (width, height) in pixels.
+        bounds (tuple): (xmin, xmax, ymin, ymax) of the plane.
+        max_iter (int): Maximum number of iterations.
+        c (complex or None): Julia constant; None renders the Mandelbrot set.
+        cmap (str): Colormap name for PNG output.
+        band_rows (int or None): Rows per band; sized from band_rows_for by default.
+        restart (bool): Ignore saved progress.
+        progress (bool): Show a progress bar.
+    Returns:
+        str: The output path.
+    """
+    kind = os.path.splitext(path)[1].lower()
+    if kind not in (".png", ".npy"):
+        raise ValueError("poster path must end in .png or .npy")
+    width, height = size
+    band_rows = band_rows or band_rows_for(width)
+    params = {
+        "size": [width, height], "bounds": list(bounds), "max_iter": max_iter,
+        "c": None if c is None else [c.real, c.imag], "cmap": cmap, "band_rows": band_rows,
+    }
+    state_path = path + ".json"
+    state = None if restart or not os.path.exists(path) else _load_state(state_path, params)
+    if state is None:
+        state = {"params": params, "bands_done": 0, "offset": 0, "adler32": 1}
+
+    xmin, xmax, ymin, ymax = bounds
+    r1 = np.linspace(xmin, xmax, width)
+    r2 = np.linspace(ymin, ymax, height)[::-1]  # top row first
+    dtype = select_precision(xmin, xmax, ymin, ymax, width, height, max_iter)
+    lut = colormap_lut(cmap)
+    bands = range(0, height, band_rows)
+
+    if kind == ".npy":
+        mode = "r+" if state["bands_done"] else "w+"
+        out = np.lib.format.open_memmap(path, mode=mode, dtype=count_dtype(max_iter), shape=(height, width))
+    else:
+        out = open(path, "r+b" if state["bands_done"] else "wb")
+        if state["bands_done"]:
+            out.seek(state["offset"])
+            out.truncate()  # drop whatever a band cut short wrote
+        else:
+            out.write(png_header(width, height, 3))
+    try:
+        for n in tqdm(range(state["bands_done"], len(bands)), initial=state["bands_done"], total=len(bands),
+                      desc="Bands", disable=not progress):
+            y0 = bands[n]
+            y1 = min(y0 + band_rows, height)
+            counts = render_band(r1, r2[y0:y1], max_iter, c, dtype)
+            if kind == ".npy":
+                out[y0:y1] = counts
+                out.flush()
+            else:
+                rgb = colorize(counts, lut, 0, max_iter)
+                del counts
+                out.write(_png_band(rgb, n == 0, y1 == height, state))
+                out.flush()
+                os.fsync(out.fileno())
+                state["offset"] = out.tell()
+            state["bands_done"] = n + 1
+            _save_state(state_path, state)
+        if kind == ".png" and state["bands_done"] == len(bands) and out.tell() == state["offset"]:
+            out.write(png_chunk(b"IEND", b""))
+    finally:
+        if kind == ".npy":
+            del out
+        else:
+            out.close()
+    os.remove(state_path)
+    return path
+
+def _png_band(rgb, first, last, state):
+    """
+    One IDAT chunk holding a band of rows, each with filter byte 0.
+
+    Every band has its own raw deflate compressor ending in a full flush, so
+    the bands concatenate into one valid zlib stream and a resumed render
+    can start a band without the previous compressor. The zlib header goes
+    in the first band, the final block and the adler32 trailer in the last;
+    state["adler32"] carries the checksum across bands (and restarts).
+    """
+    compressor = zlib.compressobj(1, zlib.DEFLATED, -15)
+    parts = [ZLIB_HEADER] if first else []
+    adler = state["adler32"]
+    row = np.zeros(rgb.shape[1] * 3 + 1, dtype=np.uint8)
+    for pixels in rgb:
+        row[1:] = pixels.ravel()
+        data = row.tobytes()
+        adler = zlib.adler32(data, adler)
+        parts.append(compressor.compress(data))
+    parts.append(compressor.flush(zlib.Z_FINISH if last else zlib.Z_FULL_FLUSH))
+    if last:
+        parts.append(struct.pack(">I", adler))
+    state["adler32"] = adler
+    return png_chunk(b"IDAT", b"".join(parts))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render a poster-sized fractal band by band.")
+    parser.add_argument("path", help="output .png (colorized) or .npy (raw counts)")
+    parser.add_argument("--size", type=int, nargs=2, default=(32768, 32768), metavar=("WIDTH", "HEIGHT"))
+    parser.add_argument("--bounds", type=float, nargs=4, default=(-2.5, 1.0, -1.75, 1.75),
+                        metavar=("XMIN", "XMAX", "YMIN", "YMAX"))
+    parser.add_argument("--max-iter", type=int, default=1000)
+    parser.add_argument("--julia", type=float, nargs=2, metavar=("RE", "IM"), help="render this Julia set")
+    parser.add_argument("--cmap", default="hot")
+    parser.add_argument("--band-rows", type=int, default=None, help="rows per band (default: ~256 MB bands)")
+    parser.add_argument("--restart", action="store_true", help="ignore saved progress and start over")
+    args = parser.parse_args(argv)
+    c = complex(*args.julia) if args.julia else None
+    render_poster(args.path, tuple(args.size), tuple(args.bounds), args.max_iter, c, args.cmap,
+                  args.band_rows, args.restart)
+    print(f"Poster written to '{args.path}'")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Check that the complex64 fast path agrees with complex128.
+
+    python -m Fractal_Shapes_Generator.Precision_Check [--max-iter N] [--threshold 0.01]
+
+Renders each view in VIEWS with both precisions and reports how many pixels
+differ and by how much. Near the boundary of the set some counts always
+change, a few of them by many iterations, because float32 rounding moves
+the step at which a slow orbit escapes. A view fails when the share of
+pixels that differ by more than `tolerance` iterations exceeds the
+threshold, and only views where "auto" picks complex64 are held to it.
+The exit status is 1 if any such view fails.
+"""
+import argparse
+import sys
+import time
+import numpy as np
+from .Escape_Time import select_precision
+from .Julia import generate_julia_set
+from .Mandelbrot import generate_mandelbrot_set
+
+# name: (c or None for the Mandelbrot set, center, span at zoom 1), rendered at the app's zooms.
+VIEWS = {
+    "mandelbrot": (None, (-0.5, 0.0), 3.0),
+    "mandelbrot_seahorse": (None, (-0.745, 0.105), 3.0),
+    "julia": (complex(-0.8, 0.156), (0.0, 0.0), 4.0),
+    "julia_spiral": (complex(0.285, 0.01), (0.1, 0.2), 4.0),
+}
+ZOOMS = [1, 10, 100]
+
+def compare_precisions(bounds, resolution=(700, 400), max_iter=256, c=None, tolerance=1):
+    """
+    Render one view with complex64 and complex128 and compare the counts.
+
+    Args:
+        bounds (tuple): (xmin, xmax, ymin, ymax).
+        resolution (tuple): (width, height).
+        max_iter (int): Maximum number of iterations.
+        c (complex or None): Julia constant; None for the Mandelbrot set.
+        tolerance (int): Count differences up to this are not counted as mismatches.
+    Returns:
+        dict: "auto" (dtype name auto selects), "differ" and "mismatched"
+        (pixel counts), "mismatched_fraction", "max_abs_diff", and the time
+        of each precision in seconds.
+    """
+    width, height = resolution
+    images, seconds = {}, {}
+    for precision in ("complex64", "complex128"):
+        start = time.perf_counter()
+        if c is None:
+            images[precision] = generate_mandelbrot_set(*bounds, width, height, max_iter, precision=precision)
+        else:
+            images[precision] = generate_julia_set(c, *bounds, width, height, max_iter, precision=precision)
+        seconds[precision] = time.perf_counter() - start
+    diff = np.abs(images["complex64"].astype(np.int64) - images["complex128"])
+    mismatched = int(np.count_nonzero(diff > tolerance))
+    return {
+        "auto": select_precision(*bounds, width, height, max_iter).name,
+        "differ": int(np.count_nonzero(diff)),
+        "mismatched": mismatched,
+        "mismatched_fraction": mismatched / diff.size,
+        "max_abs_diff": int(diff.max()),
+        "seconds_complex64": seconds["complex64"],
+        "seconds_complex128": seconds["complex128"],
+    }
+
+def view_bounds(center, span, zoom, resolution):
+    width, height = resolution
+    half_x = span / zoom / 2
+    half_y = half_x * height / width
+    return center[0] - half_x, center[0] + half_x, center[1] - half_y, center[1] + half_y
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare complex64 and complex128 escape-time renders.")
+    parser.add_argument("--max-iter", type=int, default=256)
+    parser.add_argument("--width", type=int, default=700)
+    parser.add_argument("--height", type=int, default=400)
+    parser.add_argument("--tolerance", type=int, default=1, help="allowed count difference (default: %(default)s)")
+    parser.add_argument("--threshold", type=float, default=0.01,
+                        help="allowed share of mismatched pixels (default: %(default)s)")
+    args = parser.parse_args(argv)
+    resolution = (args.width, args.height)
+
+    failed = False
+    for name, (c, center, span) in VIEWS.items():
+        for zoom in ZOOMS:
+            bounds = view_bounds(center, span, zoom, resolution)
+            r = compare_precisions(bounds, resolution, args.max_iter, c, args.tolerance)
+            bad = r["auto"] == "complex64" and r["mismatched_fraction"] > args.threshold
+            failed |= bad
+            print(f"{name:<20} zoom {zoom:>4}  auto={r['auto']:<10}  differ {r['differ']:>7,}  "
+                  f"mismatched {r['mismatched_fraction']:7.3%}  max diff {r['max_abs_diff']:>4}  "
+                  f"{r['seconds_complex64'] * 1000:7.1f} ms vs {r['seconds_complex128'] * 1000:7.1f} ms"
+                  + ("  FAIL" if bad else ""))
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,25 +1,32 @@
 import matplotlib.pyplot as plt
 import numpy as np
 import os
+from matplotlib.collections import PolyCollection
 from tqdm import tqdm
+try:
+    from .Rasterizer import draw_polygons, fit_bounds, new_image
+    from .Level_Of_Detail import EVERYWHERE, pixel_size, tree_lod
+except ImportError:  # run as a script from this directory
+    from Rasterizer import draw_polygons, fit_bounds, new_image
+    from Level_Of_Detail import EVERYWHERE, pixel_size, tree_lod
 
 output_dir = "../Fractal_Shapes/Pythagoras_tree"
 
-def draw_tree(ax, p1, p2, depth):
-    if depth == 0: return
-    vec = np.array([p2[0]-p1[0], p2[1]-p1[1]])
-    perp = np.array([-vec[1], vec[0]])
-    p3 = p2 + perp
-    p4 = p1 + perp
-    ax.fill([p1[0], p2[0], p3[0], p4[0]],[p1[1],p2[1],p3[1],p4[1]],'lime')
-    if depth > 1:
-        draw_tree(ax, p4, p3, depth-1)
-        draw_tree(ax, p3, p2 + vec + perp, depth-1)
-
-def generate_pythagoras_tree(order):
+def generate_pythagoras_tree(order, backend="matplotlib", size=(800, 800), viewport=None):
+    if backend == "raster":
+        # Returns an RGBA uint8 image of `size` (width, height) instead of saving a PNG.
+        if viewport is not None:
+            # Only the visible part, down to one pixel.
+            squares = tree_lod(order, viewport, pixel_size(viewport, size))
+            return draw_polygons(new_image(size), squares, viewport, 'lime')
+        # Many branches land on the same square: fill each distinct square once.
+        squares = tree_lod(order, EVERYWHERE, 0)
+        return draw_polygons(new_image(size), squares, fit_bounds(squares, size), 'lime')
     plt.figure(figsize=(8,8))
     ax = plt.gca()
-    draw_tree(ax, (0,0), (1,0), order)
+    # One collection of the distinct squares instead of an artist per square, so high orders stay drawable.
+    ax.add_collection(PolyCollection(tree_lod(order, EVERYWHERE, 0), facecolors='lime', edgecolors='lime'))
+    ax.autoscale_view()
     plt.axis('off')
     plt.tight_layout()
     os.makedirs(output_dir, exist_ok=True)
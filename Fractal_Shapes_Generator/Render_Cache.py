@@ -0,0 +1,218 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+import numpy as np
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+@lru_cache(maxsize=None)
+def code_version():
+    """sha256 over the source of every module in the package, so cached results never outlive the code."""
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(PACKAGE_DIR)):
+        if name.endswith(".py"):
+            with open(os.path.join(PACKAGE_DIR, name), "rb") as f:
+                digest.update(name.encode() + b"\0" + f.read())
+    return digest.hexdigest()
+
+def cache_key(fractal, params, bounds, resolution):
+    """Stable hex key for a render: fractal name, parameters, viewport bounds, resolution and code version."""
+    payload = json.dumps(
+        {"fractal": fractal, "params": params, "bounds": bounds, "resolution": resolution,
+         "code": code_version()},
+        sort_keys=True, default=repr,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def _json_default(o):
+    """json.dump fallback for numpy scalars and arrays in an info dict."""
+    if isinstance(o, (np.generic, np.ndarray)):
+        return o.tolist()
+    raise TypeError(f"cannot store {type(o).__name__} in render info")
+
+class RenderCache:
+    """
+    Two-tier cache of raw fractal result arrays.
+
+    The memory tier is an LRU bounded by total array size (nbytes). With a
+    `disk_dir`, every stored array is also written to disk, either as a plain
+    .npy file that is memory-mapped on load or, with `compress=True`, as a
+    compressed .npz. The disk tier survives restarts and is itself bounded by
+    `disk_max_bytes`, evicting the least recently used files first. Keys
+    include code_version(), so after any change to the package old entries
+    are never served again and age out of the disk tier.
+
+    A result can carry a small JSON-serializable info dict (side results
+    of the render, e.g. pixels iterated); it is kept in memory with the
+    array and on disk as a .json file next to it.
+
+    Counters are available from stats(): memory and disk hits, misses,
+    memory evictions, disk writes and disk evictions.
+    """
+
+    def __init__(self, max_bytes=256 * 2**20, disk_dir=None, disk_max_bytes=2 * 2**30, compress=False):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        self.compress = compress
+        self._entries = OrderedDict()
+        self._info = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.counters = {
+            "hits": 0, "disk_hits": 0, "misses": 0,
+            "evictions": 0, "disk_writes": 0, "disk_evictions": 0,
+        }
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.disk_dir, key + (".npz" if self.compress else ".npy"))
+
+    def _info_path(self, key):
+        return os.path.join(self.disk_dir, key + ".json")
+
+    def _remember(self, key, value, info=None):
+        old = self._entries.pop(key, None)
+        self._info.pop(key, None)
+        if old is not None:
+            self._bytes -= old.nbytes
+        if value.nbytes > self.max_bytes:
+            return
+        self._entries[key] = value
+        if info is not None:
+            self._info[key] = info
+        self._bytes += value.nbytes
+        while self._bytes > self.max_bytes:
+            evicted_key, evicted = self._entries.popitem(last=False)
+            self._info.pop(evicted_key, None)
+            self._bytes -= evicted.nbytes
+            self.counters["evictions"] += 1
+
+    def _load(self, key):
+        if not self.disk_dir:
+            return None
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        os.utime(path)  # disk LRU order follows mtime
+        if self.compress:
+            with np.load(path) as data:
+                return data["value"]
+        return np.load(path, mmap_mode="r")
+
+    def _load_info(self, key):
+        if not self.disk_dir or not os.path.exists(self._info_path(key)):
+            return None
+        with open(self._info_path(key)) as f:
+            return json.load(f)
+
+    def _store(self, key, value, info=None):
+        if not self.disk_dir:
+            return
+        path = self._path(key)
+        if info is not None:
+            # Written before the array, so an array on disk never lacks its info.
+            tmp = self._info_path(key) + ".tmp"
+            try:
+                with open(tmp, "w") as f:
+                    json.dump(info, f, default=_json_default)
+                os.replace(tmp, self._info_path(key))
+            except BaseException:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+                raise
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            if self.compress:
+                np.savez_compressed(f, value=value)
+            else:
+                np.save(f, value)
+        os.replace(tmp, path)
+        self.counters["disk_writes"] += 1
+        self._trim_disk()
+
+    def _trim_disk(self):
+        files = []
+        for name in os.listdir(self.disk_dir):
+            if name.endswith((".npy", ".npz")):
+                path = os.path.join(self.disk_dir, name)
+                st = os.stat(path)
+                files.append((st.st_mtime, st.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.disk_max_bytes:
+                break
+            os.remove(path)
+            sidecar = os.path.splitext(path)[0] + ".json"
+            if os.path.exists(sidecar):
+                os.remove(sidecar)
+            total -= size
+            self.counters["disk_evictions"] += 1
+
+    def get(self, key):
+        """Cached array for `key`, or None. Disk hits are promoted to memory."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.counters["hits"] += 1
+                return value
+            value = self._load(key)
+            if value is not None:
+                self.counters["disk_hits"] += 1
+                self._remember(key, value, self._load_info(key))
+                return value
+            self.counters["misses"] += 1
+            return None
+
+    def get_info(self, key):
+        """Info dict stored with `key`, or None."""
+        with self._lock:
+            info = self._info.get(key)
+            return info if info is not None or key in self._entries else self._load_info(key)
+
+    def put(self, key, value, info=None):
+        value = np.asarray(value)
+        info = dict(info) if info else None
+        with self._lock:
+            self._remember(key, value, info)
+            self._store(key, value, info)
+
+    def get_or_compute(self, fractal, params, bounds, resolution, compute, info=None):
+        """
+        Return the cached result for these render inputs, computing it on a miss.
+
+        Args:
+            fractal (str): Fractal name, e.g. "Mandelbrot Set".
+            params (dict): Generator parameters (max_iter, c, flags, ...).
+            bounds (tuple or None): Viewport (xmin, xmax, ymin, ymax).
+            resolution (tuple or None): Output (width, height).
+            compute (callable): Zero-argument function producing the array.
+            info (dict or None): Filled by `compute` with side results on a
+                miss, which are cached with the array; filled from the cache
+                on a hit.
+        Returns:
+            np.ndarray: The result array; treat it as read-only.
+        """
+        key = cache_key(fractal, params, bounds, resolution)
+        value = self.get(key)
+        if value is None:
+            value = np.asarray(compute())
+            self.put(key, value, info)
+        elif info is not None:
+            info.update(self.get_info(key) or {})
+        return value
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counters, entries=len(self._entries), bytes=self._bytes)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._info.clear()
+            self._bytes = 0
@@ -1,43 +1,64 @@
 import matplotlib.pyplot as plt
+import numpy as np
 import os
+from matplotlib.collections import PolyCollection
 from tqdm import tqdm
+try:
+    from .Curve_Geometry import triangle_levels
+    from .Rasterizer import draw_polygons, fit_bounds, new_image
+    from .Level_Of_Detail import pixel_size, triangle_lod
+except ImportError:  # run as a script from this directory
+    from Curve_Geometry import triangle_levels
+    from Rasterizer import draw_polygons, fit_bounds, new_image
+    from Level_Of_Detail import pixel_size, triangle_lod
 
 # --- Configuration ---
 # Directory to save the generated fractal images
 output_dir = "../Fractal_Shapes/Sierpinski_triangle"
 
+# --- Leaf Triangles as an Array ---
+def sierpinski_triangles(order, p1=(0, 0), p2=(1, 0), p3=(0.5, 0.866)):
+    """
+    Leaf triangles of the given order as a (3**order, 3, 2) float32 array.
+
+    The last level of triangle_levels: the triangles the recursive
+    construction fills, in the same order.
+    """
+    for tris in triangle_levels(order, p1, p2, p3):
+        pass
+    return tris
+
 # --- Sierpinski Triangle Generation Function ---
-def generate_sierpinski_triangle(order, p1=(0, 0), p2=(1, 0), p3=(0.5, 0.866)):
+def generate_sierpinski_triangle(order, p1=(0, 0), p2=(1, 0), p3=(0.5, 0.866), backend="matplotlib", size=(800, 800),
+                                 viewport=None):
     """
     Generates and saves a single Sierpinski triangle image for a given order.
 
     Args:
         order (int): The recursion order of the triangle.
         p1, p2, p3 (tuple): The coordinates of the initial triangle's vertices.
+        backend (str): "matplotlib" saves a PNG; "raster" returns the image array instead.
+        size (tuple): (width, height) of the raster image.
+        viewport (tuple or None): (xmin, xmax, ymin, ymax) the raster image shows,
+            the whole triangle by default. Triangles outside it are culled and
+            none is split below one pixel.
+    Returns:
+        np.ndarray or None: RGBA uint8 image with backend="raster".
     """
-    def midpoint(p1, p2):
-        """Calculates the midpoint between two points."""
-        return ((p1[0] + p2[0]) / 2, (p1[1] + p2[1]) / 2)
-
-    def draw_triangle(points, order):
-        """Recursively draws the sub-triangles."""
-        if order == 0:
-            # Base case: draw a single filled triangle
-            triangle = plt.Polygon(points, edgecolor='black', facecolor='magenta')
-            plt.gca().add_patch(triangle)
-        else:
-            # Recursive step: calculate midpoints and draw three smaller triangles
-            p1, p2, p3 = points
-            mid12 = midpoint(p1, p2)
-            mid23 = midpoint(p2, p3)
-            mid31 = midpoint(p3, p1)
-            draw_triangle([p1, mid12, mid31], order-1)
-            draw_triangle([mid12, p2, mid23], order-1)
-            draw_triangle([mid31, mid23, p3], order-1)
+    if backend == "raster":
+        # Splitting stops at pixel size, so any order costs about as much as order log2(size).
+        bounds = fit_bounds([p1, p2, p3], size) if viewport is None else viewport
+        tris = triangle_lod(order, bounds, pixel_size(bounds, size), p1, p2, p3)
+        image = new_image(size)
+        return draw_polygons(image, tris, bounds, 'magenta', edgecolor='black', line_width=0.5)
 
     # --- Plotting and Saving ---
+    # All leaf triangles go into one collection instead of one patch each.
     plt.figure(figsize=(8, 8))
-    draw_triangle([p1, p2, p3], order)
+    ax = plt.gca()
+    tris = sierpinski_triangles(order, p1, p2, p3)
+    ax.add_collection(PolyCollection(tris, edgecolors='black', facecolors='magenta'))
+    ax.autoscale_view()
     plt.axis('equal')
     plt.axis('off')
     
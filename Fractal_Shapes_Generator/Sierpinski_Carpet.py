@@ -1,25 +1,116 @@
+import argparse
 import numpy as np
 import matplotlib.pyplot as plt
 import os
 from tqdm import tqdm
 
 output_dir = "../Fractal_Shapes/Sierpinski_Carpet"
+# Large orders are data, not gallery images: they go to a cache directory, never into Fractal_Shapes.
+memmap_dir = os.path.join(os.path.expanduser("~"), ".cache", "FractalNotebook", "carpets")
+
+def _ones_mask(indices, order):
+    """Bitmask of the base-3 digit positions of each index that equal 1."""
+    indices = np.asarray(indices, dtype=np.int64)
+    mask = np.zeros(indices.shape, dtype=np.int64)
+    for k in range(order):
+        indices, digit = np.divmod(indices, 3)
+        mask |= (digit == 1).astype(np.int64) << k
+    return mask
+
+def carpet_cells(order, rows, cols):
+    """
+    Cells of the order-n carpet at the given row and column indices, as uint8 (255 filled, 0 hole).
+
+    A cell is a hole exactly when its row and column share a base-3 digit
+    position where both digits are 1. With those positions packed into one
+    bitmask per row and per column the whole grid is a single outer AND,
+    so any subset of cells is decided without recursion or the full image.
+    """
+    row_mask = _ones_mask(rows, order)
+    col_mask = _ones_mask(cols, order)
+    return np.where((row_mask[:, np.newaxis] & col_mask) == 0, 255, 0).astype(np.uint8)
 
 def sierpinski_carpet(order):
     size = 3 ** order
-    img = np.ones((size, size), dtype=np.uint8) * 255
-    def remove_center(x, y, s):
-        if s == 1: return
-        s3 = s // 3
-        img[y+s3:y+2*s3, x+s3:x+2*s3] = 0
-        for dx in range(3):
-            for dy in range(3):
-                if dx == dy == 1: continue
-                remove_center(x + dx*s3, y + dy*s3, s3)
-    remove_center(0, 0, size)
-    return img
-
-def generate_sierpinski_carpet(order):
+    return carpet_cells(order, np.arange(size), np.arange(size))
+
+def carpet_window(order, row0, col0, height, width, step=1):
+    """
+    (height, width) view starting at cell (row0, col0), taking every `step`-th cell.
+
+    A step above 1 gives a nearest-cell downsampled view; only the cells
+    shown are ever computed.
+    """
+    return carpet_cells(order, row0 + step * np.arange(height), col0 + step * np.arange(width))
+
+def carpet_downsampled(order, levels):
+    """
+    Exact mean of every 3**levels x 3**levels block, as float32 in [0, 1].
+
+    A block is a copy of the order-`levels` carpet, filled 8/9 per level,
+    unless the coarser grid already cut it out, so the box filter is the
+    order - levels carpet scaled by (8/9)**levels.
+    """
+    coarse = sierpinski_carpet(order - levels)
+    return coarse.astype(np.float32) * np.float32((8 / 9) ** levels / 255)
+
+def carpet_packed(order, rows=None):
+    """
+    Rows of the carpet at 1 bit per cell (np.packbits, 1 = filled).
+
+    Args:
+        order (int): Carpet order.
+        rows (array-like or None): Row indices to pack; all rows by default.
+    Returns:
+        np.ndarray: uint8 array of shape (len(rows), ceil(3**order / 8)).
+    """
+    size = 3 ** order
+    rows = np.arange(size) if rows is None else rows
+    return np.packbits(carpet_cells(order, rows, np.arange(size)) != 0, axis=1)
+
+def write_carpet_memmap(path, order, packed=True, band_bytes=64 * 2**20):
+    """
+    Write the full carpet to an .npy file through a memory map, band by band.
+
+    Rows only differ by their digit bitmask, so each distinct row is built
+    once (2**order of them) and the bands are gathered from that table;
+    neither the image nor a band larger than `band_bytes` is held in RAM.
+    Packed files hold carpet_packed rows (order 11 is about 3.9 GB); unpacked
+    files hold 0/255 bytes like sierpinski_carpet.
+
+    Returns:
+        np.memmap: The written array, opened read-only.
+    """
+    size = 3 ** order
+    row_mask = _ones_mask(np.arange(size), order)
+    patterns, pattern_of_row = np.unique(row_mask, return_inverse=True)
+    cols = np.arange(size)
+    col_mask = _ones_mask(cols, order)
+    width = (size + 7) // 8 if packed else size
+    table = np.empty((len(patterns), width), dtype=np.uint8)
+    chunk = max(1, band_bytes // (8 * size))
+    for start in range(0, len(patterns), chunk):
+        filled = (patterns[start:start + chunk, np.newaxis] & col_mask) == 0
+        table[start:start + chunk] = np.packbits(filled, axis=1) if packed else filled * np.uint8(255)
+
+    out = np.lib.format.open_memmap(path, mode="w+", dtype=np.uint8, shape=(size, width))
+    band = max(1, band_bytes // width)
+    for start in range(0, size, band):
+        out[start:start + band] = table[pattern_of_row[start:start + band]]
+    out.flush()
+    del out
+    return np.load(path, mmap_mode="r")
+
+def generate_sierpinski_carpet(order, backend="matplotlib", size=(800, 800)):
+    if backend == "raster":
+        # Returns an RGBA uint8 image of `size` (width, height), sampled nearest-neighbour, instead of saving a PNG.
+        width, height = size
+        n = 3 ** order
+        cells = carpet_cells(order, np.arange(height) * n // height, np.arange(width) * n // width)
+        rgba = np.empty((height, width, 4), dtype=np.uint8)
+        rgba[..., :3] = cells[..., np.newaxis]
+        rgba[..., 3] = 255
+        return rgba
     img = sierpinski_carpet(order)
     plt.figure(figsize=(8,8))
     plt.imshow(img, cmap='gray')
@@ -29,7 +120,19 @@ def generate_sierpinski_carpet(order):
     plt.savefig(os.path.join(output_dir, f'sierpinski_carpet_order_{order}.png'), bbox_inches='tight', pad_inches=0.1, dpi=150)
     plt.close()
 
-if __name__ == "__main__":
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render the Sierpinski carpet gallery images.")
+    parser.add_argument("--memmap", type=int, nargs="+", default=[], metavar="ORDER",
+                        help="also write these orders (e.g. 9 10 11) as bit-packed .npy memmaps; "
+                             "order 11 is about 3.9 GB")
+    parser.add_argument("--memmap-dir", default=memmap_dir, help=f"directory for the .npy files (default: {memmap_dir})")
+    args = parser.parse_args(argv)
     for order in tqdm(range(1, 8), desc="Sierpinski Carpet"):  # Memory needs limit order, 7 is 2187x2187 pixels
         generate_sierpinski_carpet(order)
+    if args.memmap:
+        os.makedirs(args.memmap_dir, exist_ok=True)
+        for order in tqdm(args.memmap, desc="Carpet memmaps"):
+            write_carpet_memmap(os.path.join(args.memmap_dir, f'sierpinski_carpet_order_{order}.npy'), order)
 
+if __name__ == "__main__":
+    main()
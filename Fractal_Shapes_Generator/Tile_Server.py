@@ -0,0 +1,435 @@
+"""
+Slippy-map tiles of the Mandelbrot and Julia sets, served from localhost.
+
+    python -m Fractal_Shapes_Generator.Tile_Server serve [--port 8765] [--cache DIR] [--pool thread|process]
+    python -m Fractal_Shapes_Generator.Tile_Server pyramid --levels N [--cache DIR] [--fractal julia --c RE IM]
+    python -m Fractal_Shapes_Generator.Tile_Server loadtest [--requests 2000] [--concurrency 32] [--levels 6]
+
+Tiles follow the XYZ scheme: level z splits the fractal's square into
+2**z x 2**z tiles of 256x256 pixels, x to the right and y down. URLs are
+
+    /mandelbrot/{z}/{x}/{y}.png
+    /julia/{z}/{x}/{y}.png?c=-0.8,0.156
+
+with optional cmap= and max_iter= query parameters (max_iter grows with
+z by default). / serves a small viewer and /stats the server counters.
+
+The server is plain asyncio on 127.0.0.1. Tiles render on a thread or
+process pool. Concurrent requests for the same tile share one render.
+Rendered tiles go to a memory LRU and, with a cache directory, to disk,
+which is where the pyramid command puts the first levels ahead of time.
+Tiles never change for a given URL, so responses carry an ETag and a
+long-lived Cache-Control header and If-None-Match is answered with 304.
+"""
+import argparse
+import asyncio
+import hashlib
+import ipaddress
+import json
+import os
+import random
+import sys
+import time
+import traceback
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from .Colorize import COLORMAPS, colorize, colormap_lut, encode_png
+from .Julia import generate_julia_set
+from .Mandelbrot import generate_mandelbrot_set
+
+TILE_SIZE = 256
+MAX_LEVEL = 40  # float64 grids run out of precision a little beyond this
+TILE_VERSION = 1  # part of every ETag and disk path; bump when tile rendering changes
+DEFAULT_JULIA_C = complex(-0.8, 0.156)
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "FractalNotebook", "tiles")
+
+# Square covered by level 0: (xmin, ymax, side).
+WORLDS = {
+    "mandelbrot": (-2.5, 2.0, 4.0),
+    "julia": (-2.0, 2.0, 4.0),
+}
+
+def default_max_iter(z):
+    """Iteration budget of level z: deeper tiles show finer detail and need more."""
+    return min(256 + 128 * z, 8192)
+
+def tile_bounds(fractal, z, x, y, tile_size=TILE_SIZE):
+    """(xmin, xmax, ymin, ymax) of the pixel centres of tile (z, x, y), so neighbouring tiles line up."""
+    xmin, ymax, side = WORLDS[fractal]
+    size = side / 2**z
+    half = size / tile_size / 2
+    left, top = xmin + x * size, ymax - y * size
+    return left + half, left + size - half, top - size + half, top - half
+
+def render_tile(fractal, z, x, y, max_iter, c=None, cmap="hot", tile_size=TILE_SIZE):
+    """PNG bytes of one tile, row 0 at the top."""
+    bounds = tile_bounds(fractal, z, x, y, tile_size)
+    if fractal == "mandelbrot":
+        counts = generate_mandelbrot_set(*bounds, tile_size, tile_size, max_iter, cardioid=True, periodicity=True)
+    else:
+        counts = generate_julia_set(c, *bounds, tile_size, tile_size, max_iter, periodicity=True)
+    # Generators put ymin in row 0; a fixed [0, max_iter] range keeps neighbouring tiles consistent.
+    return encode_png(colorize(counts[::-1], colormap_lut(cmap), 0, max_iter))
+
+def tile_key(fractal, z, x, y, max_iter, c, cmap):
+    return (fractal, z, x, y, max_iter, None if c is None else (c.real, c.imag), cmap)
+
+def tile_etag(key):
+    return '"' + hashlib.sha256(repr((TILE_VERSION, key)).encode()).hexdigest()[:20] + '"'
+
+def tile_path(root, key):
+    """
+    Disk location of a tile: root/v{TILE_VERSION}/layer/z/x/y.png, the layer naming everything but the position.
+
+    The Julia constant is written with repr, which round-trips the float
+    exactly, so nearby constants never share a layer.
+    """
+    fractal, z, x, y, max_iter, c, cmap = key
+    layer = fractal if c is None else f"{fractal}_{c[0]!r}_{c[1]!r}"
+    layer += f"_{cmap}" + ("" if max_iter == default_max_iter(z) else f"_it{max_iter}")
+    return os.path.join(root, f"v{TILE_VERSION}", layer, str(z), str(x), f"{y}.png")
+
+def _write_atomic(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+def _is_loopback(host):
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return host == "localhost"
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+class TileServer:
+    """
+    asyncio HTTP server for fractal tiles.
+
+    Counters in stats(): requests, rendered, memory_hits, disk_hits,
+    coalesced (requests that joined a render already in flight),
+    not_modified and errors.
+    """
+
+    def __init__(self, cache_dir=None, pool="thread", workers=None, memory_tiles=2048):
+        self.cache_dir = cache_dir
+        workers = workers or os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(workers) if pool == "process" else ThreadPoolExecutor(workers)
+        self.memory = OrderedDict()
+        self.memory_tiles = memory_tiles
+        self.in_flight = {}
+        self.counters = {
+            "requests": 0, "rendered": 0, "memory_hits": 0, "disk_hits": 0,
+            "coalesced": 0, "not_modified": 0, "errors": 0,
+        }
+
+    def stats(self):
+        return dict(self.counters, in_flight=len(self.in_flight), memory_tiles=len(self.memory))
+
+    def _remember(self, key, data):
+        self.memory[key] = data
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_tiles:
+            self.memory.popitem(last=False)
+
+    def _finish(self, key, future):
+        del self.in_flight[key]
+        if not future.cancelled() and future.exception() is None:
+            data, from_disk = future.result()
+            self.counters["disk_hits" if from_disk else "rendered"] += 1
+            self._remember(key, data)
+
+    async def tile(self, key):
+        """PNG bytes of a tile from memory, disk or a fresh render; concurrent callers share one render."""
+        data = self.memory.get(key)
+        if data is not None:
+            self.memory.move_to_end(key)
+            self.counters["memory_hits"] += 1
+            return data
+        future = self.in_flight.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().run_in_executor(self.executor, load_or_render, self.cache_dir, key)
+            self.in_flight[key] = future
+            # Bookkeeping happens once, however many requests wait and even if they all go away.
+            future.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self.counters["coalesced"] += 1
+        data, _ = await asyncio.shield(future)
+        return data
+
+    def parse(self, target):
+        """Tile key from a request target like /julia/3/2/5.png?c=0.285,0.01&cmap=magma."""
+        url = urlsplit(target)
+        parts = url.path.strip("/").split("/")
+        if len(parts) != 4 or parts[0] not in WORLDS or not parts[3].endswith(".png"):
+            raise HTTPError(404, "expected /{mandelbrot|julia}/{z}/{x}/{y}.png")
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        try:
+            z, x, y = int(parts[1]), int(parts[2]), int(parts[3][:-4])
+            max_iter = int(query.get("max_iter", default_max_iter(z)))
+            c = None
+            if parts[0] == "julia":
+                c = complex(*map(float, query["c"].split(","))) if "c" in query else DEFAULT_JULIA_C
+        except (ValueError, TypeError):
+            raise HTTPError(400, "malformed tile request")
+        if not (0 <= z <= MAX_LEVEL and 0 <= x < 2**z and 0 <= y < 2**z):
+            raise HTTPError(404, "tile outside the pyramid")
+        cmap = query.get("cmap", "hot")
+        if cmap not in COLORMAPS or not 1 <= max_iter <= 100_000:
+            raise HTTPError(400, "unknown cmap or max_iter out of range")
+        return tile_key(parts[0], z, x, y, max_iter, c, cmap)
+
+    async def respond(self, method, target, headers):
+        """(status, headers, body) for one request."""
+        if method not in ("GET", "HEAD"):
+            raise HTTPError(405, "only GET and HEAD are supported")
+        path = urlsplit(target).path
+        if path == "/":
+            return 200, {"Content-Type": "text/html; charset=utf-8"}, VIEWER_HTML.encode()
+        if path == "/stats":
+            return 200, {"Content-Type": "application/json", "Cache-Control": "no-store"}, \
+                json.dumps(self.stats()).encode()
+        key = self.parse(target)
+        etag = tile_etag(key)
+        cache_headers = {"ETag": etag, "Cache-Control": "public, max-age=31536000, immutable"}
+        if etag in [tag.strip() for tag in headers.get("if-none-match", "").split(",")]:
+            self.counters["not_modified"] += 1
+            return 304, cache_headers, b""
+        data = await self.tile(key)
+        return 200, dict(cache_headers, **{"Content-Type": "image/png"}), data
+
+    async def handle(self, reader, writer):
+        """One connection; HTTP/1.1 keep-alive requests are answered in turn."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if not line.strip():
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                self.counters["requests"] += 1
+                keep_alive = True
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                    keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                    status, response_headers, body = await self.respond(method, target, headers)
+                except HTTPError as e:
+                    method, status, response_headers, body = "GET", e.status, {"Content-Type": "text/plain"}, \
+                        (str(e) + "\n").encode()
+                    self.counters["errors"] += 1
+                except ValueError:
+                    method, status, response_headers, body = "GET", 400, {"Content-Type": "text/plain"}, \
+                        b"malformed request\n"
+                    keep_alive = False
+                    self.counters["errors"] += 1
+                except Exception:
+                    # A failing render answers this request and ends the connection, not the server.
+                    traceback.print_exc(file=sys.stderr)
+                    method, status, response_headers, body = "GET", 500, {"Content-Type": "text/plain"}, \
+                        b"internal server error\n"
+                    keep_alive = False
+                    self.counters["errors"] += 1
+                response_headers["Content-Length"] = str(len(body))
+                response_headers["Connection"] = "keep-alive" if keep_alive else "close"
+                head = f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n" + "".join(
+                    f"{name}: {value}\r\n" for name, value in response_headers.items()) + "\r\n"
+                writer.write(head.encode("latin-1") + (body if method != "HEAD" else b""))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8765):
+        if not _is_loopback(host):
+            raise ValueError(f"the tile server only listens on loopback addresses, not {host!r}")
+        server = await asyncio.start_server(self.handle, host, port)
+        async with server:
+            await server.serve_forever()
+
+REASONS = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           500: "Internal Server Error"}
+
+def load_or_render(cache_dir, key):
+    """(PNG bytes, whether they came from disk) for a tile key; renders and stores missing tiles."""
+    if cache_dir:
+        path = tile_path(cache_dir, key)
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                return f.read(), True
+    fractal, z, x, y, max_iter, c, cmap = key
+    data = render_tile(fractal, z, x, y, max_iter, None if c is None else complex(*c), cmap)
+    if cache_dir:
+        _write_atomic(tile_path(cache_dir, key), data)
+    return data, False
+
+def _pyramid_job(args):
+    return load_or_render(*args)[1]
+
+def build_pyramid(cache_dir, levels, fractal="mandelbrot", c=None, cmap="hot", workers=None, progress=True):
+    """
+    Render every tile of levels 0 .. levels-1 to `cache_dir` on a process pool.
+
+    Tiles already on disk are skipped, so an interrupted build resumes.
+    Level z has 4**z tiles; 6 levels are 1365 tiles.
+
+    Returns:
+        int: Number of tiles in the pyramid.
+    """
+    if fractal == "julia" and c is None:
+        c = DEFAULT_JULIA_C
+    jobs = [
+        (cache_dir, tile_key(fractal, z, x, y, default_max_iter(z), c, cmap))
+        for z in range(levels) for x in range(2**z) for y in range(2**z)
+    ]
+    with ProcessPoolExecutor(workers or os.cpu_count() or 1) as pool:
+        # Workers return only whether the tile was already there, not its bytes.
+        for done, _ in enumerate(pool.map(_pyramid_job, jobs, chunksize=4), 1):
+            if progress and (done % 64 == 0 or done == len(jobs)):
+                print(f"\r{done}/{len(jobs)} tiles", end="", file=sys.stderr, flush=True)
+    if progress:
+        print(file=sys.stderr)
+    return len(jobs)
+
+async def _client(host, port, targets, latencies, statuses):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for target in targets:
+            start = time.perf_counter()
+            writer.write(f"GET {target} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
+            await writer.drain()
+            status = int((await reader.readline()).split()[1])
+            length = 0
+            while True:
+                line = await reader.readline()
+                if not line.strip():
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                if name.strip().lower() == "content-length":
+                    length = int(value)
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+async def load_test(host="127.0.0.1", port=8765, requests=2000, concurrency=32, levels=6, fractal="mandelbrot",
+                    seed=0):
+    """
+    Request random tiles of the first `levels` levels over `concurrency` keep-alive connections.
+
+    Deeper levels have more tiles, so picking the level first and then a
+    tile in it gives a mix of repeated (cached) and new tiles.
+
+    Returns:
+        dict: requests, seconds, requests_per_second, statuses and p50/p95/p99 latency in ms.
+    """
+    rng = random.Random(seed)
+    targets = []
+    for _ in range(requests):
+        z = rng.randrange(levels)
+        targets.append(f"/{fractal}/{z}/{rng.randrange(2**z)}/{rng.randrange(2**z)}.png")
+    latencies, statuses = [], {}
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        _client(host, port, targets[i::concurrency], latencies, statuses) for i in range(concurrency)
+    ))
+    seconds = time.perf_counter() - start
+    latencies.sort()
+    pick = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000 if latencies else None
+    return {
+        "requests": len(latencies), "seconds": seconds, "requests_per_second": len(latencies) / seconds,
+        "statuses": statuses, "p50_ms": pick(0.50), "p95_ms": pick(0.95), "p99_ms": pick(0.99),
+    }
+
+VIEWER_HTML = """<!doctype html>
+<html><head><title>FractalNotebook tiles</title>
+<style>html,body{margin:0;height:100%;overflow:hidden;background:#000}#map{position:absolute;inset:0;cursor:grab}
+#map img{position:absolute;width:256px;height:256px;image-rendering:pixelated}</style></head>
+<body><div id="map"></div><script>
+// Minimal slippy map: drag to pan, wheel to zoom.
+const map = document.getElementById("map"), params = new URLSearchParams(location.search);
+const layer = params.get("fractal") || "mandelbrot", query = location.search;
+let z = 1, cx = 256, cy = 256;  // view centre in pixels of level z
+function draw() {
+  map.innerHTML = "";
+  const n = 2 ** z, w = map.clientWidth, h = map.clientHeight;
+  for (let x = Math.floor((cx - w / 2) / 256); x <= Math.floor((cx + w / 2) / 256); x++)
+    for (let y = Math.floor((cy - h / 2) / 256); y <= Math.floor((cy + h / 2) / 256); y++) {
+      if (x < 0 || y < 0 || x >= n || y >= n) continue;
+      const img = document.createElement("img");
+      img.src = `/${layer}/${z}/${x}/${y}.png${query}`;
+      img.style.left = (x * 256 - cx + w / 2) + "px"; img.style.top = (y * 256 - cy + h / 2) + "px";
+      map.appendChild(img);
+    }
+}
+let drag = null;
+map.onmousedown = e => drag = [e.clientX, e.clientY];
+onmouseup = () => drag = null;
+onmousemove = e => { if (!drag) return; cx -= e.clientX - drag[0]; cy -= e.clientY - drag[1];
+  drag = [e.clientX, e.clientY]; draw(); };
+map.onwheel = e => { e.preventDefault(); const step = e.deltaY < 0 ? 1 : -1;
+  if (z + step < 0 || z + step > 40) return; z += step; cx *= 2 ** step; cy *= 2 ** step; draw(); };
+onresize = draw; draw();
+</script></body></html>
+"""
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local XYZ tile server for the escape-time fractals.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve", help="run the tile server on localhost")
+    serve.add_argument("--host", default="127.0.0.1", help="loopback address (default: %(default)s)")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--cache", default=DEFAULT_CACHE_DIR, help="tile directory (default: %(default)s)")
+    serve.add_argument("--no-cache", action="store_true", help="keep tiles in memory only")
+    serve.add_argument("--pool", choices=["thread", "process"], default="thread")
+    serve.add_argument("--workers", type=int, default=None)
+    pyramid = commands.add_parser("pyramid", help="pre-render the first levels to the tile directory")
+    pyramid.add_argument("--levels", type=int, required=True)
+    pyramid.add_argument("--cache", default=DEFAULT_CACHE_DIR, help="tile directory (default: %(default)s)")
+    pyramid.add_argument("--fractal", choices=sorted(WORLDS), default="mandelbrot")
+    pyramid.add_argument("--c", type=float, nargs=2, metavar=("RE", "IM"), help="Julia constant")
+    pyramid.add_argument("--cmap", default="hot", choices=COLORMAPS)
+    pyramid.add_argument("--workers", type=int, default=None)
+    loadtest = commands.add_parser("loadtest", help="hammer a running server with random tile requests")
+    loadtest.add_argument("--host", default="127.0.0.1")
+    loadtest.add_argument("--port", type=int, default=8765)
+    loadtest.add_argument("--requests", type=int, default=2000)
+    loadtest.add_argument("--concurrency", type=int, default=32)
+    loadtest.add_argument("--levels", type=int, default=6)
+    loadtest.add_argument("--fractal", choices=sorted(WORLDS), default="mandelbrot")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        if not _is_loopback(args.host):
+            parser.error(f"--host must be a loopback address, not {args.host!r}")
+        server = TileServer(None if args.no_cache else args.cache, args.pool, args.workers)
+        print(f"Serving tiles on http://{args.host}:{args.port}/", file=sys.stderr)
+        try:
+            asyncio.run(server.serve(args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+    elif args.command == "pyramid":
+        c = complex(*args.c) if args.c else None
+        count = build_pyramid(args.cache, args.levels, args.fractal, c, args.cmap, args.workers)
+        print(f"{count} tile(s) in '{args.cache}'", file=sys.stderr)
+    else:
+        print(json.dumps(asyncio.run(load_test(args.host, args.port, args.requests, args.concurrency,
+                                               args.levels, args.fractal)), indent=1))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+import os
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+from .Escape_Time import escape_time, axes_grid, count_dtype, select_precision
+from .Mandelbrot import mandelbrot_counts
+from . import Newton_Fractal
+
+# Per-process state set up by _init_worker: the shared output buffer and the job description.
+_worker = {}
+
+def _mandelbrot_tile(r1, r2, max_iter, cardioid=False, periodicity=False, dtype=np.complex128):
+    return mandelbrot_counts(axes_grid(r1, r2, dtype), max_iter, cardioid, periodicity)
+
+def _julia_tile(r1, r2, max_iter, c, periodicity=False, dtype=np.complex128):
+    return escape_time(axes_grid(r1, r2, dtype), c, max_iter, periodicity=periodicity)
+
+def _newton_tile(r1, r2, coeffs=Newton_Fractal.DEFAULT_COEFFS, max_iter=64, tol=1e-8):
+    return np.stack(Newton_Fractal.newton_basins_axes(coeffs, r1, r2, max_iter, tol)[:2])
+
+def _escape_cost(r1, r2, max_iter, c=None):
+    """Iteration counts at a few sample points, used to order tiles by expected cost."""
+    z = axes_grid(r1, r2)
+    if c is None:
+        return escape_time(np.zeros_like(z), z, max_iter)
+    return escape_time(z, c, max_iter)
+
+# kind -> (tile kernel, cost estimator or None)
+KERNELS = {
+    "mandelbrot": (_mandelbrot_tile, _escape_cost),
+    "julia": (_julia_tile, _escape_cost),
+    "newton": (_newton_tile, None),
+}
+
+def _init_worker(shm_name, shape, out_dtype, kind, r1, r2, kwargs):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _worker["shm"] = shm
+    _worker["out"] = np.ndarray(shape, dtype=out_dtype, buffer=shm.buf)
+    _worker["kernel"] = KERNELS[kind][0]
+    _worker["r1"], _worker["r2"] = r1, r2
+    _worker["kwargs"] = kwargs
+
+def _render_tile(tile):
+    y0, y1, x0, x1 = tile
+    r1, r2 = _worker["r1"], _worker["r2"]
+    _worker["out"][..., y0:y1, x0:x1] = _worker["kernel"](r1[x0:x1], r2[y0:y1], **_worker["kwargs"])
+    return tile
+
+def split_tiles(width, height, tile_size=64):
+    """List of (y0, y1, x0, x1) tiles covering a height x width image."""
+    return [
+        (y0, min(y0 + tile_size, height), x0, min(x0 + tile_size, width))
+        for y0 in range(0, height, tile_size)
+        for x0 in range(0, width, tile_size)
+    ]
+
+def order_tiles(tiles, r1, r2, estimator, kwargs, samples=3):
+    """
+    Sort tiles by estimated cost, most expensive first.
+
+    Each tile is probed at samples x samples points with the cheap estimator.
+    Handing out the expensive boundary tiles first, one at a time, keeps every
+    worker busy until the end instead of leaving one stuck on the last slow tile.
+    """
+    if estimator is None:
+        return list(tiles)
+    costs = []
+    for y0, y1, x0, x1 in tiles:
+        xs = r1[np.linspace(x0, x1 - 1, samples).astype(int)]
+        ys = r2[np.linspace(y0, y1 - 1, samples).astype(int)]
+        costs.append(int(estimator(xs, ys, **kwargs).sum()))
+    return [tile for _, tile in sorted(zip(costs, tiles), key=lambda t: -t[0])]
+
+def render_tiled(kind, xmin, xmax, ymin, ymax, width, height, tile_size=64, workers=None, precision="auto",
+                 **kwargs):
+    """
+    Render a complex-plane fractal on a process pool, tile by tile.
+
+    Workers write straight into a shared-memory output buffer, so only tile
+    coordinates cross process boundaries. The sample grid is the same
+    np.linspace grid the single-process generators use, and escape-time
+    tiles iterate in the dtype select_precision picks for the whole
+    viewport, so the output is bit-identical to generate_mandelbrot_set,
+    generate_julia_set (same viewport and precision) and newton_basins.
+
+    Args:
+        kind (str): "mandelbrot", "julia" or "newton".
+        xmin, xmax, ymin, ymax (float): Viewport bounds.
+        width, height (int): Output resolution.
+        tile_size (int): Tile edge in pixels.
+        workers (int or None): Pool size; defaults to os.cpu_count().
+        precision (str): "auto", "complex64" or "complex128" for the escape-time kinds.
+        **kwargs: Kernel parameters: max_iter, plus c for "julia",
+            optionally cardioid/periodicity for the escape-time kinds
+            and coeffs, tol for "newton".
+    Returns:
+        np.ndarray: uint16 (or uint32) counts of shape (height, width) for the
+        escape-time kinds; for "newton" a (2, height, width) uint16 stack of
+        root index (NOT_CONVERGED where unsettled) and iterations, as the app
+        caches it.
+    """
+    if kind not in KERNELS:
+        raise ValueError(f"Unknown fractal kind {kind!r}; expected one of {sorted(KERNELS)}")
+    if kind == "newton":
+        # Checked here, so a bad polynomial raises in the caller rather than in every worker.
+        Newton_Fractal.newton_roots(kwargs.get("coeffs", Newton_Fractal.DEFAULT_COEFFS), kwargs.get("max_iter", 64))
+        out_dtype = np.dtype(np.uint16)
+        shape = (2, height, width)
+    else:
+        shape = (height, width)
+        max_iter = kwargs.setdefault("max_iter", 256)
+        kwargs["dtype"] = select_precision(xmin, xmax, ymin, ymax, width, height, max_iter, precision)
+        out_dtype = count_dtype(max_iter)
+    workers = workers or os.cpu_count() or 1
+    r1 = np.linspace(xmin, xmax, width)
+    r2 = np.linspace(ymin, ymax, height)
+    estimator = KERNELS[kind][1]
+    estimator_kwargs = {k: v for k, v in kwargs.items() if k in ("max_iter", "c")}
+    tiles = order_tiles(split_tiles(width, height, tile_size), r1, r2, estimator, estimator_kwargs)
+
+    shm = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape)) * out_dtype.itemsize))
+    try:
+        with mp.Pool(workers, initializer=_init_worker,
+                     initargs=(shm.name, shape, out_dtype, kind, r1, r2, kwargs)) as pool:
+            for _ in pool.imap_unordered(_render_tile, tiles, chunksize=1):
+                pass
+        image = np.ndarray(shape, dtype=out_dtype, buffer=shm.buf).copy()
+    finally:
+        shm.close()
+        shm.unlink()
+    return image
+
+def generate_mandelbrot_set_tiled(xmin, xmax, ymin, ymax, width, height, max_iter=256, tile_size=64, workers=None,
+                                  cardioid=False, periodicity=False, precision="auto"):
+    return render_tiled("mandelbrot", xmin, xmax, ymin, ymax, width, height,
+                        tile_size=tile_size, workers=workers, precision=precision, max_iter=max_iter,
+                        cardioid=cardioid, periodicity=periodicity)
+
+def generate_julia_set_tiled(c, xmin, xmax, ymin, ymax, width, height, max_iter=256, tile_size=64, workers=None,
+                             periodicity=False, precision="auto"):
+    return render_tiled("julia", xmin, xmax, ymin, ymax, width, height,
+                        tile_size=tile_size, workers=workers, precision=precision, max_iter=max_iter, c=c,
+                        periodicity=periodicity)
+
+def newton_basins_tiled(coeffs=Newton_Fractal.DEFAULT_COEFFS, bounds=(-1.5, 1.5, -1.5, 1.5), resolution=(600, 600),
+                        max_iter=64, tol=1e-8, tile_size=64, workers=None):
+    xmin, xmax, ymin, ymax = bounds
+    width, height = resolution
+    return render_tiled("newton", xmin, xmax, ymin, ymax, width, height,
+                        tile_size=tile_size, workers=workers, coeffs=coeffs, max_iter=max_iter, tol=tol)
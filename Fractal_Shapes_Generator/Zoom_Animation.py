@@ -0,0 +1,200 @@
+"""
+Zoom animations of the Mandelbrot or a Julia set.
+
+    python -m Fractal_Shapes_Generator.Zoom_Animation --keyframes path.json [--size 640 360]
+        [--cmap hot] [--out DIR | --raw] [--workers N] [--queue 8] [--julia RE IM]
+
+A keyframe path is a list of {"frame", "center": [x, y], "zoom", "max_iter"}
+entries with increasing frame numbers. Between keyframes the zoom changes
+geometrically, the center moves so the motion on screen is steady, and
+max_iter changes linearly.
+
+Frames go through three stages: escape-time counts on a process pool,
+colorizing on a thread pool and PNG (or raw RGB) encoding on another thread
+pool. At most `queue_size` frames are in flight across all stages, and
+frames are produced lazily and handed out in order, so memory stays flat
+however long the animation is. The raw stream is rgb24 frames back to back,
+e.g. for
+
+    python -m Fractal_Shapes_Generator.Zoom_Animation --keyframes path.json --raw |
+        ffmpeg -f rawvideo -pix_fmt rgb24 -s 640x360 -r 30 -i - zoom.mp4
+
+Frames use float64 (or complex64 where it suffices) grids, so zooms past
+about 1e13 need Deep_Zoom instead.
+"""
+import argparse
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+from .Colorize import colorize, colormap_lut, encode_png
+from .Julia import generate_julia_set
+from .Mandelbrot import generate_mandelbrot_set
+
+def frame_path(keyframes, base_span=3.0, aspect=16 / 9):
+    """
+    Per-frame views along a keyframe path, as a generator.
+
+    Args:
+        keyframes (list): Dicts with "frame", "center" (x, y), "zoom" and
+            "max_iter", sorted by frame.
+        base_span (float): Width of the plane shown at zoom 1.
+        aspect (float): Output width / height.
+    Yields:
+        dict: "index", "bounds" (xmin, xmax, ymin, ymax) and "max_iter".
+    """
+    keyframes = sorted(keyframes, key=lambda k: k["frame"])
+    segments = list(zip(keyframes, keyframes[1:])) or [(k, k) for k in keyframes[:1]]
+    for n, (start, end) in enumerate(segments):
+        last = end["frame"] if n == len(segments) - 1 else end["frame"] - 1
+        for index in range(start["frame"], last + 1):
+            span = end["frame"] - start["frame"]
+            t = (index - start["frame"]) / span if span else 0.0
+            z0, z1 = start["zoom"], end["zoom"]
+            zoom = z0 * (z1 / z0) ** t
+            # Move the center in proportion to the change of 1/zoom, not linearly:
+            # the shift then stays the same fraction of the view on every frame.
+            s = t if z0 == z1 else (1 / z0 - 1 / zoom) / (1 / z0 - 1 / z1)
+            cx = start["center"][0] + (end["center"][0] - start["center"][0]) * s
+            cy = start["center"][1] + (end["center"][1] - start["center"][1]) * s
+            width = base_span / zoom
+            height = width / aspect
+            yield {
+                "index": index,
+                "bounds": (cx - width / 2, cx + width / 2, cy - height / 2, cy + height / 2),
+                "max_iter": round(start["max_iter"] + (end["max_iter"] - start["max_iter"]) * t),
+            }
+
+def _compute(frame, size, c, precision):
+    width, height = size
+    if c is None:
+        return generate_mandelbrot_set(*frame["bounds"], width, height, frame["max_iter"],
+                                       cardioid=True, periodicity=True, precision=precision)
+    return generate_julia_set(c, *frame["bounds"], width, height, frame["max_iter"],
+                              periodicity=True, precision=precision)
+
+def _colorize(counts, max_iter, cmap):
+    # A fixed [0, max_iter] range keeps colors from flickering between frames.
+    return colorize(counts, colormap_lut(cmap), 0, max_iter)
+
+def _encode(rgb, output):
+    return encode_png(rgb) if output == "png" else rgb.tobytes()
+
+def _then(future, executor, func, *args):
+    """Future of func(future.result(), *args) run on `executor` once `future` is done."""
+    result = Future()
+
+    def forward(done):
+        if done.cancelled():
+            result.cancel()
+        elif done.exception() is not None:
+            result.set_exception(done.exception())
+        else:
+            result.set_result(done.result())
+
+    def submit(done):
+        if done.cancelled():
+            result.cancel()
+            return
+        if done.exception() is not None:
+            result.set_exception(done.exception())
+            return
+        try:
+            executor.submit(func, done.result(), *args).add_done_callback(forward)
+        except RuntimeError as e:  # executor shut down: the consumer stopped early
+            result.set_exception(e)
+
+    future.add_done_callback(submit)
+    return result
+
+def zoom_frames(keyframes, size=(640, 360), c=None, cmap="hot", output="png", base_span=None,
+                workers=None, colorize_workers=1, encode_workers=2, queue_size=8, precision="auto"):
+    """
+    Render a zoom animation as a generator of encoded frames, in order.
+
+    Args:
+        keyframes (list): Keyframe path; see frame_path.
+        size (tuple): Frame (width, height).
+        c (complex or None): Julia constant; None renders the Mandelbrot set.
+        cmap (str): Colormap name, see Colorize.COLORMAPS.
+        output (str): "png" for PNG bytes or "raw" for rgb24 bytes.
+        base_span (float or None): Width of the plane at zoom 1; 3 for the
+            Mandelbrot set and 4 for Julia sets by default.
+        workers (int or None): Compute processes; defaults to os.cpu_count().
+        colorize_workers, encode_workers (int): Threads of the later stages.
+        queue_size (int): Frames in flight across all stages.
+        precision (str): "auto", "complex64" or "complex128".
+    Yields:
+        tuple: (frame index, bytes).
+    """
+    if output not in ("png", "raw"):
+        raise ValueError(f"output must be 'png' or 'raw', not {output!r}")
+    if base_span is None:
+        base_span = 3.0 if c is None else 4.0
+    frames = frame_path(keyframes, base_span, size[0] / size[1])
+    compute = ProcessPoolExecutor(workers or os.cpu_count() or 1)
+    colorizer = ThreadPoolExecutor(colorize_workers)
+    encoder = ThreadPoolExecutor(encode_workers)
+    pending = deque()
+    try:
+        for frame in frames:
+            if len(pending) >= queue_size:
+                index, future = pending.popleft()
+                yield index, future.result()
+            counts = compute.submit(_compute, frame, size, c, precision)
+            rgb = _then(counts, colorizer, _colorize, frame["max_iter"], cmap)
+            pending.append((frame["index"], _then(rgb, encoder, _encode, output)))
+        while pending:
+            index, future = pending.popleft()
+            yield index, future.result()
+    finally:
+        for executor in (compute, colorizer, encoder):
+            executor.shutdown(wait=True, cancel_futures=True)
+
+def write_sequence(frames, directory, pattern="frame_{:05d}.png"):
+    """Write (index, PNG bytes) frames to numbered files; returns the number written."""
+    os.makedirs(directory, exist_ok=True)
+    written = 0
+    for index, data in frames:
+        with open(os.path.join(directory, pattern.format(index)), "wb") as f:
+            f.write(data)
+        written += 1
+    return written
+
+def write_raw(frames, stream=None):
+    """Write (index, rgb24 bytes) frames back to back to a binary stream (stdout by default)."""
+    stream = stream or sys.stdout.buffer
+    written = 0
+    for _, data in frames:
+        stream.write(data)
+        written += 1
+    stream.flush()
+    return written
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render a zoom animation.")
+    parser.add_argument("--keyframes", required=True, help="JSON file with the keyframe path")
+    parser.add_argument("--size", type=int, nargs=2, default=(640, 360), metavar=("WIDTH", "HEIGHT"))
+    parser.add_argument("--julia", type=float, nargs=2, metavar=("RE", "IM"), help="render this Julia set")
+    parser.add_argument("--cmap", default="hot")
+    parser.add_argument("--out", default="zoom_frames", help="image sequence directory (default: %(default)s)")
+    parser.add_argument("--raw", action="store_true", help="write rgb24 frames to stdout instead")
+    parser.add_argument("--workers", type=int, default=None, help="compute processes (default: all cores)")
+    parser.add_argument("--queue", type=int, default=8, help="frames in flight (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    with open(args.keyframes) as f:
+        keyframes = json.load(f)
+    c = complex(*args.julia) if args.julia else None
+    frames = zoom_frames(keyframes, tuple(args.size), c, args.cmap, "raw" if args.raw else "png",
+                         workers=args.workers, queue_size=args.queue)
+    if args.raw:
+        write_raw(frames)
+    else:
+        count = write_sequence(frames, args.out)
+        print(f"Wrote {count} frame(s) to '{args.out}'", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
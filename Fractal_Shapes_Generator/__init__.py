@@ -1,18 +1,27 @@
-"""Fractal Shapes Generator package."""
+"""Fractal Shapes Generator package.
 
-from .Mandelbrot import generate_mandelbrot_set, mandelbrot_description
-from .Julia import generate_julia_set, julia_description
-from .Koch_Snowflake import generate_koch_snowflake, koch_snowflake_description
-from .Lecy_O_Curve import generate_levy_curve
-from .Pythagoras_Tree import generate_pythagoras_tree
-from .Sierpinnski_triangle import generate_sierpinski_triangle
-from .Sierpinski_Carpet import generate_sierpinski_carpet
-from .Dragon_Curve import generate_dragon_curve
-from .Cantour_Set import generate_cantor_set
-from .Barnsley_Fern import generate_barnsley_fern
-from .Hilbert_Curve import generate_hilbert_curve
-from .Peano_Curve import generate_peano_curve
-from .Newton_Fractal import generate_newton_fractal
+Modules are imported lazily (PEP 562): `import Fractal_Shapes_Generator`
+loads nothing else, and each name below pulls in its module on first access.
+"""
+
+import importlib
+
+# Exported name -> module that defines it.
+_EXPORTS = {
+    "generate_mandelbrot_set": "Mandelbrot", "mandelbrot_description": "Mandelbrot",
+    "generate_julia_set": "Julia", "julia_description": "Julia",
+    "generate_koch_snowflake": "Koch_Snowflake", "koch_snowflake_description": "Koch_Snowflake",
+    "generate_levy_curve": "Lecy_O_Curve",
+    "generate_pythagoras_tree": "Pythagoras_Tree",
+    "generate_sierpinski_triangle": "Sierpinnski_triangle",
+    "generate_sierpinski_carpet": "Sierpinski_Carpet",
+    "generate_dragon_curve": "Dragon_Curve",
+    "generate_cantor_set": "Cantour_Set",
+    "generate_barnsley_fern": "Barnsley_Fern",
+    "generate_hilbert_curve": "Hilbert_Curve",
+    "generate_peano_curve": "Peano_Curve",
+    "generate_newton_fractal": "Newton_Fractal",
+}
 
 __all__ = [
     "generate_mandelbrot_set", "mandelbrot_description",
@@ -25,3 +34,12 @@ __all__ = [
     "generate_newton_fractal","koch_snowflake_description"
 ]
 
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+        globals()[name] = value  # later lookups skip __getattr__
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,6 +1,7 @@
+import time
+_import_start = time.perf_counter()
+
 import streamlit as st
-import matplotlib.pyplot as plt
-import io
 import sys
 import os
 
@@ -9,97 +10,39 @@ fractal_dir = os.path.abspath(os.path.join('..', 'Fractal_Shapes_Generator'))
 if fractal_dir not in sys.path:
     sys.path.insert(0, fractal_dir)
 
-from Fractal_Shapes_Generator import (
-    Mandelbrot as mandelbrot,
-    Julia as julia,
-    generate_koch_snowflake,
-    generate_levy_curve,
-    generate_pythagoras_tree,
-    generate_sierpinski_triangle,
-    generate_sierpinski_carpet,
-    generate_dragon_curve,
-    generate_cantor_set,
-    generate_barnsley_fern,
-    generate_hilbert_curve,
-    generate_peano_curve,
-    generate_newton_fractal
-)
+# Generator modules are imported lazily through the registry, on first render.
+from Fractal_Shapes_Generator.Fractal_Registry import FRACTALS, PARAMS, describe, generator
+from Fractal_Shapes_Generator.Render_Cache import RenderCache
+from Fractal_Shapes_Generator.Colorize import COLORMAPS, colormap_lut, colorize, encode_png
+from Fractal_Shapes_Generator.Instrumentation import RenderLog, default_log_path, tracing
+
+import_seconds = time.perf_counter() - _import_start
 
 st.set_page_config(page_title="FractalNotebook", layout="wide")
 st.title('FractalNotebook')
 
-# Fractal display registry
-fractals = {
-    "Mandelbrot Set": {
-        "generator": mandelbrot.generate_mandelbrot_set,
-        "description": mandelbrot.mandelbrot_description,
-        "params": ["max_iter", "zoom", "center_x", "center_y"]
-    },
-    "Julia Set": {
-        "generator": julia.generate_julia_set,
-        "description": julia.julia_description,
-        "params": ["max_iter", "zoom", "center_x", "center_y", "c_real", "c_imag"]
-    },
-    "Koch Snowflake": {
-        "generator": generate_koch_snowflake,
-        "description": "The Koch Snowflake is constructed by recursively altering each straight edge into a spike. At each recursion level, edges become more intricate.",
-        "params": ["order"]
-    },
-    "Levy C Curve": {
-        "generator": generate_levy_curve,
-        "description": "The Levy C curve is created by recursively bending lines at right angles, forming increasingly zig-zagged curves.",
-        "params": ["order"]
-    },
-    "Pythagoras Tree": {
-        "generator": generate_pythagoras_tree,
-        "description": "The Pythagoras Tree is formed by growing squares recursively in a branching pattern.",
-        "params": ["order"]
-    },
-    "Sierpinski Triangle": {
-        "generator": generate_sierpinski_triangle,
-        "description": "The Sierpinski Triangle is an iconic fractal built by recursively removing triangles, revealing self-similar gaps.",
-        "params": ["order"]
-    },
-    "Sierpinski Carpet": {
-        "generator": generate_sierpinski_carpet,
-        "description": "The Sierpinski Carpet generalizes the triangle into a grid, recursively removing squares to create a woven fractal.",
-        "params": ["order"]
-    },
-    "Dragon Curve": {
-        "generator": generate_dragon_curve,
-        "description": "The Dragon Curve is a recursive fold pattern resulting in a self-similar zig-zag shape.",
-        "params": ["order"]
-    },
-    "Cantor Set": {
-        "generator": generate_cantor_set,
-        "description": "The Cantor Set is formed by iteratively removing the central third of every segment.",
-        "params": ["order"]
-    },
-    "Barnsley Fern": {
-        "generator": generate_barnsley_fern,
-        "description": "The Barnsley Fern uses random affine transforms to mimic fern leaf growth.",
-        "params": ["n_points"]
-    },
-    "Hilbert Curve": {
-        "generator": generate_hilbert_curve,
-        "description": "The Hilbert Curve is a space-filling path that visits every cell of a grid via recursive turns.",
-        "params": ["order"]
-    },
-    "Peano Curve": {
-        "generator": generate_peano_curve,
-        "description": "The Peano Curve recursively fills a grid, visiting every cell.",
-        "params": ["order"]
-    },
-    "Newton Fractal": {
-        "generator": generate_newton_fractal,
-        "description": "The Newton Fractal visualizes the basins of attraction for Newton's method applied to complex polynomials.",
-        "params": ["order"]
-    }
-}
+@st.cache_resource
+def get_render_cache():
+    # One cache per server process, shared by all reruns; the disk tier survives restarts.
+    cache_dir = os.environ.get(
+        "FRACTAL_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "FractalNotebook")
+    )
+    return RenderCache(disk_dir=cache_dir)
+
+render_cache = get_render_cache()
+
+@st.cache_resource
+def get_render_log():
+    # Every render is appended to a JSON-lines log; FRACTAL_RENDER_LOG overrides the path.
+    return RenderLog(default_log_path())
+
+render_log = get_render_log()
+show_trace = st.sidebar.checkbox("Render instrumentation")
+trace_memory = show_trace and st.sidebar.checkbox("Measure peak memory (slower)")
 
 selection = st.selectbox(
     'Fractal:',
-    list(fractals.keys()),
+    list(FRACTALS),
     key='fractal_selector'
 )
 
@@ -108,28 +51,40 @@ iterations_col, zoom_col, center_col, position_col = st.columns([1, 1, 5, 2])
 
 # Parameters dictionary to collect controls dynamically
 params = {}
+spec = FRACTALS[selection]
+columns = {"iterations": iterations_col, "zoom": zoom_col, "position": position_col}
+
+def add_control(name):
+    control = PARAMS[name]
+    with columns[control["column"]]:
+        widget = getattr(st, control["widget"])
+        params[name] = widget(control["label"], *control["args"], **control.get("kwargs", {}))
 
 with iterations_col:
-    if "max_iter" in fractals[selection]["params"]:
-        params["max_iter"] = st.slider('Iterations', 50, 1000, 256, 50)
-    if "order" in fractals[selection]["params"]:
-        params["order"] = st.slider('Order', 1, 10, 5)
-
-with zoom_col:
-    if "zoom" in fractals[selection]["params"]:
-        params["zoom"] = st.slider('Zoom (1x–100x)', 1, 100, 1)
-
-with position_col:
-    if "center_x" in fractals[selection]["params"]:
-        params["center_x"] = st.slider('Center X', -2.0, 2.0, 0.0, step=0.01)
-    if "center_y" in fractals[selection]["params"]:
-        params["center_y"] = st.slider('Center Y', -2.0, 2.0, 0.0, step=0.01)
-    if "c_real" in fractals[selection]["params"]:
-        params["c_real"] = st.slider('Julia c (Real)', -1.5, 1.5, -0.8, 0.01)
-    if "c_imag" in fractals[selection]["params"]:
-        params["c_imag"] = st.slider('Julia c (Imag)', -1.5, 1.5, 0.156, 0.01)
-    if "n_points" in fractals[selection]["params"]:
-        params["n_points"] = st.slider('Num Points', 5_000, 100_000, 50_000, 5_000)
+    if "max_iter" in spec["params"]:
+        add_control("max_iter")
+        params["render_mode"] = st.selectbox(
+            'Render mode', spec["modes"],
+            help="Boundary tracing iterates only the edges of flat regions. It pays off only at high max_iter "
+                 "(thousands) with the interior shortcuts off; otherwise the full grid is faster."
+        )
+        params["shortcuts"] = st.checkbox('Interior shortcuts', value=True)
+        params["precision"] = st.selectbox('Precision', ["auto", "complex64", "complex128"])
+        params["antialias"] = st.checkbox('Anti-aliasing (full grid)')
+
+deep_mode = params.get("render_mode") == "Deep zoom"
+for name in spec["params"]:
+    if name == "max_iter" or (deep_mode and name in ("zoom", "center_x", "center_y")):
+        continue
+    add_control(name)
+
+if deep_mode:
+    with position_col:
+        # Arbitrary-precision strings: float sliders cannot address zooms past ~1e13.
+        params["deep_x"] = st.text_input('Center X (exact)', "-0.743643887037158704752191506114774")
+        params["deep_y"] = st.text_input('Center Y (exact)', "0.131825904205311970493132056385139")
+        params["deep_zoom"] = st.text_input('Zoom (e.g. 1e50)', "1e10")
+        params["deep_iter"] = st.number_input('Deep iterations', 100, 100_000, 2000, 100)
 
 with center_col:
     RECT_WIDTH = 700
@@ -145,58 +100,222 @@ with center_col:
         ymax = center_y + height / 2
         return xmin, xmax, ymin, ymax
 
-    fig, ax = plt.subplots(figsize=(7, 4), dpi=100)
+    # Side results (pixels iterated, deep-zoom stats) are filled by a render and cached with its image.
+    render_info = {}
+
+    def traced(*args, **kwargs):
+        from Fractal_Shapes_Generator.Boundary_Trace import mariani_silver
+        img, render_info["iterated"] = mariani_silver(*args, **kwargs)
+        return img
+
+    def deep(*args, **kwargs):
+        from Fractal_Shapes_Generator.Deep_Zoom import generate_mandelbrot_deep
+        img, render_info["deep"] = generate_mandelbrot_deep(*args, **kwargs)
+        return img
 
-    if selection == "Mandelbrot Set":
-        xmin, xmax, ymin, ymax = zoom_bounds(
-            params["center_x"], params["center_y"], 3.0, ASPECT, params["zoom"]
+    def deep_view():
+        # The exact-centre inputs are free text: check them before they reach Decimal arithmetic.
+        from decimal import Decimal, InvalidOperation
+        try:
+            x, y, zoom = (Decimal(params[name].strip()) for name in ("deep_x", "deep_y", "deep_zoom"))
+        except InvalidOperation:
+            st.error("Center X, Center Y and Zoom must be numbers, e.g. -0.7436438870371587 or 1e50.")
+            return None
+        if not (x.is_finite() and y.is_finite() and zoom.is_finite()) or not 0 < zoom <= Decimal("1e300"):
+            st.error("The centre must be finite and the zoom between 0 and 1e300.")
+            return None
+        return x, y, zoom
+
+    def antialiased(*args, **kwargs):
+        from Fractal_Shapes_Generator.Anti_Alias import adaptive_supersample
+        img, render_info["antialias"] = adaptive_supersample(*args, **kwargs)
+        return img
+
+    def incremental(base_span, c=None):
+        from Fractal_Shapes_Generator.Incremental_View import IncrementalRenderer
+        # The renderer keeps the last frame in the session; a change of c,
+        # max_iter or shortcuts starts a fresh one.
+        key = (selection, c, params["max_iter"], params["shortcuts"])
+        renderer = st.session_state.get("incremental_renderer")
+        if st.session_state.get("incremental_key") != key:
+            renderer = IncrementalRenderer(
+                c=c, max_iter=params["max_iter"],
+                cardioid=params["shortcuts"] and c is None, periodicity=params["shortcuts"]
+            )
+            st.session_state["incremental_renderer"] = renderer
+            st.session_state["incremental_key"] = key
+        span_x = base_span / params["zoom"]
+        img = renderer.render(
+            params["center_x"], params["center_y"], span_x, span_x / ASPECT, RECT_WIDTH, RECT_HEIGHT
         )
-        img = fractals[selection]["generator"](
-            xmin, xmax, ymin, ymax, RECT_WIDTH, RECT_HEIGHT, params["max_iter"]
+        render_info["incremental"] = (renderer.last_computed, renderer.last_reused)
+        return img, renderer.bounds
+
+    # One renderer per registry engine; each returns a 2-D array to colorize or an RGBA image.
+    def render_escape_time():
+        # Julia sets carry their c; the Mandelbrot set also gets the cardioid/bulb shortcut.
+        c = complex(params["c_real"], params["c_imag"]) if "c_real" in params else None
+        if params["render_mode"] == "Deep zoom":
+            view = deep_view()
+            if view is None:
+                return None
+            return render_cache.get_or_compute(
+                selection, params, None, (RECT_WIDTH, RECT_HEIGHT),
+                lambda: deep(*view, RECT_WIDTH, RECT_HEIGHT, params["deep_iter"]), info=render_info
+            )
+        if params["render_mode"] == "Incremental pan/zoom":
+            img, _ = incremental(spec["base_span"], c)
+            return img
+        bounds = zoom_bounds(params["center_x"], params["center_y"], spec["base_span"], ASPECT, params["zoom"])
+        flags = {"periodicity": params["shortcuts"], "precision": params["precision"]}
+        if c is None:
+            flags["cardioid"] = params["shortcuts"]
+        if params["render_mode"] == "Boundary tracing":
+            compute = lambda: traced(*bounds, RECT_WIDTH, RECT_HEIGHT, params["max_iter"], c=c, **flags)
+        elif params["antialias"]:
+            compute = lambda: antialiased(*bounds, RECT_WIDTH, RECT_HEIGHT, params["max_iter"], c=c, **flags)
+        else:
+            args = bounds if c is None else (c, *bounds)
+            compute = lambda: generator(selection)(*args, RECT_WIDTH, RECT_HEIGHT, params["max_iter"], **flags)
+        return render_cache.get_or_compute(selection, params, bounds, (RECT_WIDTH, RECT_HEIGHT), compute,
+                                           info=render_info)
+
+    def render_chaos_game():
+        from Fractal_Shapes_Generator.Barnsley_Fern import FERN_BOUNDS, log_density
+        hist = render_cache.get_or_compute(
+            selection, params, FERN_BOUNDS, (500, 1000),
+            lambda: generator(selection)(params["n_points"], bins=(500, 1000), workers=os.cpu_count() or 1)
         )
-        ax.imshow(img, cmap='hot', extent=(xmin, xmax, ymin, ymax))
-        ax.axis('off')
+        return log_density(hist)
 
-    elif selection == "Julia Set":
-        xmin, xmax, ymin, ymax = zoom_bounds(
-            params["center_x"], params["center_y"], 4.0, ASPECT, params["zoom"]
+    def render_orbit_density():
+        from Fractal_Shapes_Generator.Barnsley_Fern import log_density
+        from Fractal_Shapes_Generator.Buddhabrot import BUDDHABROT_BOUNDS
+        from Fractal_Shapes_Generator.Render_Cache import cache_key
+        key = cache_key(selection, params, BUDDHABROT_BOUNDS, (600, 600))
+        hist = render_cache.get(key)
+        if hist is None:
+            # Stops at the sample count or the entry's time budget, whichever comes first;
+            # only a render that reached its sample count is cached, so the cache never depends on timing.
+            stats = {}
+            hist = generator(selection)(
+                params["n_points"], spec["seconds"], max_iter=params["orbit_iter"], anti=params["anti"],
+                workers=os.cpu_count() or 1, stats=stats
+            )
+            if stats["samples"] >= params["n_points"]:
+                render_cache.put(key, hist)
+            else:
+                render_info["orbit_budget"] = stats["samples"]
+        return log_density(hist)
+
+    def render_newton():
+        import numpy as np
+        from Fractal_Shapes_Generator.Newton_Fractal import basin_image
+        bounds = zoom_bounds(params["center_x"], params["center_y"], spec["base_span"], ASPECT, params["zoom"])
+        resolution = (params["resolution"], round(params["resolution"] / ASPECT))
+        try:
+            coeffs = [complex(c) for c in params["coeffs"].replace(" ", "").split(",")]
+        except ValueError:
+            st.error("Coefficients must be comma-separated numbers, e.g. 1, 0, 0, -1 or 1, 0, -1j.")
+            return None
+        # Cached compactly as one uint16 array: root index and iteration count.
+        # The iteration budget stays at newton_basins' default; order only sets the shading span.
+        try:
+            basins = render_cache.get_or_compute(
+                selection, params, bounds, resolution,
+                lambda: np.stack(generator(selection)(coeffs, bounds, resolution)[:2])
+            )
+        except ValueError as error:  # constant polynomial, or more roots than the root index holds
+            st.error(f"Cannot render these coefficients: {error}.")
+            return None
+        return basin_image(basins[0], basins[1], colormap_lut(colormap), 5 + params["order"] * 2)
+
+    def render_raster():
+        # Geometric fractals are rasterized straight to RGBA, no matplotlib artists.
+        return render_cache.get_or_compute(
+            selection, params, None, (RECT_WIDTH, RECT_HEIGHT),
+            lambda: generator(selection)(params["order"], backend="raster", size=(RECT_WIDTH, RECT_HEIGHT))
         )
-        img = fractals[selection]["generator"](
-            complex(params["c_real"], params["c_imag"]),
-            xmin, xmax, ymin, ymax, RECT_WIDTH, RECT_HEIGHT, params["max_iter"]
+
+    renderers = {
+        "escape_time": render_escape_time,
+        "chaos_game": render_chaos_game,
+        "orbit_density": render_orbit_density,
+        "newton": render_newton,
+        "raster": render_raster,
+    }
+    # Recoloring only re-runs a lookup: the counts (or basins) come from the render cache.
+    colormap = st.session_state.get(f"colormap_{selection}") or spec.get("cmap")
+    # Each stage is timed; generators add their own counters to the active trace.
+    with tracing(selection, params, memory=trace_memory) as trace:
+        cache_before = render_cache.stats()
+        with trace.stage("render"):
+            img = renderers[spec["engine"]]()
+        cache_after = render_cache.stats()
+        for counter in ("hits", "disk_hits", "misses"):
+            if cache_after[counter] > cache_before[counter]:
+                trace.count(f"cache_{counter}", cache_after[counter] - cache_before[counter])
+
+        if img is not None and img.ndim == 3:
+            with trace.stage("encode_png"):
+                png = encode_png(img)
+            with trace.stage("st.image"):
+                st.image(png, width=min(img.shape[1], RECT_WIDTH))
+        elif img is not None:
+            with trace.stage("colorize"):
+                rgb = colorize(img, colormap_lut(colormap))
+            with trace.stage("encode_png"):
+                png = encode_png(rgb)
+            with trace.stage("st.image"):
+                st.image(png, width=min(rgb.shape[1], RECT_WIDTH))
+        if img is not None and "cmap" in spec:
+            st.selectbox('Colormap', COLORMAPS, index=COLORMAPS.index(spec["cmap"]), key=f"colormap_{selection}")
+    render_log.add(trace)
+    if "iterated" in render_info:
+        iterated = render_info["iterated"]
+        total = RECT_WIDTH * RECT_HEIGHT
+        st.caption(f"Boundary tracing iterated {iterated:,} of {total:,} pixels ({iterated / total:.0%}).")
+    if "antialias" in render_info:
+        aa = render_info["antialias"]
+        st.caption(
+            f"Anti-aliasing resampled {aa['resampled_pixels']:,} of {aa['edge_pixels']:,} edge pixels "
+            f"with {aa['extra_samples']:,} extra samples ({aa['cost']:.2f}x the samples of a plain render)."
+        )
+    if "incremental" in render_info:
+        computed, reused = render_info["incremental"]
+        st.caption(f"Incremental render computed {computed:,} pixels and reused {reused:,}.")
+    if "orbit_budget" in render_info:
+        st.caption(
+            f"Stopped at the {spec['seconds']} s time budget after {render_info['orbit_budget']:,} of "
+            f"{params['n_points']:,} samples; this partial render is not cached."
         )
-        ax.imshow(img, cmap='cool', extent=(xmin, xmax, ymin, ymax))
-        ax.axis('off')
-
-    elif selection == "Barnsley Fern":
-        fig, ax = plt.subplots(figsize=(7, 10), dpi=100)
-        x, y = fractals[selection]["generator"](params["n_points"])
-        ax.scatter(x, y, s=0.1, color='green')
-        ax.axis('off')
-
-    elif selection == "Newton Fractal":
-        img = fractals[selection]["generator"](params["order"])
-        ax.imshow(img, extent=(-1.5, 1.5, -1.5, 1.5), cmap='hsv')
-        ax.axis('off')
-
-    elif selection in [
-        "Koch Snowflake", "Levy C Curve", "Pythagoras Tree",
-        "Sierpinski Triangle", "Sierpinski Carpet", "Dragon Curve",
-        "Cantor Set", "Hilbert Curve", "Peano Curve"
-    ]:
-        # All recursive fractals are now called with (order, ax)
-        fractals[selection]["generator"](params["order"], ax=ax)
-        ax.axis('off')
-
-    else:
-        st.warning("Fractal not implemented yet.")
-
-    plt.tight_layout(pad=0)
-    buf = io.BytesIO()
-    plt.savefig(buf, format="png", bbox_inches="tight", pad_inches=0)
-    plt.close(fig)
-    buf.seek(0)
-    st.image(buf, width=RECT_WIDTH)
-    st.markdown(fractals[selection]["description"])
-st.warning("Fractal not implemented yet.")
+    if "deep" in render_info:
+        deep_info = render_info["deep"]
+        st.caption(
+            f"Deep zoom used {deep_info['references']} reference orbit(s), "
+            f"series approximation skipped {deep_info['skipped'][0]} iterations, "
+            f"{deep_info['glitched']:,} glitched pixels left."
+        )
+    st.markdown(describe(selection))
+
+@st.cache_resource
+def startup_times():
+    # Filled on the first run in this server process, when imports are cold.
+    return {}
+
+with st.sidebar.expander("Render cache"):
+    st.json(render_cache.stats())
+with st.sidebar.expander("Startup"):
+    cold = startup_times().setdefault("import_seconds", import_seconds)
+    st.caption(f"Package import: {cold * 1000:.0f} ms cold, {import_seconds * 1000:.0f} ms this run.")
 
+if show_trace:
+    with st.sidebar.expander("Last render", expanded=True):
+        st.json(trace.to_dict())
+    with st.sidebar.expander("Latency per fractal"):
+        st.table({
+            fractal: {"renders": row["count"], "p50 ms": round(row["p50"] * 1000, 1),
+                      "p95 ms": round(row["p95"] * 1000, 1)}
+            for fractal, row in render_log.latency_percentiles().items()
+        })
+        st.caption(f"Log: {render_log.path}")